@@ -1,9 +1,9 @@
 // Alle spillets konstanter: farger, bydeler, territorier, nabolister og oppdrag.
 // Ingen spillogikk her — bare data som de andre modulene leser.
 import { Player, GameState, District, Territory, Checkpoint, MapNode } from '../types.js';
+import rawMapData from '../../map/map.json';
 
-
-
+type MapGraph = { graph: { adjacency: Record<string, string[]> } };
 
 export const PLAYER_COLORS = ['#c0392b','#1a6b9a','#1a7a4a','#c0692b','#6b3fa0','#1a8a8a'];
 export const PLAYER_COLOR_NAMES = ['Rød','Blå','Grønn','Oransje','Lilla','Cyan'];
@@ -78,49 +78,9 @@ const TERRITORY_NODES: Territory[] = TERRITORIES.filter(
   (node): node is Territory => node.type === 'territory'
 );
 
-// Hvilke territorier som grenser til hverandre — beregnet automatisk fra kartpolygonene.
-export const ADJACENCY = {
-  't0a': ['t0b', 't1', 't4', 't9', 't11', 't12'],
-  't0b': ['t0a', 't12'],
-  't1':  ['t0a', 't2', 't3', 't4', 't6'],
-  't2':  ['t1', 't3', 't30', 't33'],
-  't3':  ['t1', 't2', 't6', 't22', 't29', 't30'],
-  't4':  ['t0a', 't1', 't5', 't6', 't9'],
-  't5':  ['t4', 't6', 't7', 't9', 't10'],
-  't6':  ['t1', 't3', 't4', 't5', 't7', 't8', 't19', 't22', 't29'],
-  't7':  ['t5', 't6', 't8', 't9', 't10', 't19', 't20'],
-  't8':  ['t6', 't7', 't10', 't19', 't20'],
-  't9':  ['t0a', 't4', 't5', 't7', 't10', 't11'],
-  't10': ['t5', 't7', 't8', 't9', 't11', 't20'],
-  't11': ['t0a', 't9', 't10', 't12', 't14', 't16', 't20'],
-  't12': ['t0a', 't0b', 't11', 't13', 't14'],
-  't13': ['t12', 't14'],
-  't14': ['t11', 't12', 't13', 't15', 't16', 't17'],
-  't15': ['t14', 't17', 'lysaker_cp'],
-  't16': ['t11', 't14', 't17', 't20'],
-  't17': ['t14', 't15', 't16', 't18', 'lysaker_cp'],
-  't18': ['t17'],
-  't19': ['t6', 't7', 't8', 't20', 't21', 't22', 't23'],
-  't20': ['t7', 't8', 't10', 't11', 't16', 't19', 't21'],
-  't21': ['t19', 't20'],
-  't22': ['t3', 't6', 't19', 't23', 't29'],
-  't23': ['t19', 't22', 't25', 't28', 't29'],
-  't24': ['t25', 't26'],
-  't25': ['t23', 't24', 't26', 't28'],
-  't26': ['t24', 't25', 't27', 't28', 'lørenskog_cp'],
-  't27': ['t26', 't28', 'lørenskog_cp'],
-  't28': ['t23', 't25', 't26', 't27', 't29', 'lørenskog_cp'],
-  't29': ['t3', 't6', 't22', 't23', 't28', 't30', 't31'],
-  't30': ['t2', 't3', 't29', 't31', 't32', 't33', 't35'],
-  't31': ['t29', 't30'],
-  't32': ['t30', 't33', 't34', 't35'],
-  't33': ['t2', 't30', 't32'],
-  't34': ['t32', 't35', 'kolbotn_cp'],
-  't35': ['t30', 't32', 't34', 'kolbotn_cp'],
-  'lørenskog_cp': ['t26', 't27', 't28'],
-  'lysaker_cp': ['t17', 't15'],
-  'kolbotn_cp': ['t35', 't34'],
-};
+// Hvilke territorier som grenser til hverandre — fra kartdefinisjonen i map.json,
+// den samme filen serveren laster brettet fra.
+export const ADJACENCY: Record<string, string[]> = (rawMapData as unknown as MapGraph).graph.adjacency;
 
 
 // De tre runde-sjekkpunktene spillere må innom for å få bonusen på 500 kr + 3 bat.
@@ -40,6 +40,7 @@ export type LogEntry = {
   msg: string;
   type: string;
   time: string;
+  seq?: number;
 };
 
 export type Mission = {
@@ -50,8 +51,20 @@ export type Mission = {
   check: (player: Player, gameState: GameState) => boolean;
 };
 
+// What the active player may do right now (server: mvp.legal_summary).
+export type LegalActions = {
+  side: PlayerSide;
+  checkpoints: CheckpointId[];
+  rollDice: boolean;
+  moves: MapNodeId[];
+  attacks: Array<[TerritoryId, TerritoryId]>;
+  endTurn: boolean;
+  forfeit: boolean;
+};
+
 export type GameState = {
   room?: RoomId;
+  maxPlayers?: number;
   currentPlayerIdx: number;
   players: Player[];
   territories: Record<TerritoryId, TerritoryState>;
@@ -60,6 +73,7 @@ export type GameState = {
   log: LogEntry[];
   activePlayer?: PlayerRef;
   winner?: PlayerRef;
+  legalActions?: LegalActions | null;
 };
 
 export type District = {
@@ -148,6 +162,8 @@ export type Handlers = {
   onGameState?: (gameState: GameState) => void;
   onModal?: (modal: GameModal) => void;
   onError?: (message: string) => void;
+  onSpectators?: (room: string, count: number) => void;
+  onReplayEnd?: (gameId: number, steps: number) => void;
 };
 
 export function isTerritory(node: MapNode): node is Territory {
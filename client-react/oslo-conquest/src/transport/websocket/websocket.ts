@@ -13,7 +13,71 @@ function emit<K extends keyof Handlers>(name: K, ...args: Parameters<NonNullable
   (handlers[name] as ((...a: typeof args) => void) | undefined)?.(...args);
 }
 
-function handleGameState(nextState: GameState & { started?: boolean }): void {
+type IncomingGameState = GameState & { started?: boolean; logSince?: number; logSeq?: number; version?: number };
+
+type StateDelta = {
+  type: 'state_delta';
+  version: number;
+  baseVersion: number;
+  changes: {
+    territories?: Record<string, Partial<GameState['territories'][string]>>;
+    players?: Record<string, Partial<GameState['players'][number]>>;
+    phase?: GameState['phase'];
+    started?: boolean;
+    activePlayer?: GameState['activePlayer'];
+    winner?: GameState['winner'];
+    legalActions?: Partial<NonNullable<GameState['legalActions']>> | null;
+  };
+  log: GameState['log'];
+  logSeq: number;
+};
+
+// Ask the server for state_delta patches instead of a full game_state per action.
+function withDeltas(url: string): string {
+  return url + (url.includes('?') ? '&' : '?') + 'deltas=1';
+}
+
+// Apply a state_delta to the current state; a version gap means we missed one, so resync.
+function handleStateDelta(delta: StateDelta): void {
+  const current = state.gameState as IncomingGameState | null;
+  if (!current || current.version !== delta.baseVersion) {
+    sendWS({ type: 'sync' });
+    return;
+  }
+  const { territories, players, legalActions, ...top } = delta.changes;
+  const next: IncomingGameState = {
+    ...current,
+    ...top,
+    // legalActions is patched one level deep; null means nobody is to move.
+    legalActions: legalActions === undefined
+      ? current.legalActions
+      : legalActions && ({ ...current.legalActions, ...legalActions } as GameState['legalActions']),
+    territories: { ...current.territories },
+    players: current.players.map(p => (players?.[p.id] ? { ...p, ...players[p.id] } : p)),
+    log: [...delta.log, ...(current.log ?? [])].slice(0, 100),
+    logSeq: delta.logSeq,
+    version: delta.version,
+  };
+  for (const [id, patch] of Object.entries(territories ?? {})) {
+    next.territories[id] = { ...next.territories[id], ...patch };
+  }
+  handleGameState(next);
+}
+
+// After an action the server sends only new log entries (logSince set); prepend
+// them to what we already have. A gap means we missed some, so refetch history.
+function mergeLog(nextState: IncomingGameState): void {
+  if (nextState.logSince === undefined) return;
+  const previous = (state.gameState as IncomingGameState | null);
+  if (previous?.logSeq !== nextState.logSince) {
+    sendWS({ type: 'get_log', before: (nextState.logSeq ?? 0) + 1, limit: 30 });
+    return;
+  }
+  nextState.log = [...nextState.log, ...(previous.log ?? [])].slice(0, 100);
+}
+
+function handleGameState(nextState: IncomingGameState): void {
+  mergeLog(nextState);
   state.gameState = nextState;
 
   if (nextState.started) {
@@ -27,10 +91,46 @@ function handleGameState(nextState: GameState & { started?: boolean }): void {
   notifyGameChanged();
 }
 
+// Lobby: a full room_list on connect / list_rooms, then room_* deltas that each
+// bump the lobby version. A gap means we missed one, so ask for the full list.
+let lobbyVersion: number | null = null;
+const lobbyRooms = new Map<string, RoomInfo>();
+
+type LobbyDelta =
+  | { type: 'room_added' | 'room_updated'; version: number; room: RoomInfo }
+  | { type: 'room_removed'; version: number; room: RoomInfo['room'] };
+
+function handleRoomList(version: number | undefined, rooms: RoomInfo[]): void {
+  lobbyVersion = version ?? null;
+  lobbyRooms.clear();
+  for (const room of rooms) lobbyRooms.set(room.room, room);
+  emit('onRooms', rooms);
+}
+
+function handleLobbyDelta(delta: LobbyDelta): void {
+  if (lobbyVersion === null || delta.version !== lobbyVersion + 1) {
+    if (lobbyVersion === null || delta.version > lobbyVersion) sendWS({ type: 'list_rooms' });
+    return;
+  }
+  lobbyVersion = delta.version;
+  if (delta.type === 'room_removed') lobbyRooms.delete(delta.room);
+  else lobbyRooms.set(delta.room.room, delta.room);
+  emit('onRooms', [...lobbyRooms.values()].sort((a, b) => a.room.localeCompare(b.room)));
+}
+
 type IncomingMessage =
-  | { type: 'game_state'; state: GameState & { started?: boolean } }
+  | { type: 'game_state'; state: IncomingGameState }
+  | StateDelta
+  | { type: 'log_history'; before: number; entries: GameState['log'] }
   | { type: 'action_result'; state: GameState; dice?: GameModal }
-  | { type: 'room_list'; rooms?: RoomInfo[] }
+  | { type: 'room_list'; version?: number; rooms?: RoomInfo[] }
+  | LobbyDelta
+  | { type: 'spectating'; room: string; spectators: number }
+  | { type: 'spectators'; room: string; count: number }
+  | { type: 'replay_end'; gameId: number; steps: number }
+  | { type: 'queued'; maxPlayers: number; depth: number }
+  | { type: 'matched'; room: string }
+  | { type: 'find_cancelled' }
   | { type: 'error'; message?: string };
 
 function handleMessage(rawMessage: string): void {
@@ -40,6 +140,9 @@ function handleMessage(rawMessage: string): void {
     case 'game_state':
       handleGameState(msg.state);
       break;
+    case 'state_delta':
+      handleStateDelta(msg);
+      break;
     case 'action_result':
       state.gameState = msg.state;
       emit('onGameState', msg.state);
@@ -47,7 +150,37 @@ function handleMessage(rawMessage: string): void {
       if (msg.dice) emit('onModal', msg.dice);
       break;
     case 'room_list':
-      emit('onRooms', msg.rooms ?? []);
+      handleRoomList(msg.version, msg.rooms ?? []);
+      break;
+    case 'room_added':
+    case 'room_updated':
+    case 'room_removed':
+      handleLobbyDelta(msg);
+      break;
+    case 'log_history':
+      if (state.gameState) {
+        const newer = (state.gameState.log ?? []).filter(e => (e.seq ?? 0) >= msg.before);
+        state.gameState.log = [...newer, ...msg.entries];
+        notifyGameChanged();
+      }
+      break;
+    case 'spectating':
+      emit('onSpectators', msg.room, msg.spectators);
+      break;
+    case 'spectators':
+      emit('onSpectators', msg.room, msg.count);
+      break;
+    case 'replay_end':
+      emit('onReplayEnd', msg.gameId, msg.steps);
+      break;
+    case 'queued':
+      emit('onLobbyStatus', `Venter på motspiller (${msg.depth}/${msg.maxPlayers})...`, false);
+      break;
+    case 'matched':
+      emit('onLobbyStatus', `Spill funnet: rom "${msg.room}"`, false);
+      break;
+    case 'find_cancelled':
+      emit('onLobbyStatus', 'Søket er avbrutt', false);
       break;
     case 'error': {
       const message = msg.message ?? 'Ugyldig handling';
@@ -68,7 +201,7 @@ export function connectWS({ url, handlers: nextHandlers }: { url?: string; handl
   if (state.ws?.readyState === WebSocket.OPEN) return true;
   if (state.ws?.readyState === WebSocket.CONNECTING) return false;
 
-  state.ws = new WebSocket(activeUrl);
+  state.ws = new WebSocket(withDeltas(activeUrl));
   emit('onConnectionChange', 'connecting');
   emit('onLobbyStatus', 'Kobler til server...', false);
 
@@ -164,10 +297,10 @@ export function rejoinGame({ url, room, playerId, handlers: nextHandlers }: { ur
   sendWS({ type: 'rejoin_game', room, playerId });
 }
 
-type CreateGameOpts = { url?: string; name?: string; room?: string; handlers?: Handlers };
+type CreateGameOpts = { url?: string; name?: string; room?: string; maxPlayers?: number; handlers?: Handlers };
 
 function _createGame(
-  { url, name, room, handlers: nextHandlers }: CreateGameOpts,
+  { url, name, room, maxPlayers, handlers: nextHandlers }: CreateGameOpts,
   messageType: string,
   statusSuffix: string,
 ): boolean {
@@ -178,7 +311,7 @@ function _createGame(
   if (!cleanName || !cleanRoom) { emit('onError', 'Fyll inn navn og rom-ID'); return false; }
   state.myPlayerId = nextPlayerId();
   emit('onLobbyStatus', `Oppretter rom "${cleanRoom}"${statusSuffix}...`, false);
-  sendWS({ type: messageType, room: cleanRoom, player: { id: state.myPlayerId, name: cleanName } });
+  sendWS({ type: messageType, room: cleanRoom, player: { id: state.myPlayerId, name: cleanName }, ...(maxPlayers ? { maxPlayers } : {}) });
   return true;
 }
 
@@ -202,3 +335,38 @@ export function joinGame({ url, name, room, handlers: nextHandlers }: { url?: st
   sendWS({ type: 'join_game', room: cleanRoom, player: { id: state.myPlayerId, name: cleanName } });
   return true;
 }
+
+// Watch a room read-only: the server sends game_state, then the room's state_delta stream.
+export function spectateGame({ url, room, handlers: nextHandlers }: { url?: string; room: string; handlers?: Handlers }): void {
+  setHandlers(nextHandlers);
+  if (url) activeUrl = url.trim();
+  state.myPlayerId = null;
+  sendWS({ type: 'spectate', room });
+}
+
+// Stream an archived game (see GET api/games/); speed 1 is one action per half second.
+export function replayGame({ url, gameId, speed = 1, handlers: nextHandlers }: { url?: string; gameId: number; speed?: number; handlers?: Handlers }): void {
+  setHandlers(nextHandlers);
+  if (url) activeUrl = url.trim();
+  state.myPlayerId = null;
+  sendWS({ type: 'replay', gameId, speed });
+}
+
+export function stopReplay(): void {
+  sendWS({ type: 'stop_replay' });
+}
+
+// Matchmaking: the server seats us in a new room (matched, then game_state) or fills it with bots after a while.
+export function findGame({ url, name, maxPlayers, handlers: nextHandlers }: { url?: string; name?: string; maxPlayers?: number; handlers?: Handlers }): boolean {
+  setHandlers(nextHandlers);
+  if (url) activeUrl = url.trim();
+  const cleanName = name?.trim();
+  if (!cleanName) { emit('onError', 'Fyll inn navn'); return false; }
+  state.myPlayerId = nextPlayerId();
+  sendWS({ type: 'find_game', player: { id: state.myPlayerId, name: cleanName }, ...(maxPlayers ? { maxPlayers } : {}) });
+  return true;
+}
+
+export function cancelFind(): void {
+  sendWS({ type: 'cancel_find' });
+}
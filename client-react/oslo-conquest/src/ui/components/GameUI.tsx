@@ -247,8 +247,11 @@ function ActionContent({ dispatchGameAction }: { dispatchGameAction: (a: Action)
     return playerMatchesRef(currentPlayer, owner);
   };
 
-  const attackFromTerritoryId = 
-    neighborNodeIds.find(
+  // The server lists legal attacks; older servers don't, so fall back to guessing.
+  const legalActions = state.gameState!.legalActions;
+  const attackFromTerritoryId = legalActions
+    ? legalActions.attacks.find(([, to]) => to === node.id)?.[0] ?? null
+    : neighborNodeIds.find(
       (id) => currentPlayerOwns(state.gameState!.territories[id]?.owner)
     ) ?? null;
 
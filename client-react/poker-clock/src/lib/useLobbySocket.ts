@@ -0,0 +1,92 @@
+import { useEffect, useRef, useState } from "react";
+import type { TournamentItem } from "./types";
+
+const SERVER_ORIGIN = import.meta.env.VITE_SERVER_URL
+  || globalThis.location?.origin
+  || "http://localhost:8000";
+
+const BASE_URL = import.meta.env.BASE_URL || "/";
+const basePath = BASE_URL === "/" ? "" : BASE_URL.replace(/\/$/, "");
+
+const RECONNECT_DELAY_MS = [1000, 2000, 4000, 8000, 15000];
+
+type LobbyMessage =
+  | { type: "lobby_snapshot"; version: number; tournaments: TournamentItem[] }
+  | { type: "tournament_added"; version: number; tournament: TournamentItem }
+  | { type: "tournament_updated"; version: number; id: number; changes: Partial<TournamentItem> };
+
+function buildLobbyUrl(): string {
+  const ws = SERVER_ORIGIN.replace(/^https/, "wss").replace(/^http/, "ws");
+  return `${ws}${basePath}/ws/clock/lobby/`;
+}
+
+function upsert(list: TournamentItem[], id: number, patch: Partial<TournamentItem>): TournamentItem[] {
+  const idx = list.findIndex(t => t.id === id);
+  if (idx === -1) return [{ id, ...patch } as TournamentItem, ...list];
+  const next = list.slice();
+  next[idx] = { ...next[idx], ...patch };
+  return next;
+}
+
+/**
+ * Live tournament list pushed over ws/clock/lobby/.
+ *
+ * Returns null until the first lobby_snapshot arrives (callers fall back to REST).
+ * A version gap means a missed diff, so the hook asks for a fresh snapshot.
+ */
+export function useLobbySocket(): TournamentItem[] | null {
+  const [tournaments, setTournaments] = useState<TournamentItem[] | null>(null);
+  const versionRef = useRef(0);
+
+  useEffect(() => {
+    let ws: WebSocket | null = null;
+    let attempts = 0;
+    let unmounted = false;
+    let timer: ReturnType<typeof setTimeout> | null = null;
+
+    function connect() {
+      if (unmounted) return;
+      ws = new WebSocket(buildLobbyUrl());
+
+      ws.onopen = () => { attempts = 0; };
+
+      ws.onmessage = (evt: MessageEvent) => {
+        let msg: LobbyMessage;
+        try { msg = JSON.parse(evt.data as string); } catch { return; }
+
+        if (msg.type === "lobby_snapshot") {
+          versionRef.current = msg.version;
+          setTournaments(msg.tournaments);
+          return;
+        }
+        if (msg.version !== versionRef.current + 1) {
+          ws?.send(JSON.stringify({ type: "get_lobby" }));
+          return;
+        }
+        versionRef.current = msg.version;
+        if (msg.type === "tournament_added") {
+          setTournaments(list => upsert(list ?? [], msg.tournament.id, msg.tournament));
+        } else if (msg.type === "tournament_updated") {
+          setTournaments(list => upsert(list ?? [], msg.id, msg.changes));
+        }
+      };
+
+      ws.onclose = () => {
+        if (unmounted) return;
+        const delay = RECONNECT_DELAY_MS[Math.min(attempts, RECONNECT_DELAY_MS.length - 1)];
+        attempts += 1;
+        timer = setTimeout(connect, delay);
+      };
+    }
+
+    connect();
+
+    return () => {
+      unmounted = true;
+      if (timer) clearTimeout(timer);
+      ws?.close();
+    };
+  }, []);
+
+  return tournaments;
+}
@@ -22,6 +22,15 @@ function buildWsUrl(token: string, tournamentId: number): string {
 
 const RECONNECT_DELAY_MS = [1000, 2000, 4000, 8000, 15000];
 
+/** Batch of director operations, applied as one transaction (server: clock/bulk.py). */
+export type PlayerBatch = {
+  register?: string[];
+  bustout?: string[];
+  bustouts?: number;
+  rebuys?: number;
+  addOns?: number;
+};
+
 export function usePokerSocket(tournamentId = 1) {
   const [status, setStatus] = useState<ConnectionStatus>("disconnected");
   const [error, setError] = useState<string | null>(null);
@@ -36,7 +45,9 @@ export function usePokerSocket(tournamentId = 1) {
     unmountedRef.current = false;
 
     function scheduleReconnect() {
-      const delay = RECONNECT_DELAY_MS[Math.min(attemptsRef.current, RECONNECT_DELAY_MS.length - 1)];
+      const base = RECONNECT_DELAY_MS[Math.min(attemptsRef.current, RECONNECT_DELAY_MS.length - 1)];
+      // Jitter spreads a room full of clients reconnecting after the same Wi-Fi blip.
+      const delay = base / 2 + Math.random() * base;
       attemptsRef.current += 1;
       reconnectTimerRef.current = setTimeout(() => { void connect(); }, delay);
     }
@@ -60,9 +71,9 @@ export function usePokerSocket(tournamentId = 1) {
       wsRef.current = ws;
 
       ws.onopen = () => {
+        // The server sends a snapshot on connect; no need to ask for one.
         attemptsRef.current = 0;
         setStatus("connected");
-        ws.send(JSON.stringify({ type: "get_snapshot" }));
       };
 
       ws.onmessage = (evt: MessageEvent) => {
@@ -103,6 +114,10 @@ export function usePokerSocket(tournamentId = 1) {
           }
           return;
         }
+        if (evt.code === 1013) {
+          // Server is shedding a connect storm — skip the short delays.
+          attemptsRef.current = Math.max(attemptsRef.current, 2);
+        }
         setStatus("disconnected");
         scheduleReconnect();
       };
@@ -138,6 +153,7 @@ export function usePokerSocket(tournamentId = 1) {
       rebuy: () => send("admin_rebuy"),
       addOn: () => send("admin_add_on"),
       bustout: () => send("admin_bustout"),
+      batch: (batch: PlayerBatch) => send("admin_batch", { batch }),
     };
   }, []);
 
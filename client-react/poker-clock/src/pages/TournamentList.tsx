@@ -1,13 +1,17 @@
 import { useState } from "react";
 import { Link } from "react-router-dom";
 import { useTournamentApi } from "../lib/useTournamentApi";
+import { useLobbySocket } from "../lib/useLobbySocket";
 import TournamentCard from "./TournamentCard";
 import ThemeSwitcher from "../components/ThemeSwitcher";
 import UserMenu from "../components/UserMenu";
 
 export default function TournamentList() {
-  const { tournaments, loading, error, createTournament, renameTournament, finishTournament } =
+  const { tournaments: fetched, loading, error, createTournament, renameTournament, finishTournament } =
     useTournamentApi();
+  // Pushed lobby updates win once the socket has delivered its first snapshot.
+  const live = useLobbySocket();
+  const tournaments = live ?? fetched;
 
   const [newName, setNewName] = useState("");
   const [creating, setCreating] = useState(false);
@@ -112,7 +116,7 @@ export default function TournamentList() {
         </div>
       )}
 
-      {loading && <p className="opacity-45 italic">Laster turneringer…</p>}
+      {loading && !live && <p className="opacity-45 italic">Laster turneringer…</p>}
       {error   && <p className="text-error text-sm m-0">Feil: {error}</p>}
 
       {active.length > 0 && (
@@ -131,7 +135,7 @@ export default function TournamentList() {
         </section>
       )}
 
-      {active.length === 0 && !loading && (
+      {active.length === 0 && (!loading || live) && (
         <p className="opacity-45 italic">Ingen aktive turneringer.</p>
       )}
 
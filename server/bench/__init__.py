@@ -0,0 +1,20 @@
+"""
+Throughput / latency benchmarks.  Not collected by pytest.
+
+Run from server/:  python -m bench.<name> [--help]
+
+Benchmarks that touch the ORM call setup_django(), which boots portal.settings
+against a throwaway in-memory test database — the real sqlite file is never used.
+"""
+import os
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portal.settings")
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
@@ -0,0 +1,72 @@
+"""
+Clock connect storm — N clients reconnecting to one tournament at once.
+
+    python -m bench.connect_storm --clients 200
+
+Every client connects with its own token (the first wave after a Wi-Fi blip
+misses the token cache), waits for the initial snapshot and stays connected.
+A second wave then reconnects with the same tokens.  Latency percentiles come
+from the clock.connect.latency_ms histogram.
+"""
+import argparse
+import asyncio
+import time
+
+from bench import setup_django
+
+
+async def _wave(app, tournament_id: int, tokens: list[str]) -> float:
+    from channels.testing import WebsocketCommunicator
+
+    async def one(token: str):
+        comm = WebsocketCommunicator(app, f"/ws/clock/{tournament_id}/?token={token}")
+        connected, _ = await comm.connect(timeout=30)
+        assert connected
+        await comm.receive_json_from(timeout=30)
+        return comm
+
+    start = time.perf_counter()
+    comms = await asyncio.gather(*(one(t) for t in tokens))
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*(c.disconnect() for c in comms))
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from asgiref.sync import async_to_sync
+    from channels.routing import URLRouter
+
+    from clock import admission
+    from clock import state as gs
+    from clock.models import Tournament
+    from clock.routing import websocket_urlpatterns
+    from players.jwt import sign_access_token
+    from players.models import Player
+    from portal import metrics
+
+    # Measure the connect path itself, not the admission limiter.
+    admission._bucket = admission.TokenBucket(rate=1e6, burst=10**6)
+
+    host = Player.objects.create(display_name="Host")
+    t = Tournament.objects.create(name="Storm", host=host)
+    gs.init_state(None, tournament_id=t.id)
+    tokens = [sign_access_token(Player.objects.create(display_name=f"p{i}").id)
+              for i in range(args.clients)]
+    app = URLRouter(websocket_urlpatterns)
+
+    for label in ("cold", "warm"):
+        elapsed = async_to_sync(_wave)(app, t.id, tokens)
+        print(f"{label}: {args.clients} connects in {elapsed * 1000:7.1f} ms")
+
+    print("latency_ms", metrics.percentiles("clock.connect.latency_ms"))
+    print(f"token cache hits={metrics.get('clock.connect.token_cache.hits')} "
+          f"misses={metrics.get('clock.connect.token_cache.misses')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Load test for the WebSocket consumers — clock viewers and Oslo Conquest players together.
+
+    python -m bench.loadtest --viewers 1000 --rooms 50 --duration 20 --save /tmp/loadtest.json
+    python -m bench.loadtest --viewers 1000 --rooms 50 --duration 20 --compare /tmp/loadtest.json
+
+Every client is a channels.testing.WebsocketCommunicator on the project's
+websocket routing, in this process and over the configured channel layer
+(InMemoryChannelLayer, as in production), so the numbers include the
+layer's fan-out.
+
+  clock     --viewers sockets watch one tournament, plus its host.  The host
+            sends --admin-rate admin actions per second, drawn from ADMIN_MIX;
+            ticks are broadcast once a second as tick.py does.  "clock.admin"
+            is the host's action → own snapshot; "clock.fanout" is action →
+            snapshot at each viewer.
+  oslo      --rooms two-player rooms on ?deltas=1, each played by a driver
+            that picks from the room's legalActions (GAME_MIX weights) as a
+            client would.  "oslo.action" is action → the actor's state_delta.
+
+Reported: p50/p99 per latency kind, messages/s received by all clients, CPU
+(user + system, % of one core over the run) and RSS (now and peak).  --save
+writes them as a JSON baseline; --compare reads one and flags every latency
+p99 that rose, or throughput that fell, by more than --tolerance (exit 1).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+
+from bench import setup_django
+
+# Weighted admin actions; every one of them broadcasts exactly one snapshot.
+ADMIN_MIX = {
+    "admin_add_time": 4,
+    "admin_rebuy": 3,
+    "admin_bustout": 3,
+    "admin_add_on": 1,
+    "admin_set_players": 1,
+    "admin_reset_level": 1,
+    "admin_toggle": 1,          # admin_start or admin_pause, whichever changes the clock
+}
+# Chance a game client attacks / moves when it may, instead of ending the turn.
+GAME_MIX = {"move": 0.9, "attack": 0.6}
+CONNECT_CHUNK = 100
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def _pct(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+class Recorder:
+    """Latency samples by kind and a count of every message clients received."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.received = 0
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def observe(self, kind: str, ms: float) -> None:
+        self.latencies[kind].append(ms)
+
+    def summary(self) -> dict:
+        return {
+            kind: {"count": len(v), "p50": round(_pct(v, 0.5), 3), "p99": round(_pct(v, 0.99), 3)}
+            for kind, v in sorted(self.latencies.items()) if v
+        }
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class ResourceMeter:
+    """CPU time and wall time between start() and stop(), RSS at stop()."""
+
+    def start(self) -> None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        self._cpu = usage.ru_utime + usage.ru_stime
+        self._wall = time.perf_counter()
+
+    def stop(self) -> dict:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        wall = time.perf_counter() - self._wall
+        cpu = usage.ru_utime + usage.ru_stime - self._cpu
+        rss = _rss_mb()
+        peak = max(rss, usage.ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10))
+        return {"wall_s": round(wall, 3), "cpu_s": round(cpu, 3), "cpu_pct": round(100 * cpu / wall, 1),
+                "rss_mb": round(rss, 1), "peak_rss_mb": round(peak, 1)}
+
+
+async def _connect(app, path: str, timeout: float = 60):
+    from channels.testing import WebsocketCommunicator
+
+    comm = WebsocketCommunicator(app, path)
+    connected, code = await comm.connect(timeout=timeout)
+    if not connected:
+        raise RuntimeError(f"{path}: connect refused ({code})")
+    return comm
+
+
+async def _connect_all(app, paths: list[str]) -> list:
+    comms = []
+    for i in range(0, len(paths), CONNECT_CHUNK):
+        comms += await asyncio.gather(*(_connect(app, p) for p in paths[i:i + CONNECT_CHUNK]))
+    return comms
+
+
+# ── Clock viewers ─────────────────────────────────────────────────────────────
+
+def clock_setup(viewers: int) -> tuple[int, str, list[str]]:
+    """A fresh tournament with a host; returns (tournament id, host token, viewer tokens)."""
+    from clock import admission
+    from clock import state as gs
+    from clock.models import Tournament
+    from players.jwt import sign_access_token
+    from players.models import Player
+
+    # Measure the consumers, not the connect admission limiter.
+    admission._bucket = admission.TokenBucket(rate=1e6, burst=10**6)
+    host = Player.objects.create(display_name="Host")
+    tournament = Tournament.objects.create(name="Load test", host=host)
+    gs.init_state(None, tournament_id=tournament.id)
+    players = Player.objects.bulk_create(Player(display_name=f"v{i}") for i in range(viewers))
+    return tournament.id, sign_access_token(host.id), [sign_access_token(p.id) for p in players]
+
+
+class ClockLoad:
+    """Viewers and the host of one tournament; the host drives ADMIN_MIX at *admin_rate*/s."""
+
+    def __init__(self, app, rec: Recorder, tournament_id: int, host_token: str, tokens: list[str],
+                 admin_rate: float, rnd: random.Random) -> None:
+        self.app, self.rec, self.rnd = app, rec, rnd
+        self.tournament_id = tournament_id
+        self.host_token = host_token
+        self.tokens = tokens
+        self.admin_rate = admin_rate
+        self.sent: list[float] = []
+        self.arrivals: list[list[float]] = []
+
+    async def setup(self) -> None:
+        path = f"/ws/clock/{self.tournament_id}/?token="
+        self.viewers = await _connect_all(self.app, [path + t for t in self.tokens])
+        self.host = await _connect(self.app, path + self.host_token)
+        for comm in (*self.viewers, self.host):
+            await comm.receive_json_from(timeout=60)            # initial snapshot
+        await self.host.send_json_to({"type": "admin_set_players", "registered": 10**6})
+        for comm in (*self.viewers, self.host):
+            await _until(comm, "snapshot", self.rec)
+        self.arrivals = [[] for _ in self.viewers]
+
+    async def run(self, deadline: float) -> None:
+        drains = [asyncio.create_task(self._drain(i, comm)) for i, comm in enumerate(self.viewers)]
+        ticker = asyncio.create_task(self._tick(deadline))
+        kinds, weights = list(ADMIN_MIX), list(ADMIN_MIX.values())
+        running = False
+        try:
+            while time.perf_counter() < deadline:
+                kind = self.rnd.choices(kinds, weights)[0]
+                if kind == "admin_toggle":
+                    kind, running = ("admin_pause" if running else "admin_start"), not running
+                message = {"type": kind}
+                if kind == "admin_add_time":
+                    message["seconds"] = 60
+                elif kind == "admin_set_players":
+                    message["registered"] = 10**6 + len(self.sent)
+                start = time.perf_counter()
+                self.sent.append(start)
+                await self.host.send_json_to(message)
+                await _until(self.host, "snapshot", self.rec)
+                self.rec.observe("clock.admin", (time.perf_counter() - start) * 1000)
+                await asyncio.sleep(max(0.0, start + 1 / self.admin_rate - time.perf_counter()))
+            # Let the last fan-out land.
+            settle = time.perf_counter() + 30
+            while time.perf_counter() < settle and any(len(a) < len(self.sent) for a in self.arrivals):
+                await asyncio.sleep(0.05)
+        finally:
+            ticker.cancel()
+            for task in drains:
+                task.cancel()
+
+        # Admin actions are sent one at a time, so a viewer's k-th snapshot answers the k-th action.
+        for times in self.arrivals:
+            for at, started in zip(times, self.sent):
+                self.rec.observe("clock.fanout", (at - started) * 1000)
+            if len(times) < len(self.sent):
+                self.rec.errors["clock.fanout_missing"] += len(self.sent) - len(times)
+
+    async def close(self) -> None:
+        for comm in (*self.viewers, self.host):
+            await comm.disconnect()
+
+    async def _drain(self, i: int, comm) -> None:
+        while True:
+            message = await comm.receive_json_from(timeout=3600)
+            self.rec.received += 1
+            if message["type"] == "snapshot":
+                self.arrivals[i].append(time.perf_counter())
+
+    async def _tick(self, deadline: float) -> None:
+        from channels.layers import get_channel_layer
+
+        from clock import state as gs
+
+        layer = get_channel_layer()
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(1.0)
+            snapshot = gs.get_snapshot(tournament_id=self.tournament_id)
+            await layer.group_send(f"clock-{self.tournament_id}",
+                                   {"type": "clock.broadcast", "message": {"type": "tick", **snapshot}})
+
+
+async def _until(comm, message_type: str, rec: Recorder) -> dict:
+    while True:
+        message = await comm.receive_json_from(timeout=60)
+        rec.received += 1
+        if message["type"] == message_type:
+            return message
+
+
+# ── Oslo Conquest players ─────────────────────────────────────────────────────
+
+def _merge(target: dict, patch: dict) -> None:
+    """JSON merge-patch (RFC 7386), as the client applies state_delta changes."""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class GameClient:
+    """One player's socket: keeps its copy of the room state from game_state + state_delta."""
+
+    def __init__(self, comm, player_id: str, rec: Recorder) -> None:
+        self.comm = comm
+        self.player_id = player_id
+        self.rec = rec
+        self.state: dict = {}
+        self.version = 0
+        self.updates: asyncio.Queue = asyncio.Queue()
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            message = await self.comm.receive_json_from(timeout=3600)
+            self.rec.received += 1
+            kind = message["type"]
+            if kind == "game_state":
+                self.state = message["state"]
+                self.version = self.state.get("version", 0)
+                self.updates.put_nowait(kind)
+            elif kind == "state_delta":
+                if message["baseVersion"] != self.version:
+                    self.rec.errors["oslo.resync"] += 1
+                    await self.comm.send_json_to({"type": "sync"})
+                    continue
+                _merge(self.state, message["changes"])
+                self.version = message["version"]
+                self.updates.put_nowait(kind)
+            elif kind == "error":
+                self.updates.put_nowait(kind)
+
+    async def next_update(self) -> str:
+        return await asyncio.wait_for(self.updates.get(), timeout=60)
+
+
+def _choose(legal: dict, rnd: random.Random) -> dict | None:
+    if legal.get("checkpoints"):
+        return {"type": "choose_start_checkpoint", "checkpointTerritoryId": rnd.choice(legal["checkpoints"])}
+    if legal.get("rollDice"):
+        return {"type": "roll_dice"}
+    if legal.get("moves") and rnd.random() < GAME_MIX["move"]:
+        return {"type": "move", "toTerritoryId": rnd.choice(legal["moves"])}
+    if legal.get("attacks") and rnd.random() < GAME_MIX["attack"]:
+        a, b = rnd.choice(legal["attacks"])
+        return {"type": "attack", "fromTerritoryId": a, "toTerritoryId": b}
+    if legal.get("endTurn"):
+        return {"type": "end_turn"}
+    return None
+
+
+class OsloRoom:
+    """Two clients playing one room with random legal actions until the deadline or a winner."""
+
+    def __init__(self, app, rec: Recorder, room: str, rnd: random.Random) -> None:
+        self.app, self.rec, self.room, self.rnd = app, rec, room, rnd
+
+    async def setup(self) -> None:
+        comms = [await _connect(self.app, "/ws/oslo-conquest/?deltas=1") for _ in range(2)]
+        for comm in comms:
+            await comm.receive_json_from(timeout=60)            # room_list
+            self.rec.received += 1
+        self.red = GameClient(comms[0], f"{self.room}-r", self.rec)
+        self.blue = GameClient(comms[1], f"{self.room}-b", self.rec)
+        await self.red.comm.send_json_to({"type": "create_game", "room": self.room,
+                                          "player": {"id": self.red.player_id}})
+        await self.red.next_update()
+        await self.blue.comm.send_json_to({"type": "join_game", "room": self.room,
+                                           "player": {"id": self.blue.player_id}})
+        await self.red.next_update()
+        await self.blue.next_update()
+
+    async def run(self, deadline: float) -> None:
+        red, blue = self.red, self.blue
+        clients = {"red": red, "blue": blue}
+        while time.perf_counter() < deadline:
+            legal = red.state.get("legalActions")
+            if red.state.get("winner") or not legal:
+                break
+            actor = clients[legal["side"]]
+            action = _choose(actor.state.get("legalActions") or legal, self.rnd)
+            if action is None:
+                break
+            start = time.perf_counter()
+            await actor.comm.send_json_to(action)
+            if await actor.next_update() == "error":
+                self.rec.errors["oslo.rejected"] += 1
+            self.rec.observe("oslo.action", (time.perf_counter() - start) * 1000)
+            other = blue if actor is red else red
+            while other.version < actor.version:
+                await other.next_update()
+            # Both copies are current; drop notifications for updates already applied.
+            for client in (red, blue):
+                while not client.updates.empty():
+                    client.updates.get_nowait()
+
+    async def close(self) -> None:
+        for client in (self.red, self.blue):
+            client.reader.cancel()
+            await client.comm.disconnect()
+
+
+# ── Baselines ─────────────────────────────────────────────────────────────────
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of *result* against *baseline*: p99 up or msgs/s down by more than *tolerance*."""
+    problems = []
+    for kind, now in result["latency_ms"].items():
+        then = baseline.get("latency_ms", {}).get(kind)
+        if then and then["p99"] and now["p99"] > then["p99"] * (1 + tolerance):
+            problems.append(f"{kind} p99 {then['p99']:.1f} → {now['p99']:.1f} ms")
+    then_rate = baseline.get("msgs_per_s")
+    if then_rate and result["msgs_per_s"] < then_rate * (1 - tolerance):
+        problems.append(f"msgs/s {then_rate:.0f} → {result['msgs_per_s']:.0f}")
+    return problems
+
+
+def _print(result: dict, baseline: dict | None) -> None:
+    print(f"{'':14s} {'count':>7s} {'p50 ms':>9s} {'p99 ms':>9s}" + ("   baseline p99" if baseline else ""))
+    for kind, row in result["latency_ms"].items():
+        line = f"{kind:14s} {row['count']:7d} {row['p50']:9.2f} {row['p99']:9.2f}"
+        then = (baseline or {}).get("latency_ms", {}).get(kind)
+        if then:
+            line += f"   {then['p99']:9.2f}"
+        print(line)
+    res = result["resources"]
+    print(f"messages       {result['messages']} received, {result['msgs_per_s']:.0f}/s")
+    print(f"cpu            {res['cpu_s']:.2f} s over {res['wall_s']:.2f} s ({res['cpu_pct']:.0f}% of one core)")
+    print(f"rss            {res['rss_mb']:.1f} MB (peak {res['peak_rss_mb']:.1f} MB)")
+    if result["errors"]:
+        print("errors         " + ", ".join(f"{k}={v}" for k, v in sorted(result["errors"].items())))
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+async def _run(args, clock_setup_result: tuple | None) -> dict:
+    """Connect every client, then apply load for args.duration seconds and measure only that."""
+    from channels.routing import URLRouter
+
+    from clock.routing import websocket_urlpatterns as clock_urls
+    from oslo_conquest.routing import websocket_urlpatterns as oslo_urls
+
+    app = URLRouter(clock_urls + oslo_urls)
+    rnd = random.Random(args.seed)
+    rec = Recorder()
+    scenarios = [OsloRoom(app, rec, f"load-{i}", random.Random(rnd.random())) for i in range(args.rooms)]
+    if clock_setup_result is not None:
+        scenarios.append(ClockLoad(app, rec, *clock_setup_result, args.admin_rate, random.Random(rnd.random())))
+
+    for scenario in scenarios:
+        await scenario.setup()
+    rec.received = 0
+
+    meter = ResourceMeter()
+    meter.start()
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*(scenario.run(deadline) for scenario in scenarios))
+    resources = meter.stop()
+    for scenario in scenarios:
+        await scenario.close()
+
+    return {
+        "config": {"viewers": args.viewers, "rooms": args.rooms, "duration_s": args.duration,
+                   "admin_rate": args.admin_rate, "seed": args.seed},
+        "latency_ms": rec.summary(),
+        "messages": rec.received,
+        "msgs_per_s": round(rec.received / resources["wall_s"], 1),
+        "resources": resources,
+        "errors": dict(rec.errors),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--viewers", type=int, default=500, help="clock viewers (0 = no clock load)")
+    parser.add_argument("--rooms", type=int, default=25, help="two-player Oslo Conquest rooms")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of load after setup")
+    parser.add_argument("--admin-rate", type=float, default=2.0, help="clock admin actions per second")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="PATH", help="write the result as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    setup_django()
+    from oslo_conquest import persistence
+    persistence.WRITE_BEHIND = False
+
+    setup = clock_setup(args.viewers) if args.viewers else None
+    result = asyncio.run(_run(args, setup))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    _print(result, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"baseline saved to {args.save}")
+    if baseline is not None:
+        problems = compare(result, baseline, args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION  {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Lobby list throughput — GET /clock/api/tournaments/ uncached vs cached.
+
+    python -m bench.lobby_cache --tournaments 50 --players 20 --requests 2000
+
+"Uncached" invalidates before every request, which is the pre-cache code path
+(one annotated query + serialisation per request).
+"""
+import argparse
+import time
+
+from bench import setup_django
+
+
+def _seed(tournaments: int, players: int) -> None:
+    from clock.models import Player, Tournament, TournamentEntry
+    for i in range(tournaments):
+        t = Tournament.objects.create(name=f"Turnering {i}")
+        for j in range(players):
+            p = Player.objects.create(username=f"p{i}-{j}@example.com")
+            TournamentEntry.objects.create(player=p, tournament=t)
+
+
+def _run(client, requests: int, invalidate_each: bool) -> float:
+    from clock import lobby
+    start = time.perf_counter()
+    for _ in range(requests):
+        if invalidate_each:
+            lobby.invalidate()
+        r = client.get("/clock/api/tournaments/?status=pending")
+        assert r.status_code == 200
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tournaments", type=int, default=50)
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from portal import metrics
+
+    _seed(args.tournaments, args.players)
+    client = Client()
+
+    uncached = _run(client, args.requests, invalidate_each=True)
+    cached = _run(client, args.requests, invalidate_each=False)
+
+    print(f"tournaments={args.tournaments} players/tournament={args.players} requests={args.requests}")
+    print(f"uncached: {uncached:10.0f} req/s")
+    print(f"cached:   {cached:10.0f} req/s   ({cached / uncached:.1f}x)")
+    print(f"hits={metrics.get('clock.lobby_cache.hits')} misses={metrics.get('clock.lobby_cache.misses')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Oslo Conquest bots — search bot decisions/sec and win rate against the simple bot.
+
+    python -m bench.oslo_bot --games 20 --budget 0.01
+
+Every game is search (bot_search.choose_action) against bot.get_bot_action,
+alternating sides; it is a draw after simulator.MAX_TURNS turns, and draws
+are broken down by who held more territory.  Decision timings cover every
+search decision; attack decisions (the ones that search) are listed apart.
+"""
+import argparse
+import time
+
+from oslo_conquest import bot_search
+from oslo_conquest.bot import BOT_PLAYER_ID, get_bot_action
+from oslo_conquest.mvp import apply_action, create_bot_room, get_board
+from oslo_conquest.simulator import MAX_TURNS, RED_PLAYER
+
+
+def _simple(room_state: dict, player_id: str) -> dict | None:
+    bot_action = get_bot_action(room_state, player_id)
+    if bot_action is None:
+        return None
+    action = {"type": bot_action["type"], "playerId": player_id}
+    if bot_action["type"] == "choose_start_checkpoint":
+        action["checkpointTerritoryId"] = bot_action["checkpointId"]
+    return action
+
+
+def _game(seed: int, search_side: str, budget: float, timings: dict) -> tuple[str, dict]:
+    state = create_bot_room(f"bench-{seed}", RED_PLAYER, seed=seed)
+    ids = {"red": RED_PLAYER["id"], "blue": BOT_PLAYER_ID}
+    turns = 0
+    while not state.get("winner") and turns < MAX_TURNS:
+        side = state["activePlayer"]
+        if side == search_side:
+            start = time.perf_counter()
+            action = bot_search.choose_action(state, ids[side], budget)
+            elapsed = time.perf_counter() - start
+            timings["all"].append(elapsed)
+            if action["type"] == "attack" or (action["type"] == "end_turn" and state["phase"] == "playing"):
+                timings["attack"].append(elapsed)
+        else:
+            action = _simple(state, ids[side])
+        state, error = apply_action(state, action)
+        if error:
+            raise RuntimeError(f"{side}: {error} ({action})")
+        if action["type"] == "end_turn" and state["phase"] == "playing":
+            turns += 1
+    board = get_board(state)
+    return state.get("winner") or "draw", {side: board.count(side) for side in ("red", "blue")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=bot_search.BOT_BUDGET_S)
+    args = parser.parse_args()
+
+    timings: dict[str, list[float]] = {"all": [], "attack": []}
+    results = {"search": 0, "simple": 0, "draw": 0}
+    leads = {"search": 0, "simple": 0, "even": 0}
+    start = time.perf_counter()
+    for seed in range(args.games):
+        search_side = ("red", "blue")[seed % 2]
+        simple_side = "blue" if search_side == "red" else "red"
+        winner, territories = _game(seed, search_side, args.budget, timings)
+        if winner == "draw":
+            results["draw"] += 1
+            diff = territories[search_side] - territories[simple_side]
+            leads["search" if diff > 0 else "simple" if diff < 0 else "even"] += 1
+        else:
+            results["search" if winner == search_side else "simple"] += 1
+    elapsed = time.perf_counter() - start
+
+    for name, values in timings.items():
+        values.sort()
+        if values:
+            print(f"{name:7} decisions {len(values):7}  {len(values) / sum(values):10.0f}/s  "
+                  f"p50 {values[len(values) // 2] * 1000:7.3f} ms  max {values[-1] * 1000:7.3f} ms")
+    print(f"{args.games} games in {elapsed:.1f}s (budget {args.budget * 1000:.1f} ms)")
+    print(f"wins  search {results['search']}  simple {results['simple']}  draw {results['draw']}")
+    print(f"draws led by  search {leads['search']}  simple {leads['simple']}  even {leads['even']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Oslo Conquest matchmaking — a thousand players queueing at once.
+
+    python -m bench.oslo_matchmaking --players 1000 --sizes 2 4
+
+Every client connects first, then all send find_game together (room sizes
+taken round-robin from --sizes).  "time to match" is from a client's
+find_game to its game_state in the new room; "server wait" is the
+oslo.matchmaking.wait_ms histogram (queued → matched).  Every client runs in
+this process over InMemoryChannelLayer, whose receive() scans every channel,
+so "time to match" is mostly the harness; "server wait" is the queue itself.
+"queue ops" times join + leave on the bare queue with --players tickets
+waiting, per ticket.
+"""
+import argparse
+import asyncio
+import time
+
+from bench import setup_django
+
+
+def _pct(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+async def _run(app, players: int, sizes: list[int]) -> tuple[list[float], float]:
+    from channels.testing import WebsocketCommunicator
+
+    async def connect() -> WebsocketCommunicator:
+        comm = WebsocketCommunicator(app, "/ws/oslo-conquest/?deltas=1")
+        connected, _ = await comm.connect(timeout=60)
+        assert connected
+        await comm.receive_json_from(timeout=60)          # room_list
+        return comm
+
+    async def find(comm, i: int) -> float:
+        size = sizes[i % len(sizes)]
+        start = time.perf_counter()
+        await comm.send_json_to({"type": "find_game", "player": {"id": f"mm-{i}", "name": f"P{i}"},
+                                 "maxPlayers": size})
+        while True:
+            message = await comm.receive_json_from(timeout=60)
+            if message["type"] == "game_state":
+                return (time.perf_counter() - start) * 1000
+
+    clients = []
+    for chunk in range(0, players, 100):
+        clients += await asyncio.gather(*(connect() for _ in range(min(100, players - chunk))))
+
+    start = time.perf_counter()
+    waits = await asyncio.gather(*(find(comm, i) for i, comm in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+    for comm in clients:
+        await comm.disconnect()
+    return list(waits), elapsed
+
+
+def _queue_ops(players: int) -> float:
+    from oslo_conquest import matchmaking
+
+    async def seat(room: str) -> bool:
+        return True
+
+    async def run() -> float:
+        size = players + 1            # never full: measures the queue, not matching
+        tickets = [matchmaking.Ticket({"id": f"q{i}"}, size, seat) for i in range(players)]
+        start = time.perf_counter()
+        for ticket in tickets:
+            matchmaking.join(ticket)
+        for ticket in tickets:
+            matchmaking.leave(ticket.player_id, size)
+        elapsed = time.perf_counter() - start
+        for task in list(matchmaking._timers.values()):
+            task.cancel()
+        return elapsed / players * 1e6
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2])
+    args = parser.parse_args()
+
+    setup_django()
+    from oslo_conquest import persistence
+    from oslo_conquest.consumers import OsloConquestConsumer
+    from portal import metrics
+
+    persistence.WRITE_BEHIND = False
+    app = OsloConquestConsumer.as_asgi()
+    waits, elapsed = asyncio.run(_run(app, args.players, args.sizes))
+    server = metrics.percentiles("oslo.matchmaking.wait_ms")
+
+    print(f"{args.players} players, sizes {args.sizes}: all matched in {elapsed:.2f} s")
+    print(f"time to match  p50 {_pct(waits, 0.5):8.1f} ms   p99 {_pct(waits, 0.99):8.1f} ms")
+    print(f"server wait    p50 {server['p50']:8.1f} ms   p99 {server['p99']:8.1f} ms")
+    print(f"queue ops      {_queue_ops(args.players):8.2f} µs/ticket (join + leave)")
+
+
+if __name__ == "__main__":
+    main()
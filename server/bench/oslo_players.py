@@ -0,0 +1,78 @@
+"""
+Oslo Conquest per-action cost by room size — 2 to 6 players.
+
+    python -m bench.oslo_players --actions 20000
+
+Plays random legal games (no forfeits, at most GAME_ACTIONS actions each, so
+setup is part of the mix) in rooms of each size and times, per
+applied action, mvp.apply_action and legal_summary (what every broadcast
+carries).  Turn passing, ownership counts and the win check are O(1) in the
+number of players, so the 6-player row should be within noise of the 2-player
+row.
+"""
+import argparse
+import random
+import time
+
+from oslo_conquest.mvp import (
+    MAX_PLAYERS,
+    MIN_PLAYERS,
+    add_player,
+    apply_action,
+    create_waiting_room,
+    legal_actions,
+    legal_summary,
+)
+
+GAME_ACTIONS = 500
+
+
+def _new_room(players: int, seed: int) -> dict:
+    state = create_waiting_room(f"bench-{players}", {"id": "p0"}, seed=seed, size=players)
+    for i in range(1, players):
+        state, _ = add_player(state, {"id": f"p{i}"})
+    return state
+
+
+def _measure(players: int, actions: int, seed: int) -> tuple[float, float, int]:
+    rnd = random.Random(seed)
+    state = _new_room(players, seed)
+    apply_s = summary_s = 0.0
+    games, played, applied = 1, 0, 0
+    for _ in range(actions):
+        options = [a for a in legal_actions(state) if a["type"] != "forfeit"]
+        if not options or state.get("winner") or played == GAME_ACTIONS:
+            played = 0
+            games += 1
+            state = _new_room(players, seed + games)
+            continue
+        action = rnd.choice(options)
+        played += 1
+        applied += 1
+        start = time.perf_counter()
+        state, error = apply_action(state, action)
+        mid = time.perf_counter()
+        legal_summary(state)
+        summary_s += time.perf_counter() - mid
+        apply_s += mid - start
+        assert error is None, (action, error)
+    return apply_s / applied * 1e6, summary_s / applied * 1e6, games
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--actions", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    base = None
+    print("players  apply_action  legal_summary   games")
+    for players in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+        apply_us, summary_us, games = _measure(players, args.actions, args.seed)
+        base = base or apply_us + summary_us
+        ratio = (apply_us + summary_us) / base
+        print(f"{players:7d}  {apply_us:9.2f} µs  {summary_us:10.2f} µs  {games:6d}   ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Oslo Conquest movement lookup — per-roll BFS vs precomputed board tables.
+
+    python -m bench.oslo_reachable --rounds 20000
+
+"bfs" is the previous mvp._reachable_territories (list queue, tuple membership);
+"table" is board.reachable().  Each round asks for every (territory, roll) pair.
+"""
+import argparse
+import time
+
+from oslo_conquest.board import ADJACENCY, MAX_DICE, TERRITORY_IDS, reachable
+
+
+def _bfs(start_id: str | None, max_steps: int) -> list[str]:
+    if not start_id or max_steps <= 0:
+        return []
+
+    visited: dict[str, int] = {start_id: 0}
+    queue: list[str] = [start_id]
+
+    while queue:
+        node = queue.pop(0)
+        depth = visited[node]
+        if depth >= max_steps:
+            continue
+
+        for neighbor in ADJACENCY.get(node, []):
+            if neighbor not in TERRITORY_IDS:
+                continue
+            if neighbor in visited and visited[neighbor] <= depth + 1:
+                continue
+            visited[neighbor] = depth + 1
+            queue.append(neighbor)
+
+    return sorted([territory_id for territory_id, dist in visited.items() if dist > 0])
+
+
+def _table(start_id: str | None, max_steps: int) -> list[str]:
+    return list(reachable(start_id, max_steps))
+
+
+def _run(fn, rounds: int) -> float:
+    pairs = [(tid, roll) for tid in TERRITORY_IDS for roll in range(1, MAX_DICE + 1)]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for tid, roll in pairs:
+            fn(tid, roll)
+    return rounds * len(pairs) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    for tid in TERRITORY_IDS:
+        for roll in range(1, MAX_DICE + 1):
+            assert _bfs(tid, roll) == _table(tid, roll), (tid, roll)
+
+    bfs = _run(_bfs, args.rounds)
+    table = _run(_table, args.rounds)
+    print(f"bfs:   {bfs:12.0f} lookups/s")
+    print(f"table: {table:12.0f} lookups/s   ({table / bfs:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
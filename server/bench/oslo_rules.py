@@ -0,0 +1,96 @@
+"""
+Oslo Conquest rule validation — tuple/list scans vs precomputed sets and player index.
+
+    python -m bench.oslo_rules --rounds 2000
+
+"scan" is the previous attack/move validation: player found by a linear scan
+of players, ids checked against TERRITORY_IDS/CHECKPOINT_IDS tuples and the
+ADJACENCY lists.  "table" is the same checks through find_player_by_id and the
+board's frozensets.  Each round validates an attack over every (from, to) pair
+and a move to every territory.  "apply_action" is mvp end to end on actions
+that fail validation (nothing is mutated), per action.
+"""
+import argparse
+import time
+
+from oslo_conquest.board import (
+    ADJACENCY,
+    CHECKPOINT_IDS,
+    CHECKPOINT_SET,
+    NEIGHBORS,
+    TERRITORY_IDS,
+    TERRITORY_SET,
+)
+from oslo_conquest.bot import BOT_PLAYER_ID
+from oslo_conquest.mvp import apply_action, create_bot_room, find_player_by_id
+
+_PAIRS = [(a, b) for a in TERRITORY_IDS for b in TERRITORY_IDS]
+
+
+def _scan(room_state: dict, player_id: str) -> int:
+    ok = 0
+    for from_id, to_id in _PAIRS:
+        player = next((p for p in room_state["players"] if p.get("id") == player_id), None)
+        if player and from_id not in CHECKPOINT_IDS and to_id not in CHECKPOINT_IDS \
+                and to_id in ADJACENCY.get(from_id, []):
+            ok += 1
+    for tid in TERRITORY_IDS:
+        player = next((p for p in room_state["players"] if p.get("id") == player_id), None)
+        if player and tid in TERRITORY_IDS and tid not in CHECKPOINT_IDS:
+            ok += 1
+    return ok
+
+
+def _table(room_state: dict, player_id: str) -> int:
+    ok = 0
+    for from_id, to_id in _PAIRS:
+        player = find_player_by_id(room_state, player_id)
+        if player and from_id not in CHECKPOINT_SET and to_id not in CHECKPOINT_SET \
+                and to_id in NEIGHBORS[from_id]:
+            ok += 1
+    for tid in TERRITORY_IDS:
+        player = find_player_by_id(room_state, player_id)
+        if player and tid in TERRITORY_SET and tid not in CHECKPOINT_SET:
+            ok += 1
+    return ok
+
+
+def _run(fn, room_state: dict, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(room_state, BOT_PLAYER_ID)
+    return rounds * (len(_PAIRS) + len(TERRITORY_IDS)) / (time.perf_counter() - start)
+
+
+def _rejected(room_state: dict, rounds: int) -> float:
+    # Red is to move: every blue action is rejected after the player lookup,
+    # every red attack on a non-neighbour after the adjacency check.
+    actions = [{"type": "attack", "playerId": "p1", "fromTerritoryId": "t0a", "toTerritoryId": "t35"},
+               {"type": "attack", "playerId": BOT_PLAYER_ID, "fromTerritoryId": "t35", "toTerritoryId": "t34"},
+               {"type": "move", "playerId": "p1", "toTerritoryId": "nowhere"}]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for action in actions:
+            _, error = apply_action(room_state, action)
+            assert error
+    return (time.perf_counter() - start) / (rounds * len(actions)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    state = create_bot_room("bench", {"id": "p1"}, seed=1)
+    state["phase"] = "playing"
+    assert _scan(state, BOT_PLAYER_ID) == _table(state, BOT_PLAYER_ID)
+
+    scan = _run(_scan, state, args.rounds // 10 or 1)
+    table = _run(_table, state, args.rounds // 10 or 1)
+    print(f"scan:  {scan:12.0f} checks/s")
+    print(f"table: {table:12.0f} checks/s   ({table / scan:.1f}x)")
+    print(f"apply_action (rejected): {_rejected(state, args.rounds):.2f} µs/action")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Oslo Conquest spectators — player action latency with and without an audience.
+
+    python -m bench.oslo_spectators --spectators 0 200 --actions 200
+
+Two players take turns (roll_dice, end_turn) in one room while N spectators
+watch it, each draining its socket.  "server" is oslo.action.latency_ms (op
+queued → players' broadcast sent), which spectator fan-out runs after and
+should not move with N.  "round trip" is the acting player's client from
+sending the action to receiving its state_delta; every client runs in this
+process, so it also pays for N in-process sockets being drained.  "lag" is how
+far the last spectator's delta trails the acting player's.
+"""
+import argparse
+import asyncio
+import time
+
+from bench import setup_django
+
+
+def _pct(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+async def _run(app, n_spectators: int, actions: int) -> tuple[list[float], list[float]]:
+    from channels.testing import WebsocketCommunicator
+
+    async def connect() -> WebsocketCommunicator:
+        comm = WebsocketCommunicator(app, "/ws/oslo-conquest/?deltas=1")
+        connected, _ = await comm.connect(timeout=30)
+        assert connected
+        await comm.receive_json_from(timeout=30)          # room_list
+        return comm
+
+    async def until(comm, message_type: str) -> dict:
+        while True:
+            message = await comm.receive_json_from(timeout=30)
+            if message["type"] == message_type:
+                return message
+
+    room = f"bench-{n_spectators}"
+    red, blue = await connect(), await connect()
+    await red.send_json_to({"type": "create_game", "room": room, "player": {"id": f"{room}-r", "name": "Red"}})
+    await until(red, "game_state")
+    await blue.send_json_to({"type": "join_game", "room": room, "player": {"id": f"{room}-b", "name": "Blue"}})
+    await until(red, "game_state")
+    await until(blue, "game_state")
+    for comm, checkpoint in ((red, "lysaker_cp"), (blue, "kolbotn_cp")):
+        await comm.send_json_to({"type": "choose_start_checkpoint", "checkpointTerritoryId": checkpoint})
+        await until(red, "state_delta")
+        await until(blue, "state_delta")
+        await comm.send_json_to({"type": "end_turn"})
+        await until(red, "state_delta")
+        await until(blue, "state_delta")
+
+    watchers = await asyncio.gather(*(connect() for _ in range(n_spectators)))
+    for comm in watchers:
+        await comm.send_json_to({"type": "spectate", "room": room})
+        await until(comm, "game_state")
+
+    seen: dict[int, float] = {}
+
+    async def drain(comm) -> None:
+        while True:
+            message = await comm.receive_json_from(timeout=30)
+            if message["type"] == "state_delta":
+                seen[message["version"]] = time.perf_counter()
+
+    drains = [asyncio.create_task(drain(comm)) for comm in watchers]
+    latencies, lags = [], []
+    players = (red, blue)
+    for i in range(actions):
+        actor, other = players[(i // 2) % 2], players[1 - (i // 2) % 2]
+        start = time.perf_counter()
+        await actor.send_json_to({"type": "roll_dice" if i % 2 == 0 else "end_turn"})
+        delta = await until(actor, "state_delta")
+        done = time.perf_counter()
+        await until(other, "state_delta")
+        latencies.append((done - start) * 1000)
+        if watchers:
+            while delta["version"] not in seen:
+                await asyncio.sleep(0)
+            lags.append((seen[delta["version"]] - done) * 1000)
+
+    for task in drains:
+        task.cancel()
+    await asyncio.gather(*(c.disconnect() for c in (red, blue, *watchers)))
+    return latencies, lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--spectators", type=int, nargs="+", default=[0, 200])
+    parser.add_argument("--actions", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from asgiref.sync import async_to_sync
+    from channels.routing import URLRouter
+
+    from oslo_conquest import persistence
+    from portal import metrics
+    from oslo_conquest.routing import websocket_urlpatterns
+
+    persistence.WRITE_BEHIND = False
+    app = URLRouter(websocket_urlpatterns)
+
+    for n in args.spectators:
+        metrics._histograms.pop("oslo.action.latency_ms", None)    # per run
+        latencies, lags = async_to_sync(_run)(app, n, args.actions)
+        server = metrics.percentiles("oslo.action.latency_ms")
+        line = (f"{n:5d} spectators: server p50={server['p50']:6.2f} ms p99={server['p99']:6.2f} ms"
+                f"   round trip p50={_pct(latencies, 0.5):6.2f} ms p99={_pct(latencies, 0.99):6.2f} ms")
+        if lags:
+            line += f"   spectator lag p50={_pct(lags, 0.5):6.2f} ms p99={_pct(lags, 0.99):6.2f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
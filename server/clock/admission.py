@@ -0,0 +1,146 @@
+"""
+Connect fast path for ClockConsumer.
+
+When every TV and phone in the room reconnects after a Wi-Fi blip, each connect
+used to decode its JWT on the event loop and hit the DB for the tournament host.
+This module keeps that work off the loop and mostly out of the DB:
+
+  verify_token()  decoded tokens are cached until they expire; misses are decoded
+                  in a worker thread.
+  host_id()       tournament host per tournament, cached for HOST_CACHE_TTL_S and
+                  dropped whenever a Tournament is saved or a players.Player deleted.
+  admit()         token-bucket admission control (CONNECT_RATE per second, bursts
+                  of CONNECT_BURST).  A connect waits for its slot, or is refused
+                  when the wait would exceed CONNECT_MAX_WAIT_S.  Only connects
+                  with a verified token reach it.
+
+Connect latency is recorded in the "clock.connect.latency_ms" histogram.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from portal import metrics
+
+TOKEN_CACHE_SIZE = 4096
+HOST_CACHE_TTL_S = 60
+
+CONNECT_RATE = 50          # admitted connects per second
+CONNECT_BURST = 100
+CONNECT_MAX_WAIT_S = 5.0
+
+_lock = threading.Lock()
+_tokens: OrderedDict[str, dict] = OrderedDict()    # token → payload (LRU)
+_hosts: dict[int, tuple[str | None, float]] = {}   # tournament id → (host id, expires_at)
+
+
+# ── Tokens ────────────────────────────────────────────────────────────────────
+
+async def verify_token(token: str) -> dict | None:
+    """Decoded payload for *token*, or None.  Only valid tokens are cached."""
+    now = time.time()
+    with _lock:
+        payload = _tokens.get(token)
+        if payload is not None:
+            if payload.get("exp", 0) > now:
+                _tokens.move_to_end(token)
+                metrics.incr("clock.connect.token_cache.hits")
+                return payload
+            del _tokens[token]
+
+    metrics.incr("clock.connect.token_cache.misses")
+    from players.jwt import decode_token
+    payload = await sync_to_async(decode_token, thread_sensitive=False)(token)
+    if payload:
+        with _lock:
+            _tokens[token] = payload
+            if len(_tokens) > TOKEN_CACHE_SIZE:
+                _tokens.popitem(last=False)
+    return payload
+
+
+# ── Tournament host ───────────────────────────────────────────────────────────
+
+def _load_host_id(tournament_id: int) -> str | None:
+    from .models import Tournament
+    try:
+        row = Tournament.objects.values("host_id").get(pk=tournament_id)
+        return str(row["host_id"]) if row["host_id"] is not None else None
+    except Tournament.DoesNotExist:
+        return None
+
+
+async def host_id(tournament_id: int) -> str | None:
+    now = time.monotonic()
+    with _lock:
+        cached = _hosts.get(tournament_id)
+        if cached and cached[1] > now:
+            return cached[0]
+
+    host = await database_sync_to_async(_load_host_id)(tournament_id)
+    with _lock:
+        _hosts[tournament_id] = (host, now + HOST_CACHE_TTL_S)
+    return host
+
+
+def invalidate_host(tournament_id: int | None = None) -> None:
+    """Forget the cached host of one tournament (or of all when None)."""
+    with _lock:
+        if tournament_id is None:
+            _hosts.clear()
+        else:
+            _hosts.pop(tournament_id, None)
+
+
+@receiver(post_save, sender="clock.Tournament")
+def _tournament_saved(sender, instance, **kwargs) -> None:
+    invalidate_host(instance.pk)
+
+
+@receiver(post_delete, sender="players.Player")
+def _player_deleted(sender, instance, **kwargs) -> None:
+    # Tournament.host is SET_NULL via a bulk update, which sends no post_save.
+    invalidate_host()
+
+
+# ── Admission control ─────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """Reservation-style token bucket: callers are told how long to wait for their slot."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait_s: float) -> float | None:
+        """Seconds to wait before proceeding, or None if that would exceed *max_wait_s*."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait_s:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+_bucket = TokenBucket(CONNECT_RATE, CONNECT_BURST)
+
+
+def admit() -> float | None:
+    """Reserve a connect slot. Returns the delay to sleep first, or None to refuse."""
+    wait = _bucket.reserve(CONNECT_MAX_WAIT_S)
+    if wait is None:
+        metrics.incr("clock.connect.rejected")
+    elif wait > 0:
+        metrics.incr("clock.connect.delayed")
+    return wait
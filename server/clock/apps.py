@@ -6,6 +6,8 @@ class ClockConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
 
     def ready(self) -> None:
+        from . import admission  # noqa: F401  (connects host-cache signal receivers)
+
         import os
         import sys
         argv = sys.argv
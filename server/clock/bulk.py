@@ -0,0 +1,154 @@
+"""
+Batch director operations — walk-ins, final-table bustouts, rebuy/add-on rounds.
+
+One batch is one call to apply_batch():
+
+  {
+    "register": ["ola", "kari", ...],   # usernames to register (created if new)
+    "bustout":  ["ola", ...],           # usernames to mark busted
+    "bustouts": 2,                      # anonymous bustouts (counter only)
+    "rebuys":   3,
+    "addOns":   5
+  }
+
+All entry changes run in one transaction.  After commit the counters change in
+one state mutation, followed by one debounced save, one snapshot broadcast and one
+lobby update, however many players the batch touches.
+
+Used by TournamentBatchView (REST) and the admin_batch WebSocket message.
+"""
+from django.db import transaction
+
+from . import lobby
+from . import state as gs
+from .models import Player, Tournament, TournamentEntry
+from .persistence import broadcast_snapshot, schedule_save
+
+MAX_BATCH = 500
+
+_COUNT_KEYS = ("bustouts", "rebuys", "addOns")
+
+
+def parse_batch(body: dict) -> tuple[dict | None, str | None]:
+    """Validate a batch request body. Returns (ops, None) or (None, error)."""
+    if not isinstance(body, dict):
+        return None, "Body must be a JSON object"
+
+    ops: dict = {}
+    for key in ("register", "bustout"):
+        names = body.get(key) or []
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            return None, f"{key} must be a list of usernames"
+        # Strip, drop blanks and duplicates, keep order.
+        cleaned = list(dict.fromkeys(n.strip() for n in names if n.strip()))
+        if len(cleaned) > MAX_BATCH:
+            return None, f"{key} may contain at most {MAX_BATCH} usernames"
+        if any(len(n) > 255 for n in cleaned):
+            return None, "usernames must be 255 characters or fewer"
+        ops[key] = cleaned
+
+    for key in _COUNT_KEYS:
+        value = body.get(key, 0)
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= MAX_BATCH:
+            return None, f"{key} must be an integer between 0 and {MAX_BATCH}"
+        ops[key] = value
+
+    if not any(ops.values()):
+        return None, "Empty batch"
+    return ops, None
+
+
+def apply_batch(tournament_id: int, ops: dict) -> tuple[dict | None, str | None]:
+    """Apply parsed *ops* to a tournament. Returns (result, None) or (None, error)."""
+    with transaction.atomic():
+        try:
+            tournament = Tournament.lock(tournament_id)
+        except Tournament.DoesNotExist:
+            return None, "Tournament not found"
+        if tournament.status == Tournament.STATUS_FINISHED:
+            return None, "Tournament is already finished"
+
+        result = _register(tournament, ops["register"])
+        result["busted"] = _bustout(tournament, ops["bustout"]) + ops["bustouts"]
+        result["rebuys"] = ops["rebuys"]
+        result["addOns"] = ops["addOns"]
+
+        deltas = {
+            "registered": len(result["registered"]),
+            "busted":     result["busted"],
+            "rebuyCount": result["rebuys"],
+            "addOnCount": result["addOns"],
+        }
+        transaction.on_commit(lambda: _publish(tournament_id, deltas, result))
+
+    return result, None
+
+
+def _register(tournament: Tournament, usernames: list[str]) -> dict:
+    result: dict = {"registered": [], "alreadyRegistered": [], "conflicts": []}
+    if not usernames:
+        return result
+
+    Player.objects.bulk_create([Player(username=u) for u in usernames], ignore_conflicts=True)
+    players = {
+        p.username: p
+        for p in Player.objects.select_for_update().filter(username__in=usernames)
+    }
+
+    conflicts = dict(
+        TournamentEntry.objects
+        .filter(
+            player__in=players.values(),
+            is_active=True,
+            tournament__status__in=[Tournament.STATUS_PENDING, Tournament.STATUS_RUNNING],
+        )
+        .exclude(tournament=tournament)
+        .values_list("player__username", "tournament_id")
+    )
+    existing = dict(
+        TournamentEntry.objects
+        .filter(tournament=tournament, player__in=players.values())
+        .values_list("player__username", "is_active")
+    )
+
+    reactivate: list[str] = []
+    new_entries: list[TournamentEntry] = []
+    for username in usernames:
+        if username in conflicts:
+            result["conflicts"].append({"username": username, "conflictTournamentId": conflicts[username]})
+        elif existing.get(username):
+            result["alreadyRegistered"].append(username)
+        else:
+            if username in existing:
+                reactivate.append(username)
+            else:
+                new_entries.append(TournamentEntry(player=players[username], tournament=tournament))
+            result["registered"].append(username)
+
+    if reactivate:
+        TournamentEntry.objects.filter(
+            tournament=tournament, player__username__in=reactivate,
+        ).update(is_active=True)
+    TournamentEntry.objects.bulk_create(new_entries)
+    return result
+
+
+def _bustout(tournament: Tournament, usernames: list[str]) -> int:
+    if not usernames:
+        return 0
+    return TournamentEntry.objects.filter(
+        tournament=tournament, player__username__in=usernames, is_active=True,
+    ).update(is_active=False)
+
+
+def _publish(tournament_id: int, deltas: dict, result: dict) -> None:
+    if deltas["registered"] or deltas["busted"]:
+        lobby.tournament_changed(tournament_id)
+    try:
+        snapshot, applied = gs.increment_players(deltas, tournament_id=tournament_id)
+    except KeyError:
+        return  # clock not loaded in this process
+    # Bustouts are clamped to the registered count; report what was stored.
+    result["busted"] = applied["busted"]
+    schedule_save(tournament_id)
+    broadcast_snapshot(tournament_id, snapshot)
@@ -6,57 +6,28 @@ Token passed as query-string: ws://host/ws/clock/<tournament_id>/?token=<jwt>
 Message protocol (JSON):
   Client  Server:  { "type": "get_snapshot" | "admin_start" | ... }
   Server  Client:  { "type": "snapshot" | "tick" | "play_sound" | "system_event" | "error_msg", ... }
+
+admin_batch carries a bulk.py batch: { "type": "admin_batch", "batch": { "register": [...], "rebuys": 3, ... } }
+and is answered with { "type": "batch_result", ... } to the sender plus one snapshot broadcast.
+
+ClockLobbyConsumer (ws://host/ws/clock/lobby/, public) streams the tournament list —
+see lobby.py for its message protocol.
 """
+import asyncio
 import json
 import math
 import time
-import threading
 from urllib.parse import parse_qs
 
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from portal import metrics
+from . import admission
+from . import bulk
+from . import lobby
 from . import state as gs
-
-
-@database_sync_to_async
-def _get_host_id(tournament_id: int) -> str | None:
-    from .models import Tournament
-    try:
-        row = Tournament.objects.values("host_id").get(pk=tournament_id)
-        return str(row["host_id"]) if row["host_id"] is not None else None
-    except Tournament.DoesNotExist:
-        return None
-
-#  Debounced save helpers 
-
-_save_timers: dict[int, threading.Timer] = {}
-_save_lock = threading.Lock()
-
-
-def _schedule_save(tournament_id: int, ms: int = 250) -> None:
-    def _do():
-        from .models import Tournament
-        try:
-            data = gs.get_state_copy(tournament_id)
-            status = Tournament.STATUS_RUNNING if data.get("running") else Tournament.STATUS_PENDING
-            Tournament.objects.filter(pk=tournament_id).update(state_json=data, status=status)
-        except Exception as exc:
-            print(f"[consumer] save error for tournament {tournament_id}: {exc}")
-
-    with _save_lock:
-        existing = _save_timers.get(tournament_id)
-        if existing:
-            existing.cancel()
-        t = threading.Timer(ms / 1000, _do)
-        t.daemon = True
-        _save_timers[tournament_id] = t
-        t.start()
-
-
-def _verify_token(token: str) -> dict | None:
-    from players.jwt import decode_token
-    return decode_token(token)
+from .persistence import schedule_save
 
 
 class ClockConsumer(AsyncWebsocketConsumer):
@@ -64,6 +35,8 @@ class ClockConsumer(AsyncWebsocketConsumer):
     #  Lifecycle 
 
     async def connect(self) -> None:
+        started = time.perf_counter()
+
         # Tournament id from URL or default to 1
         kwargs = self.scope.get("url_route", {}).get("kwargs", {})
         try:
@@ -78,26 +51,38 @@ class ClockConsumer(AsyncWebsocketConsumer):
             await self.close(code=4001)
             return
 
-        payload = _verify_token(token)
+        # Verify before admission, so clients without a valid token can't
+        # drain the bucket and lock out real viewers.
+        payload = await admission.verify_token(token)
         if not payload:
             await self.close(code=4001)
             return
 
+        wait = admission.admit()
+        if wait is None:
+            # Accept first so the client sees 1013 (try again later) and backs off.
+            await self.accept()
+            await self.close(code=1013)
+            return
+        if wait:
+            await asyncio.sleep(wait)
+
         self.player_id: str = payload["player_id"]
 
         # Make sure the tournament state is loaded
         try:
-            gs.get_snapshot(tournament_id=self.tournament_id)
+            snapshot = gs.get_snapshot(tournament_id=self.tournament_id)
         except KeyError:
             await self.close(code=4004)
             return
 
-        host_id = await _get_host_id(self.tournament_id)
+        host_id = await admission.host_id(self.tournament_id)
         self._is_host: bool = host_id == self.player_id
 
         await self.channel_layer.group_add(self._group, self.channel_name)
         await self.accept()
-        await self.send_json({"type": "snapshot", **gs.get_snapshot(tournament_id=self.tournament_id)})
+        await self.send_json({"type": "snapshot", **snapshot})
+        metrics.observe("clock.connect.latency_ms", (time.perf_counter() - started) * 1000)
 
     async def disconnect(self, close_code: int) -> None:
         group = getattr(self, "_group", None)
@@ -130,7 +115,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
 
             changed = gs.with_state(_run, tournament_id=tid)
             if changed:
-                _schedule_save(tid)
+                schedule_save(tid)
                 await self._broadcast_snapshot()
                 await self._broadcast({"type": "play_sound", "soundType": "start"})
 
@@ -150,7 +135,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
 
             changed = gs.with_state(_run, tournament_id=tid)
             if changed:
-                _schedule_save(tid)
+                schedule_save(tid)
                 await self._broadcast_snapshot()
                 await self._broadcast({"type": "play_sound", "soundType": "pause"})
 
@@ -164,7 +149,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
                 s["startedAtMs"] = now_ms if s["running"] else None
 
             gs.with_state(_run, tournament_id=tid)
-            _schedule_save(tid)
+            schedule_save(tid)
             await self._broadcast_snapshot()
             await self._broadcast({"type": "play_sound", "soundType": "reset_level"})
 
@@ -184,7 +169,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
 
             changed = gs.with_state(_run, tournament_id=tid)
             if changed:
-                _schedule_save(tid)
+                schedule_save(tid)
                 await self._broadcast_snapshot()
                 await self._broadcast({"type": "play_sound", "soundType": "level_advance"})
 
@@ -203,7 +188,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
 
             changed = gs.with_state(_run, tournament_id=tid)
             if changed:
-                _schedule_save(tid)
+                schedule_save(tid)
                 await self._broadcast_snapshot()
                 await self._broadcast({"type": "play_sound", "soundType": "level_back"})
 
@@ -228,7 +213,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
 
             changed = gs.with_state(_run, tournament_id=tid)
             if changed:
-                _schedule_save(tid)
+                schedule_save(tid)
                 await self._broadcast_snapshot()
                 await self._broadcast({"type": "play_sound", "soundType": "level_jump"})
 
@@ -262,7 +247,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
                 s["startedAtMs"] = now_ms if s["running"] else None
 
             gs.with_state(_run, tournament_id=tid)
-            _schedule_save(tid)
+            schedule_save(tid)
             await self._broadcast_snapshot()
 
         elif msg_type == "admin_add_time":
@@ -274,7 +259,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
             except (TypeError, ValueError):
                 seconds = 60
             gs.add_time_seconds(seconds, now_ms, tournament_id=tid)
-            _schedule_save(tid)
+            schedule_save(tid)
             await self._broadcast_snapshot()
 
         elif msg_type == "admin_set_players":
@@ -282,7 +267,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
                 return
             patch = {k: data[k] for k in ("registered", "busted", "rebuyCount", "addOnCount") if k in data}
             gs.update_players(patch, tournament_id=tid)
-            _schedule_save(tid)
+            schedule_save(tid)
             await self._broadcast_snapshot()
 
         elif msg_type == "admin_rebuy":
@@ -290,7 +275,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
                 return
             snap = gs.get_snapshot(tournament_id=tid)
             gs.update_players({"rebuyCount": snap["players"]["rebuyCount"] + 1}, tournament_id=tid)
-            _schedule_save(tid)
+            schedule_save(tid)
             await self._broadcast_snapshot()
 
         elif msg_type == "admin_add_on":
@@ -298,7 +283,7 @@ class ClockConsumer(AsyncWebsocketConsumer):
                 return
             snap = gs.get_snapshot(tournament_id=tid)
             gs.update_players({"addOnCount": snap["players"]["addOnCount"] + 1}, tournament_id=tid)
-            _schedule_save(tid)
+            schedule_save(tid)
             await self._broadcast_snapshot()
 
         elif msg_type == "admin_bustout":
@@ -308,9 +293,21 @@ class ClockConsumer(AsyncWebsocketConsumer):
             active = snap["players"]["active"]
             if active > 0:
                 gs.update_players({"busted": snap["players"]["busted"] + 1}, tournament_id=tid)
-                _schedule_save(tid)
+                schedule_save(tid)
                 await self._broadcast_snapshot()
 
+        elif msg_type == "admin_batch":
+            if not await self._require_host():
+                return
+            ops, error = bulk.parse_batch(data.get("batch"))
+            if not error:
+                result, error = await database_sync_to_async(bulk.apply_batch)(tid, ops)
+            if error:
+                await self.send_json({"type": "error_msg", "message": error})
+                return
+            # The snapshot itself is broadcast by apply_batch once committed.
+            await self.send_json({"type": "batch_result", **result})
+
     #  Channel-layer receiver 
 
     async def clock_broadcast(self, event: dict) -> None:
@@ -335,3 +332,29 @@ class ClockConsumer(AsyncWebsocketConsumer):
 
     async def send_json(self, data: dict) -> None:
         await self.send(text_data=json.dumps(data))
+
+
+class ClockLobbyConsumer(AsyncWebsocketConsumer):
+    """Read-only tournament lobby: one snapshot on connect, then pushed diffs."""
+
+    async def connect(self) -> None:
+        await self.channel_layer.group_add(lobby.LOBBY_GROUP, self.channel_name)
+        await self.accept()
+        await self._send_lobby_snapshot()
+
+    async def disconnect(self, close_code: int) -> None:
+        await self.channel_layer.group_discard(lobby.LOBBY_GROUP, self.channel_name)
+
+    async def receive(self, text_data: str = "", **kwargs) -> None:
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+        if data.get("type") == "get_lobby":
+            await self._send_lobby_snapshot()
+
+    async def clock_lobby(self, event: dict) -> None:
+        await self.send(text_data=json.dumps(event["message"]))
+
+    async def _send_lobby_snapshot(self) -> None:
+        await self.send(text_data=await database_sync_to_async(lobby.snapshot_message)())
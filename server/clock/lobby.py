@@ -0,0 +1,183 @@
+"""
+Public tournament lobby — cached list responses and pushed WebSocket diffs.
+
+GET /clock/api/tournaments/ is the most-hit public endpoint, but its content only
+changes when a tournament is created, renamed, finished, registered for or has
+its clock state saved.  Every one of those write paths calls
+tournament_changed(), which
+
+  1. drops the cached list bodies (one serialised JSON body per status filter), and
+  2. pushes only the fields that changed to ClockLobbyConsumer viewers in
+     LOBBY_GROUP, so idle lobby screens cost nothing until something happens.
+
+Lobby messages (Server → Client, ws/clock/lobby/):
+  { "type": "lobby_snapshot",     "version": n, "tournaments": [ ... ] }
+  { "type": "tournament_added",   "version": n, "tournament": { ... } }
+  { "type": "tournament_updated", "version": n, "id": 7, "changes": { "playerCount": 12 } }
+
+version increases by one per pushed message; a client that sees a gap sends
+{ "type": "get_lobby" } to get a fresh lobby_snapshot.
+
+By default entries live in this process.  Set settings.CLOCK_LOBBY_CACHE to a
+Django cache alias to share them between workers; invalidation then bumps a
+generation key so every process sees the change on its next read.
+
+Entries also expire after LOBBY_CACHE_TTL_S as a safety net for writes that
+bypass invalidate() (e.g. manual queryset.update() in a shell).
+"""
+import json
+import threading
+import time
+from typing import Callable
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q
+
+from portal import metrics
+
+LOBBY_CACHE_TTL_S = 30
+LOBBY_GROUP = "clock-lobby"
+
+_GEN_KEY = "clock:lobby:gen"
+
+_lock = threading.Lock()
+_generation = 0
+_entries: dict[str, tuple[int, float, bytes]] = {}   # status key → (generation, expires_at, body)
+
+_publish_lock = threading.Lock()
+_version = 0
+_published: dict[int, dict] = {}   # tournament id → last dict pushed to LOBBY_GROUP
+
+
+def _shared_cache():
+    alias = getattr(settings, "CLOCK_LOBBY_CACHE", None)
+    if not alias:
+        return None
+    from django.core.cache import caches
+    return caches[alias]
+
+
+def get_or_build(status: str, build: Callable[[], bytes]) -> bytes:
+    """Return the cached body for *status*, calling build() on a miss."""
+    shared = _shared_cache()
+    if shared is not None:
+        return _shared_get_or_build(shared, status, build)
+
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(status)
+        generation = _generation
+        if entry and entry[0] == generation and entry[1] > now:
+            metrics.incr("clock.lobby_cache.hits")
+            return entry[2]
+
+    metrics.incr("clock.lobby_cache.misses")
+    body = build()
+    with _lock:
+        # Only store if nothing was invalidated while we were querying the DB.
+        if _generation == generation:
+            _entries[status] = (generation, now + LOBBY_CACHE_TTL_S, body)
+    return body
+
+
+def _shared_get_or_build(shared, status: str, build: Callable[[], bytes]) -> bytes:
+    generation = shared.get(_GEN_KEY, 0)
+    key = f"clock:lobby:{generation}:{status}"
+    body = shared.get(key)
+    if body is not None:
+        metrics.incr("clock.lobby_cache.hits")
+        return body
+
+    metrics.incr("clock.lobby_cache.misses")
+    body = build()
+    shared.set(key, body, LOBBY_CACHE_TTL_S)
+    return body
+
+
+def invalidate() -> None:
+    """Drop every cached lobby body (all status filters)."""
+    global _generation
+    metrics.incr("clock.lobby_cache.invalidations")
+    shared = _shared_cache()
+    if shared is not None:
+        shared.add(_GEN_KEY, 0, None)
+        try:
+            shared.incr(_GEN_KEY)
+        except ValueError:
+            shared.set(_GEN_KEY, 1, None)
+        return
+
+    with _lock:
+        _generation += 1
+        _entries.clear()
+
+
+
+# ── Lobby content ─────────────────────────────────────────────────────────────
+
+def lobby_queryset():
+    from .models import Tournament
+    return Tournament.objects.select_related("host").annotate(
+        active_player_count=Count("entries", filter=Q(entries__is_active=True)),
+    )
+
+
+def list_body(status: str = "") -> bytes:
+    """Serialised lobby list for *status* ("" = all), served from the cache when possible."""
+    def build() -> bytes:
+        qs = lobby_queryset()
+        if status:
+            qs = qs.filter(status=status)
+        return json.dumps([t.to_dict() for t in qs], cls=DjangoJSONEncoder).encode()
+
+    return get_or_build(status, build)
+
+
+def snapshot_message() -> str:
+    """A complete lobby_snapshot frame, wrapped around the cached list body."""
+    with _publish_lock:
+        version = _version
+    return f'{{"type": "lobby_snapshot", "version": {version}, "tournaments": {list_body().decode()}}}'
+
+
+# ── Change notification ───────────────────────────────────────────────────────
+
+def tournament_changed(tournament_id: int, created: bool = False) -> None:
+    """Invalidate cached lobby bodies and push the tournament's changed fields."""
+    from .models import Tournament
+
+    invalidate()
+    try:
+        current = lobby_queryset().get(pk=tournament_id).to_dict()
+    except Tournament.DoesNotExist:
+        return
+
+    global _version
+    with _publish_lock:
+        previous = _published.get(tournament_id)
+        if created:
+            message = {"type": "tournament_added", "tournament": current}
+        else:
+            changes = {k: v for k, v in current.items() if previous is None or previous.get(k) != v}
+            if not changes:
+                return
+            message = {"type": "tournament_updated", "id": tournament_id, "changes": changes}
+        _published[tournament_id] = current
+        _version += 1
+        message["version"] = _version
+        # Sent under the lock so viewers receive versions in order.
+        _push(message)
+
+
+def _push(message: dict) -> None:
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            LOBBY_GROUP,
+            {"type": "clock.lobby", "message": message},
+        )
+        metrics.incr("clock.lobby.pushes")
+    except Exception as exc:
+        print(f"[lobby] push error: {exc}")
@@ -64,14 +64,31 @@ class Tournament(models.Model):
     def is_active(self) -> bool:
         return self.status != self.STATUS_FINISHED
 
+    @classmethod
+    def lock(cls, pk: int) -> "Tournament":
+        """
+        Lock the tournament row for the rest of the transaction and return it fresh.
+
+        Takes the lock with a no-op UPDATE rather than SELECT ... FOR UPDATE:
+        SQLite ignores FOR UPDATE, but a write as a transaction's first statement
+        takes its write lock up front (waiting on the busy timeout), so later
+        writes can't deadlock upgrading a read lock.  Raises DoesNotExist.
+        """
+        cls.objects.filter(pk=pk).update(status=models.F("status"))
+        return cls.objects.get(pk=pk)
+
     def to_dict(self) -> dict:
         t_cfg = (self.state_json or {}).get("tournament") or {}
+        # Lobby queries annotate the count to avoid one COUNT per row.
+        player_count = getattr(self, "active_player_count", None)
+        if player_count is None:
+            player_count = self.entries.filter(is_active=True).count()
         return {
             "id":            self.id,
             "name":          self.name,
             "status":        self.status,
             "created_at":    self.created_at.isoformat(),
-            "playerCount":   self.entries.filter(is_active=True).count(),
+            "playerCount":   player_count,
             "buyIn":         t_cfg.get("buyIn", 0),
             "startingStack": t_cfg.get("startingStack", 0),
             "host":          {"id": str(self.host.id), "display_name": self.host.display_name} if self.host_id else None,
@@ -0,0 +1,48 @@
+"""
+Debounced persistence of in-memory clock state to Tournament.state_json.
+
+Shared by ClockConsumer admin actions and the REST views that touch clock state
+(registration).  Bursts of changes within *ms* collapse into one UPDATE.
+"""
+import threading
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from . import lobby
+from . import state as gs
+
+_save_timers: dict[int, threading.Timer] = {}
+_save_lock = threading.Lock()
+
+
+def schedule_save(tournament_id: int, ms: int = 250) -> None:
+    def _do():
+        from .models import Tournament
+        try:
+            data = gs.get_state_copy(tournament_id)
+            status = Tournament.STATUS_RUNNING if data.get("running") else Tournament.STATUS_PENDING
+            Tournament.objects.filter(pk=tournament_id).update(state_json=data, status=status)
+            lobby.tournament_changed(tournament_id)
+        except Exception as exc:
+            print(f"[consumer] save error for tournament {tournament_id}: {exc}")
+
+    with _save_lock:
+        existing = _save_timers.get(tournament_id)
+        if existing:
+            existing.cancel()
+        t = threading.Timer(ms / 1000, _do)
+        t.daemon = True
+        _save_timers[tournament_id] = t
+        t.start()
+
+
+def broadcast_snapshot(tournament_id: int, snapshot: dict) -> None:
+    """Send *snapshot* to the tournament's clock group from synchronous code."""
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            f"clock-{tournament_id}",
+            {"type": "clock.broadcast", "message": {"type": "snapshot", **snapshot}},
+        )
+    except Exception as exc:
+        print(f"[clock-{tournament_id}] broadcast error: {exc}")
@@ -16,7 +16,8 @@ from django.conf import settings
 from django.http import HttpRequest, JsonResponse
 from django.views import View
 
-from .models import Player, Tournament, TournamentEntry
+from .models import Player, TournamentEntry
+from .registration import register_player
 
 
 #  JWT helper 
@@ -95,7 +96,7 @@ class RegisterView(View):
 
     Request body: {"tournament_id": <int>}  (defaults to 1 if omitted)
 
-    Rules:
+    Rules (see registration.register_player):
     - A player may not be in more than one non-finished tournament at once.
     - Re-joining the same tournament after busting is allowed.
     """
@@ -116,52 +117,16 @@ class RegisterView(View):
         except (TypeError, ValueError):
             return JsonResponse({"error": "Invalid tournament_id"}, status=400)
 
-        try:
-            tournament = Tournament.objects.get(pk=tournament_id)
-        except Tournament.DoesNotExist:
-            return JsonResponse({"error": "Tournament not found"}, status=404)
-
-        if tournament.status == Tournament.STATUS_FINISHED:
-            return JsonResponse({"error": "Tournament is already finished"}, status=409)
-
-        player = _get_or_create_player(payload["username"])
-
-        # Check if already in another non-finished tournament
-        conflict = (
-            player.entries
-            .select_related("tournament")
-            .filter(
-                is_active=True,
-                tournament__status__in=[Tournament.STATUS_PENDING, Tournament.STATUS_RUNNING],
-            )
-            .exclude(tournament_id=tournament_id)
-            .first()
-        )
-        if conflict:
-            return JsonResponse(
-                {
-                    "error": "Already registered in another active tournament",
-                    "conflictTournamentId": conflict.tournament_id,
-                },
-                status=409,
-            )
-
-        entry, created = TournamentEntry.objects.get_or_create(
-            player=player,
-            tournament=tournament,
-            defaults={"is_active": True},
-        )
-
-        # Re-activate if busted
-        if not created and not entry.is_active:
-            entry.is_active = True
-            entry.save(update_fields=["is_active"])
-            created = True
+        result = register_player(payload["username"], tournament_id)
+        if result.error:
+            body = {"error": result.error}
+            if result.conflict_tournament_id is not None:
+                body["conflictTournamentId"] = result.conflict_tournament_id
+            return JsonResponse(body, status=result.status)
 
-        status = 201 if created else 200
         return JsonResponse(
-            {"registered": True, "player": player.to_dict(tournament=tournament)},
-            status=status,
+            {"registered": True, "player": result.player.to_dict(tournament=result.tournament)},
+            status=result.status,
         )
 
 
@@ -0,0 +1,107 @@
+"""
+Player self-registration as a single transaction.
+
+Rules (enforced here, used by RegisterView):
+- A player may not be in more than one non-finished tournament at once.
+- Re-joining the same tournament after busting is allowed.
+
+The tournament row (Tournament.lock) and the player row (SELECT ... FOR UPDATE)
+are locked for the duration of the transaction: the finished check runs under
+the tournament lock, so a registration can't slip in while the tournament is
+being finished, and concurrent requests for the same player — double taps, or
+two tabs registering for different tournaments — serialise on the player row.
+The unique constraints on
+Player.username and (player, tournament) make the get_or_create calls safe when
+two transactions race to insert the same row.
+
+On commit a newly active entry bumps state['players']['registered'] for the
+in-memory clock, which is persisted and broadcast like an admin change.
+"""
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from . import lobby
+from . import state as gs
+from .models import Player, Tournament, TournamentEntry
+from .persistence import broadcast_snapshot, schedule_save
+
+
+@dataclass
+class RegistrationResult:
+    player: Player | None = None
+    tournament: Tournament | None = None
+    created: bool = False                  # a new or re-activated entry
+    error: str | None = None
+    status: int = 200
+    conflict_tournament_id: int | None = None
+
+
+def register_player(username: str, tournament_id: int) -> RegistrationResult:
+    with transaction.atomic():
+        try:
+            tournament = Tournament.lock(tournament_id)
+        except Tournament.DoesNotExist:
+            return RegistrationResult(error="Tournament not found", status=404)
+
+        if tournament.status == Tournament.STATUS_FINISHED:
+            return RegistrationResult(error="Tournament is already finished", status=409)
+
+        player, _ = Player.objects.select_for_update().get_or_create(
+            username=username,
+            defaults={"nickname": ""},
+        )
+
+        conflict_id = (
+            TournamentEntry.objects
+            .filter(
+                player=player,
+                is_active=True,
+                tournament__status__in=[Tournament.STATUS_PENDING, Tournament.STATUS_RUNNING],
+            )
+            .exclude(tournament_id=tournament.id)
+            .values_list("tournament_id", flat=True)
+            .first()
+        )
+        if conflict_id is not None:
+            return RegistrationResult(
+                player=player,
+                tournament=tournament,
+                error="Already registered in another active tournament",
+                status=409,
+                conflict_tournament_id=conflict_id,
+            )
+
+        # Re-activate a busted entry, or insert a new one; an already active
+        # entry matches neither and is left alone.
+        created = bool(
+            TournamentEntry.objects
+            .filter(player=player, tournament=tournament, is_active=False)
+            .update(is_active=True)
+        )
+        if not created:
+            _, created = TournamentEntry.objects.get_or_create(
+                player=player,
+                tournament=tournament,
+                defaults={"is_active": True},
+            )
+
+        if created:
+            transaction.on_commit(lambda: _on_registered(tournament.id))
+
+    return RegistrationResult(
+        player=player,
+        tournament=tournament,
+        created=created,
+        status=201 if created else 200,
+    )
+
+
+def _on_registered(tournament_id: int) -> None:
+    lobby.tournament_changed(tournament_id)
+    try:
+        snapshot, _ = gs.increment_players({"registered": 1}, tournament_id=tournament_id)
+    except KeyError:
+        return  # clock not loaded in this process
+    schedule_save(tournament_id)
+    broadcast_snapshot(tournament_id, snapshot)
@@ -1,7 +1,9 @@
 from django.urls import re_path
-from .consumers import ClockConsumer
+from .consumers import ClockConsumer, ClockLobbyConsumer
 
 websocket_urlpatterns = [
+    # Public tournament lobby
+    re_path(r"^(?:.+/)?ws/clock/lobby/$", ClockLobbyConsumer.as_asgi()),
     # Per-tournament WebSocket (preferred)
     re_path(r"^(?:.+/)?ws/clock/(?P<tournament_id>[0-9]+)/$", ClockConsumer.as_asgi()),
     # Legacy fallback → tournament 1
@@ -293,6 +293,33 @@ def update_players(patch: dict, tournament_id: int = 1) -> None:
                     pass
 
 
+def increment_players(deltas: dict, tournament_id: int = 1,
+                      now_ms: float | None = None) -> tuple[dict, dict]:
+    """Add *deltas* to state['players'] counters in one locked step (clamped to >= 0).
+
+    Returns (snapshot, applied): the public snapshot taken under the same lock,
+    so callers can broadcast exactly the state they produced, and the change
+    each counter actually got after clamping.
+    """
+    lock = _get_lock(tournament_id)
+    with lock:
+        s = _states.get(tournament_id)
+        if s is None:
+            raise KeyError(f"Tournament {tournament_id} not in memory")
+        p = s.setdefault("players", _default_players())
+        before = {k: int(p.get(k) or 0) for k in deltas}
+        for k, v in deltas.items():
+            if k in ("registered", "busted", "rebuyCount", "addOnCount"):
+                try:
+                    p[k] = max(0, int(p.get(k) or 0) + int(v))
+                except (TypeError, ValueError):
+                    pass
+        # Can't bust more players than are registered.
+        p["busted"] = min(p.get("busted") or 0, p.get("registered") or 0)
+        applied = {k: int(p.get(k) or 0) - before[k] for k in deltas}
+        return public_snapshot(s, now_ms), applied
+
+
 def add_time_seconds(seconds: int, now_ms: float, tournament_id: int = 1) -> None:
     """Reduce elapsedInCurrentSeconds so remaining increases by *seconds*."""
     lock = _get_lock(tournament_id)
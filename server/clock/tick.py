@@ -11,6 +11,7 @@ import time
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
+from . import lobby
 from . import state as gs
 
 _tickers: dict[int, threading.Thread] = {}
@@ -43,6 +44,7 @@ def _save_state(tournament_id: int, finished: bool = False) -> None:
             elif data.get("running"):
                 updates["status"] = Tournament.STATUS_RUNNING
             Tournament.objects.filter(pk=tournament_id).update(**updates)
+            lobby.tournament_changed(tournament_id)
         except Exception as exc:
             print(f"[tick-{tournament_id}] save error: {exc}")
 
@@ -7,14 +7,17 @@ Endpoints:
   GET   /clock/api/tournaments/<id>/       get tournament details + state
   PATCH /clock/api/tournaments/<id>/       host: update name
   POST  /clock/api/tournaments/<id>/finish/  host: mark tournament as finished
+  POST  /clock/api/tournaments/<id>/batch/   host: bulk register / bustout / rebuy / add-on (see bulk.py)
 """
 import json
 
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.views import View
 
 from players.auth import authenticate_request
 from .models import Tournament
+from . import bulk
+from . import lobby
 from . import state as gs
 from .tick import start_tick_thread
 
@@ -31,12 +34,11 @@ def _require_host(request: HttpRequest, tournament: Tournament):
 
 class TournamentListView(View):
 
-    def get(self, request: HttpRequest) -> JsonResponse:
-        qs = Tournament.objects.all()
+    def get(self, request: HttpRequest) -> HttpResponse:
         status_filter = request.GET.get("status")
-        if status_filter in (Tournament.STATUS_PENDING, Tournament.STATUS_RUNNING, Tournament.STATUS_FINISHED):
-            qs = qs.filter(status=status_filter)
-        return JsonResponse([t.to_dict() for t in qs], safe=False)
+        if status_filter not in (Tournament.STATUS_PENDING, Tournament.STATUS_RUNNING, Tournament.STATUS_FINISHED):
+            status_filter = ""
+        return HttpResponse(lobby.list_body(status_filter), content_type="application/json")
 
     def post(self, request: HttpRequest) -> JsonResponse:
         player = authenticate_request(request)
@@ -65,6 +67,7 @@ class TournamentListView(View):
 
         gs.init_state(state_json or None, tournament_id=tournament.id)
         start_tick_thread(tournament_id=tournament.id)
+        lobby.tournament_changed(tournament.id, created=True)
 
         return JsonResponse(tournament.to_dict(), status=201)
 
@@ -113,6 +116,7 @@ class TournamentDetailView(View):
             tournament.name = name.strip()
 
         tournament.save()
+        lobby.tournament_changed(tournament.id)
         return JsonResponse(tournament.to_dict())
 
 
@@ -143,5 +147,33 @@ class TournamentFinishView(View):
         tournament.status = Tournament.STATUS_FINISHED
         tournament.state_json = state_json
         tournament.save()
+        lobby.tournament_changed(tournament.id)
 
         return JsonResponse(tournament.to_dict())
+
+
+class TournamentBatchView(View):
+
+    def post(self, request: HttpRequest, pk: int) -> JsonResponse:
+        try:
+            tournament = Tournament.objects.select_related("host").get(pk=pk)
+        except Tournament.DoesNotExist:
+            return JsonResponse({"error": "Tournament not found"}, status=404)
+
+        _, err = _require_host(request, tournament)
+        if err:
+            return err
+
+        try:
+            body = json.loads(request.body or "{}")
+        except (json.JSONDecodeError, TypeError):
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+        ops, error = bulk.parse_batch(body)
+        if error:
+            return JsonResponse({"error": error}, status=400)
+
+        result, error = bulk.apply_batch(tournament.id, ops)
+        if error:
+            return JsonResponse({"error": error}, status=409)
+        return JsonResponse(result)
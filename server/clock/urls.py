@@ -1,6 +1,8 @@
 from django.urls import include, path
 from .player_views import MeView, PlayerListView, RegisterView
-from .tournament_views import TournamentDetailView, TournamentFinishView, TournamentListView
+from .tournament_views import (
+    TournamentBatchView, TournamentDetailView, TournamentFinishView, TournamentListView,
+)
 
 urlpatterns = [
     path("", include("players.urls")),           # guest auth: /auth/guest/, /auth/refresh/
@@ -12,4 +14,5 @@ urlpatterns = [
     path("clock/api/tournaments/", TournamentListView.as_view(), name="tournament-list"),
     path("clock/api/tournaments/<int:pk>/", TournamentDetailView.as_view(), name="tournament-detail"),
     path("clock/api/tournaments/<int:pk>/finish/", TournamentFinishView.as_view(), name="tournament-finish"),
+    path("clock/api/tournaments/<int:pk>/batch/", TournamentBatchView.as_view(), name="tournament-batch"),
 ]
@@ -0,0 +1,144 @@
+"""
+Per-room actors for Oslo Conquest.
+
+Every state change of a room — create, join, game actions, bot moves — is an
+"op": a plain function that reads and writes _rooms[room] without awaiting and
+returns an error message or None.  Ops are submitted to the room's actor, which
+runs them one at a time from an asyncio.Queue:
+
+  await submit(room, op, on_batch)   → the op's error (or None) once it has run
+
+The actor drains whatever is queued, applies the ops back to back and then
+awaits on_batch(room, log_since, full) once for the whole batch, so a burst of
+actions in one room gives one broadcast.  Rooms never share a lock or a queue;
+an actor task exits after ACTOR_IDLE_S without work.
+
+Actors serialise within one process.  Rooms live in process memory, so in a
+multi-worker deployment a room's sockets must reach the same worker (sticky
+routing on the room id); the actor is what makes that worker safe.
+
+Latency (enqueue → broadcast sent) goes to the "oslo.action.latency_ms"
+histogram and per room to the "oslo.actors.latency_ms" gauge.  Each actor
+recomputes its p50/p99/max on the loop after a batch, so the gauge (read from
+the /metrics/ view thread) never iterates a window the loop is appending to.
+"""
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from portal import metrics
+
+ACTOR_IDLE_S = 60
+LATENCY_WINDOW = 256
+LATENCY_GAUGE_ROOMS = 20    # slowest rooms listed in the gauge
+
+Op = Callable[[], str | None]
+OnBatch = Callable[[str, int | None, bool], Awaitable[None]]
+
+
+class RoomActor:
+    __slots__ = ("room", "_on_batch", "_queue", "_loop", "_task", "actions", "latencies", "summary")
+
+    def __init__(self, room: str, on_batch: OnBatch, log_seq: Callable[[str], int | None]) -> None:
+        self.room = room
+        self._on_batch = on_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run(log_seq))
+        self.actions = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.summary: dict | None = None
+
+    def alive(self) -> bool:
+        return not self._task.done() and self._loop is asyncio.get_running_loop()
+
+    def put(self, op: Op, full: bool) -> asyncio.Future:
+        future = self._loop.create_future()
+        self._queue.put_nowait((op, full, future, time.perf_counter()))
+        return future
+
+    async def _run(self, log_seq: Callable[[str], int | None]) -> None:
+        while True:
+            try:
+                batch = [await asyncio.wait_for(self._queue.get(), ACTOR_IDLE_S)]
+            except asyncio.TimeoutError:
+                if self._queue.empty():
+                    if _actors.get(self.room) is self:
+                        del _actors[self.room]
+                    return
+                continue
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            log_since = log_seq(self.room)
+            applied = full = False
+            for op, op_full, future, _ in batch:
+                if future.cancelled():
+                    continue    # the submitter is gone (e.g. a cancelled bot turn)
+                try:
+                    error = op()
+                except Exception as exc:
+                    future.set_exception(exc)
+                    continue
+                future.set_result(error)
+                if error is None:
+                    applied = True
+                    full = full or op_full
+
+            if applied:
+                try:
+                    await self._on_batch(self.room, None if full else log_since, full)
+                except Exception as exc:
+                    print(f"[oslo-conquest] broadcast error in {self.room}: {exc}")
+
+            done = time.perf_counter()
+            for *_, enqueued in batch:
+                ms = (done - enqueued) * 1000
+                self.latencies.append(ms)
+                metrics.observe("oslo.action.latency_ms", ms)
+            self.actions += len(batch)
+            self.summary = self._summarize()
+            metrics.observe("oslo.action.batch_size", len(batch))
+
+    def _summarize(self) -> dict:
+        values = sorted(self.latencies)
+        return {
+            "actions": self.actions,
+            "p50": round(values[len(values) // 2], 3),
+            "p99": round(values[min(len(values) - 1, int(0.99 * len(values)))], 3),
+            "max": round(values[-1], 3),
+        }
+
+
+_actors: dict[str, RoomActor] = {}
+
+
+async def submit(
+    room: str,
+    op: Op,
+    on_batch: OnBatch,
+    log_seq: Callable[[str], int | None],
+    *,
+    full: bool = False,
+) -> str | None:
+    """Run *op* on *room*'s actor and return its result once applied.
+
+    *log_seq(room)* gives the log position before a batch (for log_since);
+    *full* asks for a full-state broadcast (membership changed).
+    """
+    actor = _actors.get(room)
+    if actor is None or not actor.alive():
+        actor = _actors[room] = RoomActor(room, on_batch, log_seq)
+    return await actor.put(op, full)
+
+
+def latency_summary() -> dict[str, dict]:
+    """p50/p99/max action latency for the slowest rooms with a live actor."""
+    rooms = {room: actor.summary for room, actor in list(_actors.items()) if actor.summary}
+    slowest = sorted(rooms.items(), key=lambda item: item[1]["p99"], reverse=True)
+    return dict(slowest[:LATENCY_GAUGE_ROOMS])
+
+
+metrics.gauge("oslo.actors.active", lambda: len(_actors))
+metrics.gauge("oslo.actors.latency_ms", latency_summary)
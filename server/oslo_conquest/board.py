@@ -1,63 +1,46 @@
-"""Shared Oslo Conquest board constants for server-side game rules."""
-
-TERRITORY_IDS = (
-    "t0a", "t0b", "t1", "t2", "t3", "t4", "t5", "t6", "t7", "t8",
-    "t9", "t10", "t11", "t12", "t13", "t14", "t15", "t16", "t17",
-    "t18", "t19", "t20", "t21", "t22", "t23", "t24", "t25", "t26",
-    "t27", "t28", "t29", "t30", "t31", "t32", "t33", "t34", "t35",
-    "lørenskog_cp", "lysaker_cp", "kolbotn_cp",
-)
-
-CHECKPOINT_IDS = (
-    "lørenskog_cp",
-    "lysaker_cp",
-    "kolbotn_cp",
-)
-
-START_TERRITORIES = {
-    "red": "t0a",
-    "blue": "t35",
-}
-
-ADJACENCY = {
-    "t0a": ["t0b", "t1", "t4", "t9", "t11", "t12"],
-    "t0b": ["t0a", "t12"],
-    "t1": ["t0a", "t2", "t3", "t4", "t6"],
-    "t2": ["t1", "t3", "t30", "t33"],
-    "t3": ["t1", "t2", "t6", "t22", "t29", "t30"],
-    "t4": ["t0a", "t1", "t5", "t6", "t9"],
-    "t5": ["t4", "t6", "t7", "t9", "t10"],
-    "t6": ["t1", "t3", "t4", "t5", "t7", "t8", "t19", "t22", "t29"],
-    "t7": ["t5", "t6", "t8", "t9", "t10", "t19", "t20"],
-    "t8": ["t6", "t7", "t10", "t19", "t20"],
-    "t9": ["t0a", "t4", "t5", "t7", "t10", "t11"],
-    "t10": ["t5", "t7", "t8", "t9", "t11", "t20"],
-    "t11": ["t0a", "t9", "t10", "t12", "t14", "t16", "t20"],
-    "t12": ["t0a", "t0b", "t11", "t13", "t14"],
-    "t13": ["t12", "t14"],
-    "t14": ["t11", "t12", "t13", "t15", "t16", "t17"],
-    "t15": ["t14", "t17", "lysaker_cp"],
-    "t16": ["t11", "t14", "t17", "t20"],
-    "t17": ["t14", "t15", "t16", "t18", "lysaker_cp"],
-    "t18": ["t17"],
-    "t19": ["t6", "t7", "t8", "t20", "t21", "t22", "t23"],
-    "t20": ["t7", "t8", "t10", "t11", "t16", "t19", "t21"],
-    "t21": ["t19", "t20"],
-    "t22": ["t3", "t6", "t19", "t23", "t29"],
-    "t23": ["t19", "t22", "t25", "t28", "t29"],
-    "t24": ["t25", "t26"],
-    "t25": ["t23", "t24", "t26", "t28"],
-    "t26": ["t24", "t25", "t27", "t28", "lørenskog_cp"],
-    "t27": ["t26", "t28", "lørenskog_cp"],
-    "t28": ["t23", "t25", "t26", "t27", "t29", "lørenskog_cp"],
-    "t29": ["t3", "t6", "t22", "t23", "t28", "t30", "t31"],
-    "t30": ["t2", "t3", "t29", "t31", "t32", "t33", "t35"],
-    "t31": ["t29", "t30"],
-    "t32": ["t30", "t33", "t34", "t35"],
-    "t33": ["t2", "t30", "t32"],
-    "t34": ["t32", "t35", "kolbotn_cp"],
-    "t35": ["t30", "t32", "t34", "kolbotn_cp"],
-    "lørenskog_cp": ["t26", "t27", "t28"],
-    "lysaker_cp": ["t17", "t15"],
-    "kolbotn_cp": ["t35", "t34"],
-}
+"""Shared Oslo Conquest board constants for server-side game rules.
+
+The board graph is no longer written out here: it is the default map
+(maps.DEFAULT_MAP), loaded from the same map.json the client draws, validated
+and compiled by maps.py.  The names below are that map's tables, for code that
+only ever plays on the default board; rules that follow a room's own map go
+through mvp.game_map(room_state) instead.
+"""
+from . import maps
+
+_DEFAULT = maps.get(maps.DEFAULT_MAP)
+
+TERRITORY_IDS = _DEFAULT.territory_ids
+CHECKPOINT_IDS = _DEFAULT.checkpoint_ids
+START_TERRITORIES = _DEFAULT.start_territories
+ADJACENCY = _DEFAULT.adjacency
+
+
+# ── Precomputed lookup tables ─────────────────────────────────────────────────
+#
+# Compiled once per map (see maps.GameMap): territory ids map to small ints
+# (board order), NEIGHBORS and the *_SET/*_BITS constants answer rule checks in
+# O(1), DISTANCES holds the shortest hop count between every pair, and
+# reachable() answers "where can I go from here with this roll" with a dict
+# lookup instead of a BFS.
+
+MAX_DICE = maps.MAX_DICE
+
+TERRITORY_INDEX = _DEFAULT.territory_index
+
+# Membership tests for rule validation: sets by id, and int bitsets by index
+# (bit i = TERRITORY_IDS[i]) for scanning many territories at once.
+TERRITORY_SET = _DEFAULT.territory_set
+CHECKPOINT_SET = _DEFAULT.checkpoint_set
+NEIGHBORS = _DEFAULT.neighbors
+NEIGHBOR_BITS = _DEFAULT.neighbor_bits
+CHECKPOINT_BITS = _DEFAULT.checkpoint_bits
+
+# DISTANCES[i][j] — hops from territory i to territory j (255 if unreachable).
+DISTANCES = _DEFAULT.distances
+
+DIAMETER = _DEFAULT.diameter
+
+are_neighbors = _DEFAULT.are_neighbors
+distance = _DEFAULT.distance
+reachable = _DEFAULT.reachable
@@ -0,0 +1,105 @@
+"""Compact per-room board for Oslo Conquest.
+
+Rooms keep territory ownership as parallel arrays indexed by the map's
+territory_index (board order, see maps.py) instead of 40 small dicts:
+
+  owners  bytearray  side code per territory (0 = unowned, 1.. = sides[code - 1])
+  units   array('H') unit count per territory
+  owned   list[int]  running number of territories per side code
+  codes   dict       side → code, so every per-side lookup is O(1) in the number of sides
+  masks   list[int]  bitset of territories per side code (bit i = map.territory_ids[i])
+  map     GameMap    the board graph the arrays are indexed by
+
+to_territories() rebuilds the {"t1": {"id", "owner", "units"}, ...} JSON shape
+clients expect; call it only when serialising for the wire.
+"""
+from array import array
+
+from . import maps
+from .maps import GameMap
+
+
+class BoardState:
+    __slots__ = ("sides", "codes", "owners", "units", "owned", "masks", "map")
+
+    def __init__(self, sides: tuple[str, ...], game_map: GameMap | None = None) -> None:
+        self.map = game_map or maps.get()
+        size = len(self.map.territory_ids)
+        self.sides = tuple(sides)
+        self.codes = {side: code for code, side in enumerate(self.sides, start=1)}
+        self.owners = bytearray(size)
+        self.units = array("H", bytes(2 * size))
+        self.owned = [size] + [0] * len(self.sides)
+        self.masks = [(1 << size) - 1] + [0] * len(self.sides)
+
+    # ── Ownership ─────────────────────────────────────────────────────────────
+
+    def code(self, side: str | None) -> int:
+        return self.codes.get(side, 0)
+
+    def owner(self, index: int) -> str | None:
+        code = self.owners[index]
+        return self.sides[code - 1] if code else None
+
+    def set_owner(self, index: int, side: str | None) -> None:
+        new = self.code(side)
+        old = self.owners[index]
+        if new != old:
+            self.owned[old] -= 1
+            self.owned[new] += 1
+            self.masks[old] &= ~(1 << index)
+            self.masks[new] |= 1 << index
+            self.owners[index] = new
+
+    def count(self, side: str) -> int:
+        """Territories owned by *side* — O(1)."""
+        code = self.codes.get(side)
+        return self.owned[code] if code else 0
+
+    def mask(self, side: str | None) -> int:
+        """Bitset of the territories *side* owns (None = unowned) — O(1)."""
+        return self.masks[self.code(side)]
+
+    def copy(self) -> "BoardState":
+        board = BoardState.__new__(BoardState)
+        board.sides = self.sides
+        board.codes = self.codes
+        board.owners = bytearray(self.owners)
+        board.units = array("H", self.units)
+        board.owned = list(self.owned)
+        board.masks = list(self.masks)
+        board.map = self.map
+        return board
+
+    # ── Serialisation ─────────────────────────────────────────────────────────
+
+    def territory(self, index: int) -> dict:
+        return {"id": self.map.territory_ids[index], "owner": self.owner(index), "units": self.units[index]}
+
+    def to_territories(self) -> dict[str, dict]:
+        return {tid: self.territory(i) for i, tid in enumerate(self.map.territory_ids)}
+
+    @classmethod
+    def from_territories(cls, territories: dict[str, dict], sides: tuple[str, ...],
+                         game_map: GameMap | None = None) -> "BoardState":
+        board = cls(sides, game_map)
+        for tid, territory in territories.items():
+            i = board.map.territory_index.get(tid)
+            if i is None:
+                continue
+            board.set_owner(i, territory.get("owner"))
+            board.units[i] = max(0, int(territory.get("units") or 0))
+        return board
+
+    def to_compact(self) -> dict:
+        """JSON-ready compact form for persistence (see persistence.py)."""
+        return {"map": self.map.map_id, "sides": list(self.sides), "owners": self.owners.hex(),
+                "units": list(self.units)}
+
+    @classmethod
+    def from_compact(cls, data: dict) -> "BoardState":
+        board = cls(tuple(data["sides"]), maps.get(data.get("map")))
+        for i, code in enumerate(bytes.fromhex(data["owners"])):
+            board.set_owner(i, board.sides[code - 1] if code else None)
+        board.units = array("H", data["units"])
+        return board
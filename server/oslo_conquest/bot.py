@@ -1,11 +1,11 @@
 """Bot player for Oslo Conquest.
 
-Returns action dicts without mutating game state.
-The consumer applies the returned action through the normal mvp.py functions.
+Returns action dicts without mutating game state (choices come from
+rng.peek_choice, which does not advance the room's RNG).
+Games against the bot are played by bot_search.py; this simple bot stays as
+the baseline bench/oslo_bot.py measures the search against.
 """
-import random
-
-from .board import CHECKPOINT_IDS
+from . import maps, rng
 
 BOT_PLAYER_ID = "bot-blue"
 BOT_PLAYER_NAME = "Bot"
@@ -23,7 +23,7 @@ def get_bot_action(room_state: dict, bot_player_id: str) -> dict | None:
 
     if phase == "setup":
         if player.get("position") is None:
-            return {"type": "choose_start_checkpoint", "checkpointId": random.choice(CHECKPOINT_IDS)}
+            return {"type": "choose_start_checkpoint", "checkpointId": rng.peek_choice(room_state, _checkpoint_ids(room_state))}
         return {"type": "end_turn"}
 
     if phase == "playing":
@@ -32,6 +32,11 @@ def get_bot_action(room_state: dict, bot_player_id: str) -> dict | None:
     return None
 
 
+def _checkpoint_ids(room_state: dict) -> tuple[str, ...]:
+    board = room_state.get("board")
+    return (board.map if board is not None else maps.get(room_state.get("map"))).checkpoint_ids
+
+
 def _find_player(room_state: dict, player_id: str) -> dict | None:
     return next(
         (p for p in room_state.get("players", []) if p.get("id") == player_id),
@@ -0,0 +1,263 @@
+"""
+Search-based bot engine for Oslo Conquest.
+
+choose_action(room_state, player_id) returns the bot's next action in the
+apply_action shape, one step at a time (roll, move, attacks, end_turn):
+
+  setup   the checkpoint closest to its own next checkpoint
+  move    expectimax over next turn's dice: landing on nextCheckpoint is worth
+          1, otherwise the chance a 1..6 roll reaches it from there (board
+          DISTANCES), discounted
+  attack  Monte Carlo: every legal attack plus "stop here" is scored by
+          rollouts on a cloned room (own RNG seed, sure-win attacks for both
+          sides, ROLLOUT_TURNS turns ahead) until the budget runs out; the
+          best territory lead, summed after every turn (so sooner is
+          better), wins
+
+The search never reads the room's real RNG stream, so it cannot see future rolls.
+
+choose_action is pure CPU.  think() runs it in a process pool of BOT_WORKERS
+(0 = one worker thread) on a pickled copy of the room, so a bot that is
+thinking does not hold up the event loop.  The pool is the bound: with more
+bots thinking than workers, decisions queue.  Workers are started by a
+forkserver, and a pool broken by a dead worker is replaced on the next think().
+"""
+import asyncio
+import multiprocessing
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import rng
+from . import maps
+from .maps import MAX_DICE, GameMap
+from .game_log import GameLog
+from .mvp import (
+    attack,
+    end_turn,
+    find_player_by_id,
+    find_player_by_side,
+    game_map,
+    get_board,
+    legal_attacks,
+    move,
+    roll_dice,
+)
+
+BOT_BUDGET_S = 0.05        # wall time per attack decision
+BOT_WORKERS = 2
+ROLLOUT_TURNS = 4          # turns played past the current one
+MAX_ROLLOUTS = 64          # per option; stop early when the budget is generous
+MOVE_DISCOUNT = 0.8        # value of a checkpoint one turn from now
+
+
+# ── Rollout policy ────────────────────────────────────────────────────────────
+
+def sure_attacks(room_state: dict, side: str) -> list[tuple[str, str]]:
+    """Legal attacks that are certain to conquer (more units than the defender)."""
+    board = get_board(room_state)
+    index = board.map.territory_index
+    return [
+        (a, b) for a, b in legal_attacks(room_state, side)
+        if board.units[index[a]] > board.units[index[b]]
+    ]
+
+
+# ── Moves (expectimax over dice) ──────────────────────────────────────────────
+#
+# These take the room's map (mvp.game_map); without one they use the default.
+
+def _reach_chance(gmap: GameMap, from_id: str, to_id: str) -> float:
+    """Chance that one roll of a die reaches *to_id* from *from_id*."""
+    d = gmap.distance(from_id, to_id)
+    if not d:
+        return 0.0
+    return max(0, MAX_DICE + 1 - d) / MAX_DICE
+
+
+def _after(gmap: GameMap, checkpoint: str) -> str:
+    sequence = gmap.checkpoint_sequence
+    return sequence[(sequence.index(checkpoint) + 1) % len(sequence)]
+
+
+def move_value(position: str, target: str | None, gmap: GameMap | None = None) -> float:
+    if target is None:
+        return 0.0
+    gmap = gmap or maps.get()
+    if position == target:
+        return 1.0 + MOVE_DISCOUNT * _reach_chance(gmap, position, _after(gmap, target))
+    d = gmap.distance(position, target)
+    # Distance breaks ties between squares that are all out of reach next turn.
+    return MOVE_DISCOUNT * _reach_chance(gmap, position, target) - (d if d is not None else 255) / 1000
+
+
+def best_move(player: dict, gmap: GameMap | None = None) -> str | None:
+    moves = player.get("validMoves") or []
+    if not moves:
+        return None
+    target = player.get("nextCheckpoint")
+    return max(moves, key=lambda tid: move_value(tid, target, gmap))
+
+
+def best_checkpoint(gmap: GameMap | None = None) -> str:
+    gmap = gmap or maps.get()
+    return max(sorted(gmap.checkpoint_ids), key=lambda cp: _reach_chance(gmap, cp, _after(gmap, cp)))
+
+
+# ── Attacks (Monte Carlo) ─────────────────────────────────────────────────────
+
+def search_state(room_state: dict) -> dict:
+    """A copy of *room_state* the search may mutate (and pickle): no log, own board."""
+    state = {k: v for k, v in room_state.items() if k not in ("players", "board", "log", "playerIndex")}
+    state["players"] = [{**p, "validMoves": list(p.get("validMoves") or [])} for p in room_state["players"]]
+    board = get_board(room_state)
+    if board is not None:
+        state["board"] = board.copy()
+    state["log"] = GameLog(capacity=1)
+    return state
+
+
+def _score(room_state: dict, side: str) -> float:
+    winner = room_state.get("winner")
+    if winner:
+        return 1000.0 if winner == side else -1000.0
+    board = get_board(room_state)
+    return board.count(side) - sum(board.count(s) for s in board.sides if s != side)
+
+
+def _play_attacks(room_state: dict, player_id: str, side: str, rnd: random.Random) -> None:
+    while not room_state.get("winner"):
+        options = sure_attacks(room_state, side)
+        if not options:
+            return
+        attack(room_state, player_id, *rnd.choice(options))
+
+
+def _rollout(room_state: dict, player_id: str, side: str, option, rnd: random.Random) -> float:
+    """Territory lead of *side* summed over the rest of this turn and ROLLOUT_TURNS more."""
+    state = search_state(room_state)
+    rng.seed_room(state, rnd.getrandbits(64))
+    if option is not None:
+        attack(state, player_id, *option)
+        _play_attacks(state, player_id, side, rnd)
+    end_turn(state, player_id)
+    total = _score(state, side)
+
+    for _ in range(ROLLOUT_TURNS):
+        if state.get("winner"):
+            break
+        active = state["activePlayer"]
+        active_player = find_player_by_side(state, active)
+        active_id = active_player["id"]
+        roll_dice(state, active_id)
+        target = best_move(active_player, game_map(state))
+        if target is not None:
+            move(state, active_id, target)
+        _play_attacks(state, active_id, active, rnd)
+        end_turn(state, active_id)
+        total += _score(state, side)
+    return total
+
+
+def best_attack(
+    room_state: dict,
+    player_id: str,
+    budget_s: float = BOT_BUDGET_S,
+    seed: int = 0,
+) -> tuple[tuple[str, str] | None, int]:
+    """The attack to make next (None = stop attacking) and the number of rollouts run.
+
+    Every option gets at least one rollout, even past the budget.
+    """
+    side = find_player_by_id(room_state, player_id)["side"]
+    options: list = [None, *legal_attacks(room_state, side)]
+    if len(options) == 1:
+        return None, 0
+
+    rnd = random.Random(seed)
+    deadline = time.perf_counter() + budget_s
+    totals = [0.0] * len(options)
+    rounds = 0
+    while True:
+        for i, option in enumerate(options):
+            totals[i] += _rollout(room_state, player_id, side, option, rnd)
+        rounds += 1
+        if rounds >= MAX_ROLLOUTS or time.perf_counter() >= deadline:
+            break
+    # Ties go to the earlier option, i.e. to stopping.
+    best = max(range(len(options)), key=lambda i: totals[i])
+    return options[best], rounds * len(options)
+
+
+# ── Decisions ─────────────────────────────────────────────────────────────────
+
+def choose_action(
+    room_state: dict,
+    player_id: str,
+    budget_s: float = BOT_BUDGET_S,
+    seed: int | None = None,
+) -> dict | None:
+    """The bot's next action as an apply_action dict, or None if it is not its turn."""
+    player = find_player_by_id(room_state, player_id)
+    if not player or room_state.get("winner") or player.get("side") != room_state.get("activePlayer"):
+        return None
+
+    phase = room_state.get("phase")
+    if phase == "setup":
+        if player.get("position") is None:
+            return {"type": "choose_start_checkpoint", "playerId": player_id,
+                    "checkpointTerritoryId": best_checkpoint(game_map(room_state))}
+        return {"type": "end_turn", "playerId": player_id}
+
+    if phase != "playing":
+        return None
+    if player.get("diceRoll") is None:
+        return {"type": "roll_dice", "playerId": player_id}
+    target = best_move(player, game_map(room_state))
+    if target is not None:
+        return {"type": "move", "playerId": player_id, "toTerritoryId": target}
+
+    seed = room_state.get("rng", 0) if seed is None else seed
+    option, _ = best_attack(room_state, player_id, budget_s, seed)
+    if option is not None:
+        return {"type": "attack", "playerId": player_id,
+                "fromTerritoryId": option[0], "toTerritoryId": option[1]}
+    return {"type": "end_turn", "playerId": player_id}
+
+
+# ── Worker pool ───────────────────────────────────────────────────────────────
+
+_pool: Executor | None = None
+
+
+def _executor() -> Executor:
+    global _pool
+    if _pool is None:
+        if BOT_WORKERS > 0:
+            # forkserver: workers never fork the server with its loop and threads.
+            _pool = ProcessPoolExecutor(
+                max_workers=BOT_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+            )
+        else:
+            _pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="oslo-bot")
+    return _pool
+
+
+async def think(room_state: dict, player_id: str, budget_s: float = BOT_BUDGET_S) -> dict | None:
+    """choose_action off the event loop, on a copy of the room."""
+    state = search_state(room_state)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_executor(), choose_action, state, player_id, budget_s)
+    except BrokenProcessPool:
+        # A worker died and took the pool with it; retry once on a fresh one.
+        shutdown()
+        return await loop.run_in_executor(_executor(), choose_action, state, player_id, budget_s)
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -1,39 +1,123 @@
 """
 WebSocket consumer for Oslo Conquest.
 
-URL: ws://host/ws/oslo-conquest/
+URL: ws://host/ws/oslo-conquest/          (add ?deltas=1 for state_delta broadcasts, see deltas.py)
 
 Message protocol:
   Client → Server:
-    { "type": "create_game", "room": "oslo-1", "player": { "id": "p1", "name": "Ola" } }
+    { "type": "create_game", "room": "oslo-1", "player": { "id": "p1", "name": "Ola" }, "map": "oslo",
+      "maxPlayers": 4 }                                      optional, 2 .. the map's seats (default 2)
     { "type": "join_game",   "room": "oslo-1", "player": { "id": "p2", "name": "Kari" } }
+    { "type": "get_log",     "before": 42, "limit": 50 }   older log entries on demand
+    { "type": "sync" }                                       full game_state (after a delta version gap)
+    { "type": "list_rooms" }                                 full room_list (on a lobby version gap)
+    { "type": "spectate",    "room": "oslo-1" }              watch a room read-only
+    { "type": "replay",      "gameId": 17, "speed": 4 }      stream an archived game
+    { "type": "stop_replay" }
+    { "type": "find_game",   "player": { ... }, "maxPlayers": 2 }   matchmaking queue
+    { "type": "cancel_find" }
 
   Server → Client:
+    { "type": "room_list", "version": 12, "rooms": [ ...summaries... ] }   on connect / list_rooms
+    { "type": "room_added" | "room_updated", "version": 13, "room": { ...summary... } }
+    { "type": "room_removed", "version": 14, "room": "oslo-1" }
     { "type": "game_state", "state": { ...full gameState... } }
+    { "type": "state_delta", "version": 8, "baseVersion": 7, "changes": { ... }, ... }
+    { "type": "log_history", "before": 42, "entries": [ ...newest first... ] }
+    { "type": "spectating",  "room": "oslo-1", "spectators": 212 }      then game_state
+    { "type": "spectators",  "room": "oslo-1", "count": 213 }          to players and spectators
+    { "type": "replay_end",  "gameId": 17, "steps": 96 }
+    { "type": "queued",      "maxPlayers": 2, "depth": 1 }
+    { "type": "matched",     "room": "match-3f9c2a7b01de" }      then game_state
+    { "type": "find_cancelled" }
+
+game_state "log" carries the newest entries on create/join/rejoin; after an
+action it carries only entries added by that action ("logSince" is set and
+clients prepend them to what they have).  Every entry has a "seq".
+
+Idle and finished rooms are reaped every lifecycle.REAP_INTERVAL_S (see
+lifecycle.py); a reaped room is announced to the lobby as room_removed, and
+sockets still in it get an error and are detached from it.
+
+Every mutation of a room runs on that room's actor (see actors.py): ops are
+applied one at a time and a drained batch is broadcast once.  The bot's turn
+runs as a background task per room: decisions come from a worker pool
+(bot_search.py) and each action goes through the same actor as its own
+broadcast.  The task is cancelled on forfeit, when the last member leaves and
+when the room is reaped; rejoin_game resumes it.
+
+Rooms are persisted write-behind as snapshots plus an action journal (see
+persistence.py).  A game that is no longer in memory — after a restart or after
+being reaped while abandoned — is restored when a player sends rejoin_game.
+
+Spectators are not room members: spectators.py sends them the room's
+state_delta stream directly, off the actor and after the players' broadcast.  A
+replay rebuilds an archived game from its seed and action journal (replay.py)
+and streams it to the one socket that asked: a game_state, then one
+state_delta per action, each tagged "replay": {"gameId", "step", "steps"}.
+
+find_game queues the player instead of naming a room (see matchmaking.py): a
+full queue or the bot-fill timeout allocates a "match-<random hex>" room,
+seats every matched socket in it and starts the game.
+
+Lobby members get one room_* message per changed room, each bumping the lobby
+version; a client that sees a version other than its own + 1 asks for
+list_rooms.  Changes are coalesced: at most one flush per LOBBY_FLUSH_INTERVAL_S,
+so a burst of joins on one room becomes a single room_updated.  room_added and
+room_updated are upserts (a room_list taken between flushes may already hold
+the room).
 """
+import asyncio
 import json
+import time
+import uuid
+from urllib.parse import parse_qs
 
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.layers import get_channel_layer
 
-from .bot import get_bot_action
+from portal import metrics
+
+from . import actors, bot_search, deltas, lifecycle, maps, matchmaking, persistence, replay, spectators
 from .mvp import (
+    ACTION_TYPES,
+    MIN_PLAYERS,
+    action_from_message,
     add_player,
-    attack,
-    choose_start_checkpoint,
+    apply_action,
     create_bot_room,
     create_waiting_room,
-    end_turn,
+    fill_with_bots,
+    find_player_by_side,
     find_room_with_player,
-    forfeit,
-    move,
-    roll_dice,
+    get_log,
+    public_state,
+    seats,
     summarize_rooms,
 )
+from .rooms import RoomRegistry
+
+# In-memory room storage: { room_id: latest_game_state }, indexed by player (see rooms.py)
+_rooms = RoomRegistry()
+lifecycle.register_gauges(_rooms)
 
-# In-memory room storage: { room_id: latest_game_state }
-_rooms: dict[str, dict] = {}
+# Room members that want full game_state broadcasts (not ?deltas=1): { room_id: count }
+_full_state_members: dict[str, int] = {}
 
 _LOBBY_GROUP = "oslo-conquest-lobby"
+LOBBY_FLUSH_INTERVAL_S = 0.25
+
+BOT_MAX_ACTIONS = 40   # per bot turn: roll, move, attacks, end_turn
+
+_lobby_version = 0
+_lobby_flushed_at = 0.0
+_lobby_flush_task: asyncio.Task | None = None
+_reaper_task: asyncio.Task | None = None
+
+# Running bot turns: { room_id: task }
+_bot_tasks: dict[str, asyncio.Task] = {}
+metrics.gauge("oslo.bot.turns", lambda: len(_bot_tasks))
 
 
 class OsloConquestConsumer(AsyncWebsocketConsumer):
@@ -41,13 +125,25 @@ class OsloConquestConsumer(AsyncWebsocketConsumer):
     async def connect(self) -> None:
         self.room: str | None = None
         self.player_id: str | None = None
+        qs = parse_qs(self.scope.get("query_string", b"").decode())
+        self.wants_deltas: bool = (qs.get("deltas") or ["0"])[0] == "1"
+        self.watching: str | None = None
+        self.replay_task: asyncio.Task | None = None
+        self.ticket: matchmaking.Ticket | None = None
+        _ensure_reaper()
         await self.accept()
         await self.channel_layer.group_add(_LOBBY_GROUP, self.channel_name)
         await self._send_room_list()
 
     async def disconnect(self, close_code: int) -> None:
         await self.channel_layer.group_discard(_LOBBY_GROUP, self.channel_name)
+        self._stop_watching()
+        self._stop_replay()
+        self._leave_queue()
         if self.room:
+            self._count_member(self.room, -1)
+            if not _rooms.members(self.room):
+                _cancel_bot_turn(self.room)
             await self.channel_layer.group_discard(
                 self._group_name(self.room),
                 self.channel_name,
@@ -67,22 +163,27 @@ class OsloConquestConsumer(AsyncWebsocketConsumer):
             await self._handle_create_with_bot(data)
         elif msg_type == "join_game":
             await self._handle_join(data)
-        elif msg_type == "end_turn":
-            await self._handle_end_turn(data)
-        elif msg_type == "attack":
-            await self._handle_attack(data)
-        elif msg_type == "roll_dice":
-            await self._handle_roll_dice(data)
-        elif msg_type == "move":
-            await self._handle_move(data)
-        elif msg_type == "choose_start_checkpoint":
-            await self._handle_choose_start_checkpoint(data)
-        elif msg_type == "forfeit":
-            await self._handle_forfeit(data)
+        elif msg_type in ACTION_TYPES:
+            await self._handle_action(data)
         elif msg_type == "rejoin_game":
             await self._handle_rejoin(data)
         elif msg_type == "list_rooms":
             await self._handle_list_rooms()
+        elif msg_type == "get_log":
+            await self._handle_get_log(data)
+        elif msg_type == "sync":
+            await self._handle_sync()
+        elif msg_type == "spectate":
+            await self._handle_spectate(data)
+        elif msg_type == "replay":
+            await self._handle_replay(data)
+        elif msg_type == "stop_replay":
+            self._stop_replay()
+        elif msg_type == "find_game":
+            await self._handle_find_game(data)
+        elif msg_type == "cancel_find":
+            if self._leave_queue():
+                await self.send(text_data=json.dumps({"type": "find_cancelled"}))
 
     # ── Handlers ─────────────────────────────────────────────────────────────
 
@@ -95,15 +196,25 @@ class OsloConquestConsumer(AsyncWebsocketConsumer):
     async def _handle_create_room(self, data: dict, room_factory) -> None:
         room = str(data.get("room") or "default")
         player = data.get("player") or {}
+        map_id = str(data.get("map") or maps.DEFAULT_MAP)
+        if not maps.exists(map_id):
+            await self.send(text_data=json.dumps({"type": "error", "message": f'Ukjent kart "{map_id}"'}))
+            return
+        size = await self._room_size(data, map_id)
+        if size is None:
+            return
         self.player_id = str(player.get("id") or "")
         existing_room = find_room_with_player(_rooms, self.player_id)
         if existing_room:
             await self._send_existing_room_error(existing_room)
             return
         await self._join_group(room)
-        _rooms[room] = room_factory(room, player)
-        await self._broadcast(room, {"type": "game_state", "state": _rooms[room]})
-        await self._broadcast_room_list()
+
+        def create() -> None:
+            _rooms[room] = room_factory(room, player, map_id=map_id, size=size)
+            persistence.start(room)
+
+        await _submit(room, create, full=True)
 
     async def _handle_join(self, data: dict) -> None:
         room = str(data.get("room") or "default")
@@ -118,113 +229,102 @@ class OsloConquestConsumer(AsyncWebsocketConsumer):
             await self._send_existing_room_error(existing_room)
             return
         await self._join_group(room)
-        if room not in _rooms:
-            _rooms[room] = create_waiting_room(room, player)
-        else:
+
+        def join() -> str | None:
+            if room not in _rooms:
+                _rooms[room] = create_waiting_room(room, player)
+                persistence.start(room)
+                return None
             _rooms[room], error = add_player(_rooms[room], player)
-            if error:
-                await self.send(
-                    text_data=json.dumps({"type": "error", "message": error})
-                )
-                return
-        await self._broadcast(room, {"type": "game_state", "state": _rooms[room]})
-        await self._broadcast_room_list()
+            return error
 
-    async def _handle_end_turn(self, data: dict) -> None:
-        if not self.room or self.room not in _rooms:
-            return
-        player_id = str(data.get("playerId") or self.player_id or "")
-        _rooms[self.room], error = end_turn(_rooms[self.room], player_id)
+        error = await _submit(room, join, full=True)
         if error:
             await self.send(text_data=json.dumps({"type": "error", "message": error}))
-            return
-        await self._maybe_run_bot_turn(self.room)
-        await self._broadcast(
-            self.room,
-            {"type": "game_state", "state": _rooms[self.room]},
-        )
 
-    async def _handle_attack(self, data: dict) -> None:
-        if not self.room or self.room not in _rooms:
-            return
-        player_id = str(data.get("playerId") or self.player_id or "")
-        from_territory_id = data.get("fromTerritoryId") or data.get("from_id")
-        to_territory_id = data.get("toTerritoryId") or data.get("to_id")
-        _rooms[self.room], error = attack(
-            _rooms[self.room],
-            player_id,
-            from_territory_id,
-            to_territory_id,
-        )
-        if error:
-            await self.send(text_data=json.dumps({"type": "error", "message": error}))
+    async def _handle_find_game(self, data: dict) -> None:
+        player = data.get("player") or {}
+        player_id = str(player.get("id") or "")
+        size = await self._room_size(data, maps.DEFAULT_MAP)
+        if size is None:
             return
-        await self._broadcast(
-            self.room,
-            {"type": "game_state", "state": _rooms[self.room]},
-        )
-
-    async def _handle_roll_dice(self, data: dict) -> None:
-        if not self.room or self.room not in _rooms:
+        existing_room = find_room_with_player(_rooms, player_id)
+        if existing_room:
+            await self._send_existing_room_error(existing_room)
             return
-        player_id = str(data.get("playerId") or self.player_id or "")
-        _rooms[self.room], error = roll_dice(_rooms[self.room], player_id)
-        if error:
-            await self.send(text_data=json.dumps({"type": "error", "message": error}))
+        if not player_id or self.ticket or matchmaking.is_queued(player_id):
+            await self.send(text_data=json.dumps({"type": "error", "message": "Du står allerede i kø"}))
             return
-        await self._broadcast(
-            self.room,
-            {"type": "game_state", "state": _rooms[self.room]},
-        )
+        self.player_id = player_id
+        self.ticket = matchmaking.Ticket(player, size, self._seat)
+        matched = matchmaking.join(self.ticket)
+        if matched:
+            await matchmaking.match(matched, size)
+        else:
+            await self.send(text_data=json.dumps(
+                {"type": "queued", "maxPlayers": size, "depth": matchmaking.depth(size)}
+            ))
 
-    async def _handle_move(self, data: dict) -> None:
-        if not self.room or self.room not in _rooms:
-            return
-        player_id = str(data.get("playerId") or self.player_id or "")
-        to_territory_id = data.get("toTerritoryId") or data.get("to_id")
-        _rooms[self.room], error = move(_rooms[self.room], player_id, to_territory_id)
-        if error:
-            await self.send(text_data=json.dumps({"type": "error", "message": error}))
-            return
-        await self._broadcast(
-            self.room,
-            {"type": "game_state", "state": _rooms[self.room]},
-        )
+    async def _seat(self, room: str) -> bool:
+        """Matchmaking put this socket's player in *room* (called from the matching task)."""
+        if self.ticket is None:
+            return False    # left the queue (disconnected, joined a room) while being matched
+        self.ticket = None
+        await self._join_group(room)
+        await self.send(text_data=json.dumps({"type": "matched", "room": room}))
+        return True
 
-    async def _handle_choose_start_checkpoint(self, data: dict) -> None:
-        if not self.room or self.room not in _rooms:
+    def _leave_queue(self) -> bool:
+        ticket, self.ticket = self.ticket, None
+        return ticket is not None and matchmaking.cancel(ticket)
+
+    async def _room_size(self, data: dict, map_id: str) -> int | None:
+        """data["maxPlayers"] if the map can seat that many (default MIN_PLAYERS), else sends an error."""
+        most = seats(maps.get(map_id))
+        try:
+            size = int(data.get("maxPlayers") or MIN_PLAYERS)
+        except (TypeError, ValueError):
+            size = 0
+        if not MIN_PLAYERS <= size <= most:
+            await self.send(text_data=json.dumps(
+                {"type": "error", "message": f"Antall spillere må være mellom {MIN_PLAYERS} og {most}"}
+            ))
+            return None
+        return size
+
+    async def _handle_action(self, data: dict) -> None:
+        room = self.room
+        if self.watching and not room:
+            await self.send(text_data=json.dumps({"type": "error", "message": "Tilskuere kan ikke gjøre trekk"}))
             return
-        player_id = str(data.get("playerId") or self.player_id or "")
-        checkpoint_id = data.get("checkpointTerritoryId") or data.get("checkpoint_id")
-        _rooms[self.room], error = choose_start_checkpoint(
-            _rooms[self.room],
-            player_id,
-            checkpoint_id,
-        )
-        if error:
-            await self.send(text_data=json.dumps({"type": "error", "message": error}))
+        if not room or room not in _rooms:
             return
-        await self._broadcast(
-            self.room,
-            {"type": "game_state", "state": _rooms[self.room]},
-        )
+        action = action_from_message(data, self.player_id)
 
-    async def _handle_forfeit(self, data: dict) -> None:
-        if not self.room or self.room not in _rooms:
-            return
-        player_id = str(data.get("playerId") or self.player_id or "")
-        _rooms[self.room], error = forfeit(_rooms[self.room], player_id)
+        def act() -> str | None:
+            if room not in _rooms:
+                return None
+            _rooms[room], error = apply_action(_rooms[room], action)
+            if error:
+                return error
+            persistence.record(room, _rooms[room], action)
+            return None
+
+        error = await _submit(room, act)
         if error:
             await self.send(text_data=json.dumps({"type": "error", "message": error}))
-            return
-        await self._broadcast(
-            self.room,
-            {"type": "game_state", "state": _rooms[self.room]},
-        )
+        elif action["type"] == "end_turn":
+            _schedule_bot_turn(room)
+        elif action["type"] == "forfeit":
+            _cancel_bot_turn(room)
 
     async def _handle_rejoin(self, data: dict) -> None:
         room = str(data.get("room") or "")
         player_id = str(data.get("playerId") or "")
+        if room and room not in _rooms:
+            restored = await database_sync_to_async(persistence.load)(room)
+            if restored is not None and room not in _rooms:
+                _rooms[room] = restored
         if room not in _rooms:
             await self.send(text_data=json.dumps(
                 {"type": "error", "message": f'Rom "{room}" finnes ikke lenger.'}
@@ -242,37 +342,124 @@ class OsloConquestConsumer(AsyncWebsocketConsumer):
         self.player_id = player_id
         await self._join_group(room)
         await self.send(text_data=json.dumps(
-            {"type": "game_state", "state": {**game_state, "started": True}}
+            {"type": "game_state", "state": {**public_state(game_state), "started": True}}
         ))
+        # A bot turn cancelled when the human left picks up again.
+        _schedule_bot_turn(room)
 
     async def _handle_list_rooms(self) -> None:
         await self._send_room_list()
 
-    async def _maybe_run_bot_turn(self, room: str) -> None:
-        room_state = _rooms.get(room)
-        if not room_state:
+    async def _handle_sync(self) -> None:
+        room = self.room or self.watching
+        if not room or room not in _rooms:
+            return
+        await self.send(text_data=json.dumps(
+            {"type": "game_state", "state": public_state(_rooms[room])}
+        ))
+
+    async def _handle_spectate(self, data: dict) -> None:
+        room = str(data.get("room") or "")
+        if self.room:
+            await self.send(text_data=json.dumps(
+                {"type": "error", "message": f'Du er allerede med i rom "{self.room}".'}
+            ))
+            return
+        if room not in _rooms:
+            await self.send(text_data=json.dumps(
+                {"type": "error", "message": f'Rom "{room}" finnes ikke lenger.'}
+            ))
             return
-        bot_player = next(
-            (p for p in room_state.get("players", []) if p.get("isBot")),
-            None,
+        if self.watching != room:
+            self._stop_watching()
+            self.watching = room
+            spectators.add(room, self.channel_name, self._send_text, self._group_name(room))
+        await self.send(text_data=json.dumps(
+            {"type": "spectating", "room": room, "spectators": spectators.count(room)}
+        ))
+        await self._handle_sync()
+
+    async def _handle_replay(self, data: dict) -> None:
+        game_id = data.get("gameId")
+        recorded = await database_sync_to_async(replay.load)(game_id)
+        if recorded is None:
+            await self.send(text_data=json.dumps(
+                {"type": "error", "message": "Fant ikke reprise for dette spillet"}
+            ))
+            return
+        self._stop_replay()
+        self.replay_task = asyncio.get_running_loop().create_task(
+            self._stream_replay(game_id, recorded, replay.clamp_speed(data.get("speed", 1)))
         )
-        if not bot_player:
+
+    async def _handle_get_log(self, data: dict) -> None:
+        if not self.room or self.room not in _rooms:
             return
-        for _ in range(5):
-            action = get_bot_action(_rooms[room], bot_player["id"])
-            if not action:
-                return
-            if action["type"] == "choose_start_checkpoint":
-                _rooms[room], _ = choose_start_checkpoint(
-                    _rooms[room], bot_player["id"], action["checkpointId"]
-                )
-            elif action["type"] == "end_turn":
-                _rooms[room], _ = end_turn(_rooms[room], bot_player["id"])
+        log = get_log(_rooms[self.room])
+        try:
+            before = int(data.get("before") or log.last_seq + 1)
+            limit = int(data.get("limit") or 50)
+        except (TypeError, ValueError):
+            await self.send(text_data=json.dumps({"type": "error", "message": "Ugyldig logg-forespørsel"}))
+            return
+        await self.send(text_data=json.dumps(
+            {"type": "log_history", "before": before, "entries": log.before(before, limit)}
+        ))
 
     # ── Channel-layer receiver ────────────────────────────────────────────────
 
     async def oslo_broadcast(self, event: dict) -> None:
-        await self.send(text_data=json.dumps(event["message"]))
+        if self.wants_deltas and "delta" in event:
+            await self.send(text_data=event["delta"])
+        else:
+            await self.send(text_data=event["text"])
+
+    async def oslo_evicted(self, event: dict) -> None:
+        """The room was reaped with this socket still in it: leave it without counting."""
+        room = event["room"]
+        if self.room != room:
+            return
+        self.room = None
+        await self.channel_layer.group_discard(self._group_name(room), self.channel_name)
+        await self.send(text_data=json.dumps({"type": "error", "message": f'Rom "{room}" finnes ikke lenger.'}))
+
+    # ── Spectating and replays ────────────────────────────────────────────────
+
+    def _stop_watching(self) -> None:
+        if not self.watching:
+            return
+        room, self.watching = self.watching, None
+        spectators.remove(room, self.channel_name, self._group_name(room))
+
+    async def _send_text(self, text: str) -> None:
+        await self.send(text_data=text)
+
+    def _stop_replay(self) -> None:
+        if self.replay_task is not None and not self.replay_task.done():
+            self.replay_task.cancel()
+        self.replay_task = None
+
+    async def _stream_replay(self, game_id, data: dict, speed: float) -> None:
+        """Send the archived game as game_state + one state_delta per action."""
+        key = f"replay:{self.channel_name}"
+        steps = len(data.get("actions", []))
+        try:
+            for step, room_state in replay.states(data):
+                tag = {"gameId": game_id, "step": step, "steps": steps}
+                if step == 0:
+                    deltas.reset(key, room_state)
+                    message = {"type": "game_state", "replay": tag,
+                               "state": {**public_state(room_state), "started": True}}
+                else:
+                    await asyncio.sleep(replay.REPLAY_STEP_S / speed)
+                    message = {**deltas.advance(key, room_state), "room": data["room"], "replay": tag}
+                await self.send(text_data=json.dumps(message))
+            await self.send(text_data=json.dumps({"type": "replay_end", "gameId": game_id, "steps": steps}))
+        except ValueError as exc:
+            print(f"[oslo-conquest] replay error in game {game_id}: {exc}")
+            await self.send(text_data=json.dumps({"type": "error", "message": "Reprisen kunne ikke spilles av"}))
+        finally:
+            deltas.forget(key)
 
     # ── Helpers ───────────────────────────────────────────────────────────────
 
@@ -282,19 +469,29 @@ class OsloConquestConsumer(AsyncWebsocketConsumer):
         return f"oslo-conquest-{safe}"
 
     async def _join_group(self, room: str) -> None:
-        if self.room and self.room != room:
+        if self.room == room:
+            return
+        self._leave_queue()
+        self._stop_watching()       # a player gets the group broadcast, not the spectator feed too
+        if self.room:
+            self._count_member(self.room, -1)
             await self.channel_layer.group_discard(
                 self._group_name(self.room),
                 self.channel_name,
             )
         self.room = room
+        self._count_member(room, +1)
         await self.channel_layer.group_add(self._group_name(room), self.channel_name)
 
-    async def _broadcast(self, room: str, message: dict) -> None:
-        await self.channel_layer.group_send(
-            self._group_name(room),
-            {"type": "oslo.broadcast", "message": message},
-        )
+    def _count_member(self, room: str, delta: int) -> None:
+        _rooms.add_member(room, delta)
+        if self.wants_deltas:
+            return
+        count = _full_state_members.get(room, 0) + delta
+        if count > 0:
+            _full_state_members[room] = count
+        else:
+            _full_state_members.pop(room, None)
 
     async def _send_existing_room_error(self, room: str) -> None:
         await self.send(text_data=json.dumps(
@@ -305,17 +502,256 @@ class OsloConquestConsumer(AsyncWebsocketConsumer):
         ))
 
     async def _send_room_list(self) -> None:
-        await self.send(
-            text_data=json.dumps(
-                {"type": "room_list", "rooms": summarize_rooms(_rooms)}
-            )
+        await self.send(text_data=json.dumps(
+            {"type": "room_list", "version": _lobby_version, "rooms": summarize_rooms(_rooms)}
+        ))
+
+
+# ── Matchmaking ───────────────────────────────────────────────────────────────
+
+def _match_room_name() -> str:
+    # Random rather than counted: names must not repeat after a restart, when
+    # persisted rooms of the previous process may still be rejoined.
+    while True:
+        room = f"match-{uuid.uuid4().hex[:12]}"
+        if room not in _rooms:
+            return room
+
+
+async def _start_match(tickets: list[matchmaking.Ticket], size: int) -> None:
+    """Allocate a room for *tickets*, seat their sockets and start the game (bots fill free seats).
+
+    If a player left after the tickets were taken, the others go back to the
+    head of the queue.  A socket that is gone by the time it is seated (it left
+    while earlier ones were) just loses its seat to a bot.
+    """
+    live = [ticket for ticket in tickets if not ticket.cancelled]
+    if len(live) < len(tickets):
+        matched = matchmaking.requeue(live, size)
+        if matched:
+            await matchmaking.match(matched, size)
+        return
+
+    room = _match_room_name()
+    seated = [ticket for ticket in tickets if await ticket.seat(room)]
+    if not seated:
+        return
+
+    def create() -> None:
+        room_state = create_waiting_room(room, seated[0].player, size=size)
+        for ticket in seated[1:]:
+            room_state, _ = add_player(room_state, ticket.player)
+        _rooms[room] = fill_with_bots(room_state)
+        persistence.start(room)
+
+    await _submit(room, create, full=True)
+    _schedule_bot_turn(room)
+
+
+matchmaking.set_match_handler(_start_match)
+
+
+# ── Room actors ───────────────────────────────────────────────────────────────
+
+async def _submit(room: str, op, *, full: bool = False) -> str | None:
+    """Run *op* on the room's actor (see actors.py); one broadcast per batch."""
+    return await actors.submit(room, op, _broadcast_state, _log_seq, full=full)
+
+
+def _log_seq(room: str) -> int | None:
+    return get_log(_rooms[room]).last_seq if room in _rooms else None
+
+
+async def _broadcast_state(room: str, log_since: int | None = None, full: bool = False) -> None:
+    """Broadcast the room's state once, encoded once for all members.
+
+    Delta subscribers get a state_delta unless *full* (membership changed) or
+    there is no baseline; game_state is only built when someone needs it.
+    """
+    if room not in _rooms:
+        return
+    room_state = _rooms[room]
+    if full:
+        persistence.snapshot(room, room_state)
+        deltas.reset(room, room_state)
+        delta = None
+    else:
+        delta = deltas.advance(room, room_state)
+
+    event: dict = {"type": "oslo.broadcast"}
+    if delta is not None:
+        event["delta"] = json.dumps(delta)
+    if delta is None or _full_state_members.get(room):
+        event["text"] = json.dumps(
+            {"type": "game_state", "state": public_state(room_state, log_since=log_since)}
         )
+    channel_layer = get_channel_layer()
+    await channel_layer.group_send(OsloConquestConsumer._group_name(room), event)
+    spectators.publish(room, event.get("delta") or event["text"], lambda: _full_state_text(room))
+    await _publish_lobby(channel_layer)
+
+
+def _full_state_text(room: str) -> str | None:
+    if room not in _rooms:
+        return None
+    return json.dumps({"type": "game_state", "state": public_state(_rooms[room])})
+
+
+# ── Bot turns ─────────────────────────────────────────────────────────────────
+#
+# A bot turn is a background task per room, so the human's end_turn returns as
+# soon as it is applied.  Cancelling the task (forfeit, last member gone, room
+# reaped) stops the bot before its next action; a decision already running in
+# the pool finishes there and is dropped.
+
+def _bot_to_move(room_state: dict | None) -> dict | None:
+    """The room's bot player if it is the bot's turn, else None."""
+    if not room_state or room_state.get("winner") or room_state.get("phase") not in ("setup", "playing"):
+        return None
+    player = find_player_by_side(room_state, room_state.get("activePlayer"))
+    return player if player and player.get("isBot") else None
+
+
+def _schedule_bot_turn(room: str) -> None:
+    task = _bot_tasks.get(room)
+    if task is not None and not task.done():
+        return
+    if _bot_to_move(_rooms.get(room)) is None:
+        return
+    task = _bot_tasks[room] = asyncio.get_running_loop().create_task(_play_bot_turn(room))
+    task.add_done_callback(lambda done: _bot_tasks.pop(room, None) if _bot_tasks.get(room) is done else None)
+
+
+def _cancel_bot_turn(room: str) -> None:
+    task = _bot_tasks.pop(room, None)
+    if task is not None and not task.done():
+        task.cancel()
+        metrics.incr("oslo.bot.cancelled")
+
+
+async def _play_bot_turn(room: str) -> None:
+    """Let the room's bots play until it is a human's turn (or nobody's).
+
+    Each decision is made off the event loop (bot_search.think) and applied
+    through the room's actor, so every bot action is its own broadcast.  The
+    decision can be stale by the time it runs.  BOT_MAX_ACTIONS applies to
+    each bot turn, so several bots in a row each get the full allowance.  A
+    bot that cannot go on (think fails or has nothing, mvp rejects its action,
+    or it hits the cap) ends its turn, so the game never waits on it.
+    """
+    turn_of, actions = None, 0
+    while True:
+        bot_player = _bot_to_move(_rooms.get(room))
+        if not bot_player:
+            return
+        if bot_player["id"] != turn_of:
+            turn_of, actions = bot_player["id"], 0
+        action = None
+        if actions < BOT_MAX_ACTIONS:
+            try:
+                action = await bot_search.think(_rooms[room], bot_player["id"])
+            except Exception as exc:
+                print(f"[oslo-conquest] bot error in {room}: {exc}")
+        if action is None or await _submit(room, _bot_act(room, action)):
+            if await _submit(room, _bot_act(room, {"type": "end_turn", "playerId": bot_player["id"]})):
+                return
+            turn_of = None
+            continue
+        metrics.incr("oslo.bot.actions")
+        actions += 1
+        if action["type"] == "end_turn":
+            turn_of = None          # the same bot may be next again, with a fresh allowance
+
+
+def _bot_act(room: str, action: dict):
+    """The actor job that applies a bot's *action* to *room*."""
+    def act() -> str | None:
+        if room not in _rooms:
+            return "Rommet finnes ikke"
+        _rooms[room], error = apply_action(_rooms[room], action)
+        if not error:
+            persistence.record(room, _rooms[room], action)
+        return error
+    return act
+
+
+# ── Lobby ─────────────────────────────────────────────────────────────────────
+
+async def _publish_lobby(channel_layer) -> None:
+    """Flush room changes to the lobby now, or schedule a coalesced flush."""
+    global _lobby_flush_task
+    if not _rooms.has_changes():
+        return
+    if _lobby_flush_task is not None and not _lobby_flush_task.done():
+        metrics.incr("oslo.lobby.coalesced")
+        return
+    delay = _lobby_flushed_at + LOBBY_FLUSH_INTERVAL_S - time.monotonic()
+    if delay <= 0:
+        await _flush_lobby(channel_layer)
+    else:
+        _lobby_flush_task = asyncio.get_running_loop().create_task(
+            _flush_lobby_later(channel_layer, delay)
+        )
+
+
+async def _flush_lobby_later(channel_layer, delay: float) -> None:
+    await asyncio.sleep(delay)
+    await _flush_lobby(channel_layer)
+
 
-    async def _broadcast_room_list(self) -> None:
-        await self.channel_layer.group_send(
+async def _flush_lobby(channel_layer) -> None:
+    global _lobby_version, _lobby_flushed_at
+    _lobby_flushed_at = time.monotonic()
+    added, updated, removed = _rooms.pop_changes()
+    messages = (
+        [{"type": "room_added", "room": summary} for summary in added]
+        + [{"type": "room_updated", "room": summary} for summary in updated]
+        + [{"type": "room_removed", "room": room_id} for room_id in removed]
+    )
+    for message in messages:
+        _lobby_version += 1
+        await channel_layer.group_send(
             _LOBBY_GROUP,
-            {
-                "type": "oslo.broadcast",
-                "message": {"type": "room_list", "rooms": summarize_rooms(_rooms)},
-            },
+            {"type": "oslo.broadcast", "text": json.dumps({**message, "version": _lobby_version})},
         )
+    metrics.incr("oslo.lobby.messages", len(messages))
+
+
+# ── Reaping ───────────────────────────────────────────────────────────────────
+
+def _ensure_reaper() -> None:
+    global _reaper_task
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.get_running_loop().create_task(_reaper_loop())
+
+
+async def _reaper_loop() -> None:
+    while True:
+        await asyncio.sleep(lifecycle.REAP_INTERVAL_S)
+        try:
+            await reap_rooms()
+        except Exception as exc:
+            print(f"[oslo-conquest] reap error: {exc}")
+
+
+async def reap_rooms(now: float | None = None) -> list[tuple[str, str]]:
+    """Evict expired rooms, archive finished games and tell the lobby."""
+    evicted, finished = lifecycle.reap(_rooms, now)
+    if finished:
+        # Before forget(): archive() reads the journal for the replay.
+        await database_sync_to_async(lifecycle.archive)(finished)
+    channel_layer = get_channel_layer()
+    for room_id, reason in evicted:
+        _full_state_members.pop(room_id, None)
+        _cancel_bot_turn(room_id)
+        spectators.forget(room_id)
+        if reason in lifecycle.FORGET_REASONS:
+            persistence.forget(room_id)
+        if reason in ("finished", "idle"):
+            # The only reasons that evict rooms with sockets still in them.
+            await channel_layer.group_send(
+                OsloConquestConsumer._group_name(room_id), {"type": "oslo.evicted", "room": room_id}
+            )
+    if evicted:
+        await _publish_lobby(channel_layer)
+    return evicted
@@ -0,0 +1,119 @@
+"""Versioned state deltas for Oslo Conquest broadcasts.
+
+Every broadcast bumps room_state["version"].  Clients that connect with
+?deltas=1 get, instead of the full game_state after each action, a merge-patch
+of what changed since the previous version:
+
+  { "type": "state_delta", "room": "oslo-1", "version": 8, "baseVersion": 7,
+    "changes": {
+      "territories": { "t12": { "owner": "blue", "units": 1 } },
+      "players":     { "p1": { "position": "t5", "validMoves": [] } },
+      "activePlayer": "blue",
+      "legalActions": { "side": "blue", "rollDice": true }
+    },
+    "log": [ ...entries newer than the base version... ], "logSeq": 31 }
+
+A client whose version != baseVersion missed something and sends
+{ "type": "sync" } for a full game_state.  Create, join and rejoin always send
+the full state (they change room membership) and reset the baseline.
+
+Baselines are kept per room in this module; forget(room) drops one.
+"""
+from array import array
+
+from .mvp import get_board, get_log, legal_summary
+
+# Top-level room fields that can change during a game.
+_TOP_LEVEL = ("phase", "started", "activePlayer", "winner")
+
+
+class _Baseline:
+    __slots__ = ("version", "owners", "units", "players", "top", "legal", "log_seq")
+
+    def __init__(self, room_state: dict, legal: dict | None = None) -> None:
+        board = get_board(room_state)
+        self.version: int = room_state.get("version", 0)
+        self.owners = bytes(board.owners) if board is not None else None
+        self.units = array("H", board.units) if board is not None else None
+        self.players = {
+            p.get("id"): {k: (list(v) if isinstance(v, list) else v) for k, v in p.items()}
+            for p in room_state.get("players", [])
+        }
+        self.top = {k: room_state.get(k) for k in _TOP_LEVEL}
+        self.legal = legal_summary(room_state) if legal is None else legal
+        self.log_seq = get_log(room_state).last_seq
+
+
+_baselines: dict[str, _Baseline] = {}
+
+
+def reset(room: str, room_state: dict) -> None:
+    """Bump the version and take a new baseline after a full-state broadcast."""
+    room_state["version"] = room_state.get("version", 0) + 1
+    _baselines[room] = _Baseline(room_state)
+
+
+def advance(room: str, room_state: dict) -> dict | None:
+    """Bump the version and return the state_delta since the last broadcast.
+
+    Returns None (after resetting) when there is no usable baseline, in which
+    case the caller must send the full state.
+    """
+    base = _baselines.get(room)
+    if base is None or base.version != room_state.get("version", 0):
+        reset(room, room_state)
+        return None
+
+    changes: dict = {}
+
+    board = get_board(room_state)
+    if board is not None and base.owners is not None:
+        territories = {}
+        for i, (owner, units) in enumerate(zip(board.owners, board.units)):
+            if owner != base.owners[i] or units != base.units[i]:
+                territories[board.territory(i)["id"]] = {"owner": board.owner(i), "units": units}
+        if territories:
+            changes["territories"] = territories
+    elif board is not None:
+        changes["territories"] = board.to_territories()
+
+    players = {}
+    for p in room_state.get("players", []):
+        before = base.players.get(p.get("id"), {})
+        changed = {k: v for k, v in p.items() if before.get(k) != v}
+        if changed:
+            players[p.get("id")] = changed
+    if players:
+        changes["players"] = players
+
+    for key in _TOP_LEVEL:
+        if room_state.get(key) != base.top.get(key):
+            changes[key] = room_state.get(key)
+
+    # legalActions is patched one level deep: only the keys that changed, or
+    # null when nobody is to move.
+    legal = legal_summary(room_state)
+    if legal != base.legal:
+        if legal is None or base.legal is None:
+            changes["legalActions"] = legal
+        else:
+            changes["legalActions"] = {k: v for k, v in legal.items() if base.legal.get(k) != v}
+
+    log = get_log(room_state)
+    message = {
+        "type": "state_delta",
+        "room": room,
+        "version": base.version + 1,
+        "baseVersion": base.version,
+        "changes": changes,
+        "log": log.since(base.log_seq),
+        "logSeq": log.last_seq,
+    }
+
+    room_state["version"] = base.version + 1
+    _baselines[room] = _Baseline(room_state, legal)
+    return message
+
+
+def forget(room: str) -> None:
+    _baselines.pop(room, None)
@@ -0,0 +1,82 @@
+"""Bounded game log for Oslo Conquest rooms.
+
+Each entry gets a per-room sequence number ("seq") and the log keeps only the
+last LOG_CAPACITY entries, so appending is O(1) and a long game does not grow
+its room state.  Iteration is newest first, matching the order of the old
+list-based log.
+
+Clients receive the newest entries with a full game_state and afterwards only
+entries with seq > their last seen one; older history is fetched on demand
+with get_log (see consumers.py).
+"""
+from collections import deque
+
+LOG_CAPACITY = 200     # entries kept per room
+LOG_SNAPSHOT = 30      # entries sent with a full game_state
+LOG_PAGE_MAX = 100     # max entries per get_log request
+
+
+class GameLog:
+    __slots__ = ("_entries", "last_seq")
+
+    def __init__(self, capacity: int = LOG_CAPACITY) -> None:
+        self._entries: deque[dict] = deque(maxlen=capacity)
+        self.last_seq = 0
+
+    def append(self, entry: dict) -> dict:
+        self.last_seq += 1
+        entry = {**entry, "seq": self.last_seq}
+        self._entries.append(entry)
+        return entry
+
+    def __iter__(self):
+        return reversed(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def since(self, seq: int) -> list[dict]:
+        """Entries newer than *seq*, newest first."""
+        out = []
+        for entry in reversed(self._entries):
+            if entry["seq"] <= seq:
+                break
+            out.append(entry)
+        return out
+
+    def recent(self, limit: int = LOG_SNAPSHOT) -> list[dict]:
+        """The newest *limit* entries, newest first."""
+        out = []
+        for entry in reversed(self._entries):
+            if len(out) >= limit:
+                break
+            out.append(entry)
+        return out
+
+    def before(self, seq: int, limit: int = LOG_PAGE_MAX) -> list[dict]:
+        """Up to *limit* entries older than *seq*, newest first (for history paging)."""
+        limit = max(0, min(limit, LOG_PAGE_MAX))
+        out = []
+        for entry in reversed(self._entries):
+            if entry["seq"] >= seq:
+                continue
+            if len(out) >= limit:
+                break
+            out.append(entry)
+        return out
+
+    @classmethod
+    def from_entries(cls, entries: list[dict]) -> "GameLog":
+        """Build from a newest-first list (the legacy list log shape)."""
+        log = cls()
+        for entry in reversed(entries):
+            log.append({k: v for k, v in entry.items() if k != "seq"})
+        return log
+
+    @classmethod
+    def restore(cls, entries: list[dict], last_seq: int) -> "GameLog":
+        """Rebuild from an oldest-first list that already carries seqs (persistence)."""
+        log = cls()
+        log._entries.extend(entries)
+        log.last_seq = last_seq
+        return log
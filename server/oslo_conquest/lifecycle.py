@@ -0,0 +1,150 @@
+"""
+Room lifecycle for Oslo Conquest: reaping idle rooms and archiving finished games.
+
+The consumer calls reap() every REAP_INTERVAL_S.  A room is evicted from memory
+once it has been idle (no action, join or leave) longer than the TTL for its case:
+
+  finished   the game has a winner — written to ArchivedGame first
+  waiting    waiting room with nobody connected (the creator left)
+  bot        bot game with nobody connected
+  abandoned  any other room with nobody connected
+  idle       any room, connected or not — hard cap
+
+Defaults are in ROOM_TTLS_S; settings.OSLO_CONQUEST_ROOM_TTLS overrides single keys.
+register_gauges() exposes room count and an approximate memory size at /metrics/.
+The size is measured by reap(), on the event loop; the gauge, read from the
+/metrics/ view thread, only returns that number.
+"""
+import sys
+import time
+from collections import deque
+
+from django.conf import settings
+
+from portal import metrics
+
+from . import deltas, persistence, replay
+from .maps import GameMap
+from .mvp import get_log, public_state
+
+ROOM_TTLS_S = {
+    "finished": 10 * 60,
+    "waiting": 5 * 60,
+    "bot": 15 * 60,
+    "abandoned": 30 * 60,
+    "idle": 6 * 60 * 60,
+}
+REAP_INTERVAL_S = 30
+
+_approx_bytes = 0       # approx_size of every live room, as of the last reap()
+
+# Evictions that also drop the persisted room.  Other rooms stay in the DB and
+# are restored if a player comes back with rejoin_game.
+FORGET_REASONS = ("finished", "waiting")
+
+
+def room_ttls() -> dict[str, float]:
+    return {**ROOM_TTLS_S, **getattr(settings, "OSLO_CONQUEST_ROOM_TTLS", {})}
+
+
+def expiry_reason(rooms, room_id: str, ttls: dict[str, float], now: float) -> str | None:
+    """Why *room_id* should be evicted now, or None to keep it."""
+    room_state = rooms[room_id]
+    idle = rooms.idle_for(room_id, now)
+    # Rooms persisted before conquest wins set phase "finished" have only a winner.
+    finished = room_state.get("phase") == "finished" or room_state.get("winner")
+    if finished and idle >= ttls["finished"]:
+        return "finished"
+    if idle >= ttls["idle"]:
+        return "idle"
+    if rooms.members(room_id):
+        return None
+    if room_state.get("phase", "waiting") == "waiting" and idle >= ttls["waiting"]:
+        return "waiting"
+    if any(p.get("isBot") for p in room_state.get("players", [])) and idle >= ttls["bot"]:
+        return "bot"
+    if idle >= ttls["abandoned"]:
+        return "abandoned"
+    return None
+
+
+def reap(rooms, now: float | None = None) -> tuple[list[tuple[str, str]], list[dict]]:
+    """Evict expired rooms from *rooms* (a RoomRegistry).
+
+    Returns [(room_id, reason)] and the states of evicted finished games, which
+    the caller passes to archive() (off the event loop).  Also refreshes the
+    oslo.rooms.approx_bytes gauge.
+    """
+    global _approx_bytes
+    ttls = room_ttls()
+    now = time.monotonic() if now is None else now
+    evicted, finished = [], []
+    for room_id in list(rooms):
+        reason = expiry_reason(rooms, room_id, ttls, now)
+        if reason is None:
+            continue
+        room_state = rooms.pop(room_id)
+        deltas.forget(room_id)
+        evicted.append((room_id, reason))
+        if reason == "finished":
+            finished.append(room_state)
+        metrics.incr(f"oslo.rooms.reaped.{reason}")
+    _approx_bytes = sum(approx_size(s) for s in rooms.values())
+    return evicted, finished
+
+
+def archive(room_states: list[dict]) -> int:
+    """Write finished games to ArchivedGame, with their replay. Returns the number of rows.
+
+    Reads each room's journal, so call it before persistence.forget().
+    """
+    from .models import ArchivedGame
+
+    rows = []
+    for room_state in room_states:
+        state = public_state(room_state)
+        state.pop("log", None)
+        actions = persistence.history(room_state.get("room", ""))
+        rows.append(ArchivedGame(
+            room=room_state.get("room", ""),
+            winner=room_state.get("winner"),
+            players=[{"id": p.get("id"), "name": p.get("name"), "side": p.get("side")}
+                     for p in room_state.get("players", [])],
+            final_state=state,
+            log=list(get_log(room_state)),
+            replay=replay.record(room_state, actions) if actions else {},
+        ))
+    ArchivedGame.objects.bulk_create(rows)
+    metrics.incr("oslo.rooms.archived", len(rows))
+    return len(rows)
+
+
+# ── Gauges ────────────────────────────────────────────────────────────────────
+
+def approx_size(obj, _seen: set | None = None) -> int:
+    """Rough deep sys.getsizeof of a room state (dicts, lists, slotted objects).
+
+    The GameMap behind BoardState.map is shared by every room on that map and
+    never changes, so it is not counted.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen or isinstance(obj, GameMap):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k, seen) + approx_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(approx_size(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(approx_size(getattr(obj, name), seen)
+                    for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+def register_gauges(rooms) -> None:
+    metrics.gauge("oslo.rooms.total", lambda: len(rooms))
+    metrics.gauge("oslo.rooms.finished",
+                  lambda: sum(1 for s in list(rooms.values()) if s.get("phase") == "finished"))
+    metrics.gauge("oslo.rooms.members", lambda: sum(rooms.members(r) for r in list(rooms)))
+    metrics.gauge("oslo.rooms.approx_bytes", lambda: _approx_bytes)
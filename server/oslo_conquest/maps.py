@@ -0,0 +1,281 @@
+"""
+Oslo Conquest maps: board graphs loaded from map definition files.
+
+A map is the "graph" section of a JSON file — for the default map the client's
+domains/map/map.json, so server and client share one definition:
+
+  "graph": {
+    "territories": ["t0a", ..., "kolbotn_cp"],         board order, checkpoints included
+    "checkpoints": ["lysaker_cp", "kolbotn_cp", ...],  in the order players visit them
+    "startTerritories": {"red": "t0a", "blue": "t35"},
+    "adjacency": {"t0a": ["t0b", "t1", ...], ...}
+  }
+
+load() validates the graph (known ids, symmetric adjacency, no self-loops,
+connected, start territories that are not checkpoints) and compiles it into the
+indexed form the rules use: neighbour bitsets, an all-pairs distance matrix and
+the reachable-within-n-steps table.  The compiled form is cached on disk under
+CACHE_DIR, keyed by the SHA-256 of the file, so a restart with an unchanged map
+reads one small JSON file instead of recomputing.
+
+Rooms name their map in room_state["map"] (see mvp.game_map); get() keeps one
+GameMap per map id for the life of the process.
+
+Settings (optional): OSLO_CONQUEST_MAPS ({map id: path}) is merged over MAPS,
+OSLO_CONQUEST_MAP_CACHE replaces CACHE_DIR.
+"""
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_MAP = "oslo"
+MAX_DICE = 6
+UNREACHABLE = 255
+
+_SERVER_DIR = Path(__file__).resolve().parent.parent
+MAPS: dict[str, Path] = {
+    DEFAULT_MAP: _SERVER_DIR.parent / "client-react" / "oslo-conquest" / "src" / "domains" / "map" / "map.json",
+}
+CACHE_DIR = _SERVER_DIR / "data" / "oslo-maps"
+
+# Bump when the compiled layout changes, so old cache files are not read.
+_COMPILED_VERSION = 2
+
+
+class MapError(ValueError):
+    """A map definition that cannot be used; the message lists every problem."""
+
+
+def _setting(name: str, default):
+    # bench/ and the simulator import the rules without configuring Django.
+    try:
+        return getattr(settings, name, default)
+    except ImproperlyConfigured:
+        return default
+
+
+def map_paths() -> dict[str, Path]:
+    return {**MAPS, **{k: Path(v) for k, v in _setting("OSLO_CONQUEST_MAPS", {}).items()}}
+
+
+# ── Validation and compilation ────────────────────────────────────────────────
+
+def validate(graph: dict) -> None:
+    """Raise MapError if *graph* is not a playable board."""
+    problems = []
+    territories = graph.get("territories") or []
+    known = set(territories)
+    if len(known) != len(territories):
+        problems.append("duplicate territory ids")
+    if len(territories) >= UNREACHABLE:
+        problems.append(f"at most {UNREACHABLE - 1} territories")
+
+    checkpoints = graph.get("checkpoints") or []
+    for cp in checkpoints:
+        if cp not in known:
+            problems.append(f"checkpoint {cp!r} is not a territory")
+    if len(set(checkpoints)) != len(checkpoints):
+        problems.append("duplicate checkpoints")
+
+    starts = graph.get("startTerritories") or {}
+    if len(starts) < 2:
+        problems.append("at least two start territories")
+    for side, tid in starts.items():
+        if tid not in known or tid in checkpoints:
+            problems.append(f"start territory {tid!r} for {side} must be a territory that is not a checkpoint")
+
+    adjacency = graph.get("adjacency") or {}
+    for tid, neighbors in adjacency.items():
+        if tid not in known:
+            problems.append(f"adjacency for unknown territory {tid!r}")
+            continue
+        for n in neighbors:
+            if n == tid:
+                problems.append(f"{tid!r} borders itself")
+            elif n not in known:
+                problems.append(f"{tid!r} borders unknown territory {n!r}")
+            elif tid not in adjacency.get(n, ()):
+                problems.append(f"{tid!r} borders {n!r} but not the other way round")
+
+    if not problems and territories:
+        seen = {territories[0]}
+        queue = deque(seen)
+        while queue:
+            for n in adjacency.get(queue.popleft(), ()):
+                if n not in seen:
+                    seen.add(n)
+                    queue.append(n)
+        unreachable = [t for t in territories if t not in seen]
+        if unreachable:
+            problems.append(f"not connected: {', '.join(unreachable[:5])} cannot be reached from {territories[0]!r}")
+    elif not territories:
+        problems.append("no territories")
+
+    if problems:
+        raise MapError("; ".join(problems))
+
+
+def compile_graph(graph: dict) -> dict:
+    """The indexed, JSON-ready form of a validated graph (what is cached on disk)."""
+    territories = list(graph["territories"])
+    index = {tid: i for i, tid in enumerate(territories)}
+    neighbors = [sorted(index[n] for n in graph["adjacency"].get(tid, ())) for tid in territories]
+
+    distances = []
+    for start in range(len(territories)):
+        row = bytearray([UNREACHABLE]) * len(territories)
+        row[start] = 0
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for j in neighbors[node]:
+                if row[j] == UNREACHABLE:
+                    row[j] = row[node] + 1
+                    queue.append(j)
+        distances.append(row)
+
+    # reachable[i][steps - 1]: indices within 1..steps hops of i, sorted by id.
+    diameter = max(d for row in distances for d in row if d != UNREACHABLE)
+    reachable = [
+        [sorted((j for j, d in enumerate(row) if 0 < d <= steps), key=territories.__getitem__)
+         for steps in range(1, max(MAX_DICE, diameter) + 1)]
+        for row in distances
+    ]
+
+    return {
+        "version": _COMPILED_VERSION,
+        "territories": territories,
+        "checkpoints": list(graph["checkpoints"]),
+        "startTerritories": dict(graph["startTerritories"]),
+        "neighbors": neighbors,
+        "distances": [row.hex() for row in distances],
+        "reachable": reachable,
+    }
+
+
+class GameMap:
+    """One compiled board graph; every lookup the rules need is O(1)."""
+
+    __slots__ = (
+        "map_id", "territory_ids", "checkpoint_ids", "checkpoint_sequence", "start_territories",
+        "adjacency", "territory_index", "territory_set", "checkpoint_set", "neighbors",
+        "neighbor_bits", "checkpoint_bits", "distances", "diameter", "_within", "_reachable",
+    )
+
+    def __init__(self, map_id: str, compiled: dict) -> None:
+        ids = tuple(compiled["territories"])
+        sequence = tuple(compiled["checkpoints"])
+        self.map_id = map_id
+        self.territory_ids: tuple[str, ...] = ids
+        self.checkpoint_sequence: tuple[str, ...] = sequence
+        # Board order, as the legal-action summary and the bots list them.
+        self.checkpoint_ids: tuple[str, ...] = tuple(tid for tid in ids if tid in sequence)
+        self.start_territories: dict[str, str] = dict(compiled["startTerritories"])
+        self.territory_index: dict[str, int] = {tid: i for i, tid in enumerate(ids)}
+        self.adjacency: dict[str, list[str]] = {
+            tid: [ids[j] for j in compiled["neighbors"][i]] for i, tid in enumerate(ids)
+        }
+        self.territory_set = frozenset(ids)
+        self.checkpoint_set = frozenset(self.checkpoint_ids)
+        self.neighbors: dict[str, frozenset[str]] = {tid: frozenset(n) for tid, n in self.adjacency.items()}
+        self.neighbor_bits: tuple[int, ...] = tuple(sum(1 << j for j in row) for row in compiled["neighbors"])
+        self.checkpoint_bits = sum(1 << self.territory_index[cp] for cp in self.checkpoint_ids)
+        self.distances: tuple[bytes, ...] = tuple(bytes.fromhex(row) for row in compiled["distances"])
+        self.diameter = max(d for row in self.distances for d in row if d != UNREACHABLE)
+        self._within: list[list[list[int]]] = compiled["reachable"]
+        # (start id, steps) → sorted ids within 1..steps hops, filled in on first use.
+        self._reachable: dict[tuple[str, int], tuple[str, ...]] = {}
+
+    def __reduce__(self):
+        # Pickled by id (bot_search sends boards to worker processes).
+        return get, (self.map_id,)
+
+    def are_neighbors(self, from_id: str, to_id: str) -> bool:
+        return to_id in self.neighbors.get(from_id, ())
+
+    def distance(self, from_id: str, to_id: str) -> int | None:
+        """Shortest number of hops between two territories, or None if either is unknown/unreachable."""
+        i, j = self.territory_index.get(from_id), self.territory_index.get(to_id)
+        if i is None or j is None or self.distances[i][j] == UNREACHABLE:
+            return None
+        return self.distances[i][j]
+
+    def reachable(self, start_id: str | None, steps: int) -> tuple[str, ...]:
+        """Territories 1..steps hops from *start_id*, sorted by id."""
+        if not start_id or steps <= 0:
+            return ()
+        key = (start_id, min(steps, max(MAX_DICE, self.diameter)))
+        found = self._reachable.get(key)
+        if found is None:
+            i = self.territory_index.get(start_id)
+            if i is None:
+                return ()
+            ids = self.territory_ids
+            found = self._reachable[key] = tuple(ids[j] for j in self._within[i][key[1] - 1])
+        return found
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+
+_maps: dict[str, GameMap] = {}
+
+
+def exists(map_id: str) -> bool:
+    return map_id in _maps or map_id in map_paths()
+
+
+def get(map_id: str | None = None) -> GameMap:
+    """The compiled map *map_id* (default DEFAULT_MAP), loaded on first use."""
+    map_id = map_id or DEFAULT_MAP
+    game_map = _maps.get(map_id)
+    if game_map is None:
+        game_map = _maps[map_id] = load(map_id)
+    return game_map
+
+
+def load(map_id: str) -> GameMap:
+    """Read, validate and compile *map_id*, going through the on-disk cache."""
+    path = map_paths().get(map_id)
+    if path is None:
+        raise MapError(f"unknown map {map_id!r}")
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    cache_dir = Path(_setting("OSLO_CONQUEST_MAP_CACHE", CACHE_DIR))
+    cache_file = cache_dir / f"{map_id}-{digest}.json"
+
+    compiled = _read_cache(cache_file)
+    if compiled is None:
+        try:
+            graph = json.loads(raw)["graph"]
+        except (ValueError, KeyError, TypeError) as exc:
+            raise MapError(f"{path}: no map graph ({exc})") from exc
+        try:
+            validate(graph)
+        except MapError as exc:
+            raise MapError(f"{path}: {exc}") from None
+        compiled = compile_graph(graph)
+        _write_cache(cache_file, compiled)
+    return GameMap(map_id, compiled)
+
+
+def _read_cache(cache_file: Path) -> dict | None:
+    try:
+        compiled = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+    return compiled if compiled.get("version") == _COMPILED_VERSION else None
+
+
+def _write_cache(cache_file: Path, compiled: dict) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(compiled))
+        os.replace(tmp, cache_file)
+    except OSError as exc:
+        print(f"[oslo-conquest] map cache write error: {exc}")
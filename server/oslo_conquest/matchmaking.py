@@ -0,0 +1,164 @@
+"""
+Matchmaking for Oslo Conquest: a queue that seats waiting players in new rooms.
+
+  Client → Server:
+    { "type": "find_game", "player": { "id": "p1", "name": "Ola" }, "maxPlayers": 2 }
+    { "type": "cancel_find" }
+  Server → Client:
+    { "type": "queued", "maxPlayers": 2, "depth": 1 }     depth = players waiting for that size
+    { "type": "matched", "room": "match-3f9c2a51d0e4" }   then game_state, as after join_game
+    { "type": "find_cancelled" }
+
+There is one queue per room size: an insertion-ordered dict of player id →
+Ticket, so joining, leaving and taking the oldest tickets are all O(1) however
+many players wait.  As soon as a queue holds a room's worth of tickets they are
+taken in arrival order and handed to the match handler, which allocates the
+room (the consumer registers it with set_match_handler; rooms live in this
+process, see rooms.py, so the waiting sockets do too and are seated directly).
+
+A queue whose oldest ticket has waited BOT_FILL_AFTER_S is matched as it is and
+the free seats go to bots.  Only the head of a queue can be that old, so one
+timer task per queue sleeps until the head's deadline.
+
+A ticket is cancel()led when its socket leaves the queue; one cancelled after
+it was taken for a match is dropped by the handler, which requeue()s the rest
+of the match ahead of everyone else, keeping their place and waiting time.
+
+Metrics: gauge oslo.matchmaking.depth, histogram oslo.matchmaking.wait_ms
+(time to match, per player), counters oslo.matchmaking.matches / bot_fills.
+"""
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from portal import metrics
+
+BOT_FILL_AFTER_S = 15.0
+
+
+class Ticket:
+    """One waiting player and how to seat its socket once matched.
+
+    *seat(room)* returns False if the socket is gone and was not seated.
+    """
+    __slots__ = ("player", "size", "queued_at", "seat", "cancelled")
+
+    def __init__(self, player: dict, size: int, seat: Callable[[str], Awaitable[bool]]) -> None:
+        self.player = player
+        self.size = size
+        self.queued_at = time.monotonic()
+        self.seat = seat
+        self.cancelled = False
+
+    @property
+    def player_id(self) -> str:
+        return str(self.player.get("id") or "")
+
+
+MatchHandler = Callable[[list[Ticket], int], Awaitable[None]]
+
+_queues: dict[int, dict[str, Ticket]] = {}    # room size → {player id: ticket}, oldest first
+_timers: dict[int, asyncio.Task] = {}
+_handler: MatchHandler | None = None
+
+
+def set_match_handler(handler: MatchHandler) -> None:
+    """*handler(tickets, size)* allocates a room for *tickets* and seats them; bots fill the rest."""
+    global _handler
+    _handler = handler
+
+
+def depth(size: int | None = None) -> int:
+    if size is not None:
+        return len(_queues.get(size, ()))
+    return sum(len(queue) for queue in _queues.values())
+
+
+def is_queued(player_id: str) -> bool:
+    return any(player_id in queue for queue in _queues.values())
+
+
+def join(ticket: Ticket) -> list[Ticket] | None:
+    """Queue *ticket*; returns a full room's worth of tickets (oldest first) if it completes one."""
+    queue = _queues.setdefault(ticket.size, {})
+    queue[ticket.player_id] = ticket
+    if len(queue) >= ticket.size:
+        return _take(ticket.size, ticket.size)
+    _schedule_bot_fill(ticket.size)
+    return None
+
+
+def leave(player_id: str, size: int) -> bool:
+    queue = _queues.get(size)
+    if queue is None or queue.pop(player_id, None) is None:
+        return False
+    if not queue:
+        del _queues[size]
+    return True
+
+
+def cancel(ticket: Ticket) -> bool:
+    """*ticket*'s socket left: take it out of its queue, or out of a match in progress."""
+    ticket.cancelled = True
+    return leave(ticket.player_id, ticket.size)
+
+
+def requeue(tickets: list[Ticket], size: int) -> list[Ticket] | None:
+    """Put *tickets* (taken for a match that fell through) back at the head of their queue.
+
+    Returns a full room's worth of tickets if the queue now has one, as join() does.
+    """
+    if not tickets:
+        return None
+    _queues[size] = {**{t.player_id: t for t in tickets}, **_queues.get(size, {})}
+    if len(_queues[size]) >= size:
+        return _take(size, size)
+    _schedule_bot_fill(size)
+    return None
+
+
+def _take(size: int, count: int) -> list[Ticket]:
+    queue = _queues[size]
+    tickets = [queue.pop(next(iter(queue))) for _ in range(min(count, len(queue)))]
+    if not queue:
+        del _queues[size]
+    now = time.monotonic()
+    for ticket in tickets:
+        metrics.observe("oslo.matchmaking.wait_ms", (now - ticket.queued_at) * 1000)
+    metrics.incr("oslo.matchmaking.matches")
+    return tickets
+
+
+async def match(tickets: list[Ticket], size: int) -> None:
+    """Hand *tickets* to the match handler; errors are logged, not raised."""
+    try:
+        await _handler(tickets, size)
+    except Exception as exc:
+        print(f"[oslo-conquest] matchmaking error: {exc}")
+
+
+# ── Bot fill ──────────────────────────────────────────────────────────────────
+
+def _schedule_bot_fill(size: int) -> None:
+    task = _timers.get(size)
+    if task is None or task.done():
+        _timers[size] = asyncio.get_running_loop().create_task(_bot_fill_later(size))
+
+
+async def _bot_fill_later(size: int) -> None:
+    try:
+        while _queues.get(size):
+            head = next(iter(_queues[size].values()))
+            wait = head.queued_at + BOT_FILL_AFTER_S - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            tickets = _take(size, size)
+            metrics.incr("oslo.matchmaking.bot_fills")
+            await match(tickets, size)
+    finally:
+        if _timers.get(size) is asyncio.current_task():
+            del _timers[size]
+
+
+metrics.gauge("oslo.matchmaking.depth", depth)
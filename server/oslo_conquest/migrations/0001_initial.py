@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGame',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room', models.CharField(max_length=255)),
+                ('winner', models.CharField(blank=True, max_length=32, null=True)),
+                ('players', models.JSONField(default=list)),
+                ('final_state', models.JSONField(default=dict)),
+                ('log', models.JSONField(default=list)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'oslo_conquest_archived_game',
+                'ordering': ['-archived_at'],
+            },
+        ),
+    ]
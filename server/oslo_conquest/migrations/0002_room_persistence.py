@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oslo_conquest', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room', models.CharField(max_length=255, unique=True)),
+                ('seq', models.IntegerField(default=0)),
+                ('state', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'oslo_conquest_room_snapshot',
+            },
+        ),
+        migrations.CreateModel(
+            name='RoomJournal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room', models.CharField(max_length=255)),
+                ('seq', models.IntegerField()),
+                ('action', models.JSONField()),
+            ],
+            options={
+                'db_table': 'oslo_conquest_room_journal',
+                'ordering': ['room', 'seq'],
+                'constraints': [models.UniqueConstraint(fields=('room', 'seq'), name='oslo_journal_room_seq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oslo_conquest', '0002_room_persistence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedgame',
+            name='replay',
+            field=models.JSONField(default=dict),
+        ),
+    ]
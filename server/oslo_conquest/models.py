@@ -0,0 +1,49 @@
+from django.db import models
+
+
+class ArchivedGame(models.Model):
+    """A finished Oslo Conquest game, written when its room is reaped from memory."""
+
+    room        = models.CharField(max_length=255)
+    winner      = models.CharField(max_length=32, null=True, blank=True)
+    players     = models.JSONField(default=list)
+    # Wire-shape state at the end of the game (territories, players, phase, ...), without the log
+    final_state = models.JSONField(default=dict)
+    log         = models.JSONField(default=list)   # newest first, at most LOG_CAPACITY entries
+    # Seed, players and every action (see replay.py); {} when the journal was incomplete
+    replay      = models.JSONField(default=dict)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "oslo_conquest_archived_game"
+        ordering = ["-archived_at"]
+
+    def __str__(self) -> str:
+        return f"{self.room} ({self.winner or 'uavgjort'})"
+
+
+class RoomSnapshot(models.Model):
+    """Latest compact snapshot of a live room; RoomJournal holds the actions after it."""
+
+    room       = models.CharField(max_length=255, unique=True)
+    seq        = models.IntegerField(default=0)    # last journal seq included in state
+    state      = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "oslo_conquest_room_snapshot"
+
+
+class RoomJournal(models.Model):
+    """One applied action (mvp.apply_action shape), replayed on top of the snapshot."""
+
+    room   = models.CharField(max_length=255)
+    seq    = models.IntegerField()
+    action = models.JSONField()
+
+    class Meta:
+        db_table = "oslo_conquest_room_journal"
+        ordering = ["room", "seq"]
+        constraints = [
+            models.UniqueConstraint(fields=["room", "seq"], name="oslo_journal_room_seq"),
+        ]
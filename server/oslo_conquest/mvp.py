@@ -1,30 +1,71 @@
 """Minimal server-authoritative rules for Oslo Conquest MVP."""
 
-import random
-
-from .board import ADJACENCY, CHECKPOINT_IDS, START_TERRITORIES, TERRITORY_IDS
+from . import maps, rng
+from .board_state import BoardState
+from .game_log import LOG_SNAPSHOT, GameLog
 from .bot import BOT_PLAYER_ID, BOT_PLAYER_NAME
 
-PLAYER_SIDES = ("red", "blue")
-CHECKPOINT_SEQUENCE = ("lysaker_cp", "kolbotn_cp", "lørenskog_cp")
-_CP_DISPLAY_NAMES = {"lysaker_cp": "Lysaker", "kolbotn_cp": "Kolbotn", "lørenskog_cp": "Lørenskog"}
-MAX_PLAYERS = len(PLAYER_SIDES)
-PLAYER_COLORS = {
-    "red": "#c0392b",
-    "blue": "#1a6b9a",
+# ── Sides ─────────────────────────────────────────────────────────────────────
+
+# Side registry: every side a room can seat, in seating (and turn) order.
+# Colours match the client's PLAYER_COLORS / PLAYER_COLOR_NAMES.
+SIDES = {
+    "red": {"color": "#c0392b", "colorName": "Rød"},
+    "blue": {"color": "#1a6b9a", "colorName": "Blå"},
+    "green": {"color": "#1a7a4a", "colorName": "Grønn"},
+    "orange": {"color": "#c0692b", "colorName": "Oransje"},
+    "purple": {"color": "#6b3fa0", "colorName": "Lilla"},
+    "cyan": {"color": "#1a8a8a", "colorName": "Cyan"},
 }
+PLAYER_SIDES = tuple(SIDES)
+PLAYER_COLORS = {side: info["color"] for side, info in SIDES.items()}
+MIN_PLAYERS = 2
+MAX_PLAYERS = len(PLAYER_SIDES)
+DEFAULT_MAX_PLAYERS = 2
 
+CHECKPOINT_SEQUENCE = maps.get().checkpoint_sequence   # default map; rooms use game_map()
+_CP_DISPLAY_NAMES = {"lysaker_cp": "Lysaker", "kolbotn_cp": "Kolbotn", "lørenskog_cp": "Lørenskog"}
 
-def create_waiting_room(room: str, player: dict) -> dict:
-    return {
+
+def seats(gmap: maps.GameMap) -> int:
+    """How many players *gmap* can seat: sides in order, as long as the map has a start territory for them."""
+    count = 0
+    for side in PLAYER_SIDES:
+        if side not in gmap.start_territories:
+            break
+        count += 1
+    return count
+
+
+def max_players(room_state: dict) -> int:
+    """Room size; rooms from before N-player rooms hold two."""
+    return room_state.get("maxPlayers") or DEFAULT_MAX_PLAYERS
+
+
+def create_waiting_room(room: str, player: dict, seed: int | None = None, map_id: str | None = None,
+                        size: int | None = None) -> dict:
+    """A room with one player.
+
+    *map_id* must name a known map (maps.exists); *size*, the number of
+    seats, must be between MIN_PLAYERS and seats() of that map (default
+    DEFAULT_MAX_PLAYERS), else ValueError.
+    """
+    gmap = maps.get(map_id)
+    size = size or DEFAULT_MAX_PLAYERS
+    if not MIN_PLAYERS <= size <= seats(gmap):
+        raise ValueError(f"room size {size} is not between {MIN_PLAYERS} and {seats(gmap)}")
+    room_state = {
         "room": room,
+        "map": gmap.map_id,
+        "maxPlayers": size,
         "phase": "waiting",
         "started": False,
         "activePlayer": None,
-        "players": [assign_player(player, "red")],
-        "territories": {},
-        "log": [log_entry("Venter på spiller 2")],
+        "players": [assign_player(player, PLAYER_SIDES[0])],
+        "log": _new_log("Venter på spiller 2"),
     }
+    rng.seed_room(room_state, seed)
+    return room_state
 
 
 def assign_player(player: dict, side: str) -> dict:
@@ -32,8 +73,8 @@ def assign_player(player: dict, side: str) -> dict:
         "id": str(player.get("id") or side),
         "name": str(player.get("name") or side.title()),
         "side": side,
-        "color": PLAYER_COLORS[side],
-        "colorName": "Rød" if side == "red" else "Blå",
+        "color": SIDES[side]["color"],
+        "colorName": SIDES[side]["colorName"],
         "isBot": bool(player.get("isBot", False)),
         "position": None,
         "diceRoll": None,
@@ -46,37 +87,87 @@ def assign_player(player: dict, side: str) -> dict:
     }
 
 
-def create_bot_room(room: str, human_player: dict) -> dict:
-    room_state = create_waiting_room(room, human_player)
+def create_bot_room(room: str, human_player: dict, seed: int | None = None, map_id: str | None = None,
+                    size: int | None = None) -> dict:
+    room_state = create_waiting_room(room, human_player, seed, map_id, size)
     bot_player = {"id": BOT_PLAYER_ID, "name": BOT_PLAYER_NAME, "isBot": True}
     room_state, _ = add_player(room_state, bot_player)
     return room_state
 
 
+def fill_with_bots(room_state: dict) -> dict:
+    """Seat bots in every free seat (which starts the game).  Bot ids are "bot-<side>"."""
+    while len(room_state["players"]) < max_players(room_state):
+        side = PLAYER_SIDES[len(room_state["players"])]
+        bot_player = {"id": f"bot-{side}", "name": f"{BOT_PLAYER_NAME} {SIDES[side]['colorName']}", "isBot": True}
+        room_state, _ = add_player(room_state, bot_player)
+    return room_state
+
+
 def add_player(room_state: dict, player: dict) -> tuple[dict, str | None]:
     existing = find_player_by_id(room_state, player.get("id"))
     if existing:
         return room_state, None
 
-    if len(room_state["players"]) >= len(PLAYER_SIDES):
+    size = max_players(room_state)
+    if len(room_state["players"]) >= size:
         return room_state, "Rommet er fullt"
 
     side = PLAYER_SIDES[len(room_state["players"])]
     room_state["players"].append(assign_player(player, side))
 
-    if len(room_state["players"]) == len(PLAYER_SIDES):
+    if len(room_state["players"]) == size:
         start_game(room_state)
+    else:
+        add_log(room_state, log_entry(f"Venter på spiller {len(room_state['players']) + 1}"))
 
     return room_state, None
 
 
+class _PlayerIndex:
+    """id → player, side → player and the turn order ring for one room's players list.
+
+    Kept in room_state["playerIndex"] (private, never sent or persisted) and
+    rebuilt when the list is replaced or grows, or when a player is eliminated
+    (forfeit drops the index); players never change id or side.
+
+    next_side maps each side still in the game to the side that plays after it,
+    in seating order, so passing the turn is one dict lookup however many
+    players the room has.  first_side starts every round of setup and play.
+    """
+    __slots__ = ("players", "size", "by_id", "by_side", "next_side", "first_side")
+
+    def __init__(self, players: list[dict]) -> None:
+        self.players = players
+        self.size = len(players)
+        self.by_id = {p.get("id"): p for p in players}
+        self.by_side = {p.get("side"): p for p in players}
+        ring = [p.get("side") for p in players if not p.get("eliminated")]
+        self.next_side = {side: ring[(i + 1) % len(ring)] for i, side in enumerate(ring)}
+        self.first_side = ring[0] if ring else None
+
+
+def _player_index(room_state: dict) -> _PlayerIndex:
+    players = room_state.get("players", [])
+    index = room_state.get("playerIndex")
+    if index is None or index.players is not players or index.size != len(players):
+        index = room_state["playerIndex"] = _PlayerIndex(players)
+    return index
+
+
+def next_side(room_state: dict, side: str | None) -> str | None:
+    """The side that plays after *side* (None if *side* is out of the game)."""
+    return _player_index(room_state).next_side.get(side)
+
+
 def find_player_by_id(room_state: dict, player_id: str | None) -> dict | None:
     if not player_id:
         return None
-    return next(
-        (p for p in room_state.get("players", []) if p.get("id") == player_id),
-        None,
-    )
+    return _player_index(room_state).by_id.get(player_id)
+
+
+def find_player_by_side(room_state: dict, side: str | None) -> dict | None:
+    return _player_index(room_state).by_side.get(side)
 
 
 def find_room_with_player(
@@ -88,6 +179,10 @@ def find_room_with_player(
     if not player_id:
         return None
 
+    room_of = getattr(rooms, "room_of", None)
+    if room_of is not None:
+        return room_of(player_id, exclude_room=exclude_room)
+
     for room_id, room_state in rooms.items():
         if room_id == exclude_room:
             continue
@@ -96,34 +191,41 @@ def find_room_with_player(
     return None
 
 
+def game_map(room_state: dict) -> maps.GameMap:
+    """The room's board graph (rooms from before maps existed play the default)."""
+    board = room_state.get("board")
+    return board.map if board is not None else maps.get(room_state.get("map"))
+
+
 def start_game(room_state: dict) -> dict:
-    territories = {}
-    for territory_id in TERRITORY_IDS:
-        if territory_id in CHECKPOINT_IDS:
-            territories[territory_id] = {"id": territory_id, "owner": None, "units": 0}
-        else:
-            territories[territory_id] = {"id": territory_id, "owner": None, "units": 1}
-
-    for side, territory_id in START_TERRITORIES.items():
-        territories[territory_id]["owner"] = side
-        territories[territory_id]["units"] = 3
-
-    for player in room_state.get("players", []):
+    gmap = game_map(room_state)
+    players = room_state.get("players", [])
+    board = BoardState(tuple(p["side"] for p in players), gmap)
+    for i, territory_id in enumerate(gmap.territory_ids):
+        board.units[i] = 0 if territory_id in gmap.checkpoint_set else 1
+
+    for side in board.sides:
+        i = gmap.territory_index[gmap.start_territories[side]]
+        board.set_owner(i, side)
+        board.units[i] = 3
+
+    for player in players:
         player["position"] = None
         player["diceRoll"] = None
         player["movesRemaining"] = 0
         player["validMoves"] = []
         player["setupConfirmed"] = False
 
+    room_state.pop("territories", None)
     room_state.update(
         {
             "phase": "setup",
             "started": True,
-            "activePlayer": "red",
-            "territories": territories,
-            "log": [log_entry("Spillet startet"), *room_state.get("log", [])],
+            "activePlayer": _player_index(room_state).first_side,
+            "board": board,
         }
     )
+    add_log(room_state, log_entry("Spillet startet"))
     return room_state
 
 
@@ -144,26 +246,16 @@ def end_turn(room_state: dict, player_id: str | None) -> tuple[dict, str | None]
             return room_state, "Velg startcheckpoint før du avslutter turen"
 
         player["setupConfirmed"] = True
-        next_side = _next_setup_side(room_state)
-        if next_side:
-            room_state["activePlayer"] = next_side
-            next_player = next(
-                p
-                for p in room_state["players"]
-                if p["side"] == room_state["activePlayer"]
-            )
-            room_state.setdefault("log", []).insert(
-                0,
-                log_entry(f"{next_player['name']} velger startcheckpoint"),
-            )
+        setup_side = _next_setup_side(room_state)
+        if setup_side:
+            room_state["activePlayer"] = setup_side
+            next_player = find_player_by_side(room_state, setup_side)
+            add_log(room_state, log_entry(f"{next_player['name']} velger startcheckpoint"))
             return room_state, None
 
         room_state["phase"] = "playing"
-        room_state["activePlayer"] = "red"
-        room_state.setdefault("log", []).insert(
-            0,
-            log_entry("Alle spillere har valgt startcheckpoint. Runde 1 starter."),
-        )
+        room_state["activePlayer"] = _player_index(room_state).first_side
+        add_log(room_state, log_entry("Alle spillere har valgt startcheckpoint. Runde 1 starter."))
         return room_state, None
 
     if room_state.get("phase") != "playing":
@@ -173,14 +265,9 @@ def end_turn(room_state: dict, player_id: str | None) -> tuple[dict, str | None]
     player["movesRemaining"] = 0
     player["validMoves"] = []
 
-    room_state["activePlayer"] = "blue" if active_side == "red" else "red"
-    next_player = next(
-        p for p in room_state["players"] if p["side"] == room_state["activePlayer"]
-    )
-    room_state.setdefault("log", []).insert(
-        0,
-        log_entry(f"{next_player['name']} sin tur"),
-    )
+    room_state["activePlayer"] = next_side(room_state, active_side)
+    next_player = find_player_by_side(room_state, room_state["activePlayer"])
+    add_log(room_state, log_entry(f"{next_player['name']} sin tur"))
     return room_state, None
 
 
@@ -204,17 +291,14 @@ def roll_dice(room_state: dict, player_id: str | None) -> tuple[dict, str | None
     if player.get("diceRoll") is not None:
         return room_state, "Du har allerede kastet denne turen"
 
-    dice_roll = random.randint(1, 6)
+    dice_roll = rng.randint(room_state, 1, 6)
     position = player.get("position")
 
     player["diceRoll"] = dice_roll
     player["movesRemaining"] = dice_roll
-    player["validMoves"] = _reachable_territories(position, dice_roll)
+    player["validMoves"] = list(game_map(room_state).reachable(position, dice_roll))
 
-    room_state.setdefault("log", []).insert(
-        0,
-        log_entry(f"{player['name']} kastet {dice_roll}"),
-    )
+    add_log(room_state, log_entry(f"{player['name']} kastet {dice_roll}"))
 
     return room_state, None
 
@@ -240,8 +324,9 @@ def choose_start_checkpoint(
     if player.get("setupConfirmed"):
         return room_state, "Startcheckpoint er allerede låst"
 
+    gmap = game_map(room_state)
     checkpoint_id = str(checkpoint_territory_id or "")
-    if checkpoint_id not in CHECKPOINT_IDS:
+    if checkpoint_id not in gmap.checkpoint_set:
         return room_state, "Ugyldig checkpoint"
 
     player["position"] = checkpoint_id
@@ -249,12 +334,8 @@ def choose_start_checkpoint(
     player["movesRemaining"] = 0
     player["validMoves"] = []
     player["setupConfirmed"] = False
-    idx = CHECKPOINT_SEQUENCE.index(checkpoint_id)
-    player["nextCheckpoint"] = CHECKPOINT_SEQUENCE[(idx + 1) % len(CHECKPOINT_SEQUENCE)]
-    room_state.setdefault("log", []).insert(
-        0,
-        log_entry(f"{player['name']} flyttet startbrikken til {checkpoint_id}"),
-    )
+    player["nextCheckpoint"] = _next_checkpoint(gmap, checkpoint_id)
+    add_log(room_state, log_entry(f"{player['name']} flyttet startbrikken til {checkpoint_id}"))
 
     return room_state, None
 
@@ -277,8 +358,9 @@ def move(
     if player.get("side") != room_state.get("activePlayer"):
         return room_state, "Det er ikke din tur"
 
+    gmap = game_map(room_state)
     destination = str(to_territory_id or "")
-    if destination not in TERRITORY_IDS:
+    if destination not in gmap.territory_set:
         return room_state, "Ugyldig territorium"
 
     if player.get("diceRoll") is None:
@@ -292,21 +374,14 @@ def move(
     player["movesRemaining"] = 0
     player["validMoves"] = []
 
-    room_state.setdefault("log", []).insert(
-        0,
-        log_entry(f"{player['name']} flyttet til {destination}"),
-    )
+    add_log(room_state, log_entry(f"{player['name']} flyttet til {destination}"))
 
-    if destination in CHECKPOINT_IDS and destination == player.get("nextCheckpoint"):
+    if destination in gmap.checkpoint_set and destination == player.get("nextCheckpoint"):
         player["money"] = player.get("money", 0) + 500
         player["units"] = player.get("units", 0) + 3
-        idx = CHECKPOINT_SEQUENCE.index(destination)
-        player["nextCheckpoint"] = CHECKPOINT_SEQUENCE[(idx + 1) % len(CHECKPOINT_SEQUENCE)]
+        player["nextCheckpoint"] = _next_checkpoint(gmap, destination)
         next_name = _CP_DISPLAY_NAMES.get(player["nextCheckpoint"], player["nextCheckpoint"])
-        room_state["log"].insert(
-            0,
-            log_entry(f"{player['name']} innkasserte checkpoint-bonus! Neste: {next_name}"),
-        )
+        add_log(room_state, log_entry(f"{player['name']} innkasserte checkpoint-bonus! Neste: {next_name}"))
 
     return room_state, None
 
@@ -333,48 +408,43 @@ def attack(
 
     from_id = str(from_territory_id or "")
     to_id = str(to_territory_id or "")
-    territories = room_state.get("territories") or {}
+    board = get_board(room_state)
+    gmap = game_map(room_state)
+    from_index = gmap.territory_index.get(from_id)
+    to_index = gmap.territory_index.get(to_id)
 
-    if from_id not in territories or to_id not in territories:
+    if board is None or from_index is None or to_index is None:
         return room_state, "Ugyldig territorium"
 
-    if from_id in CHECKPOINT_IDS or to_id in CHECKPOINT_IDS:
+    if from_id in gmap.checkpoint_set or to_id in gmap.checkpoint_set:
         return room_state, "Checkpoint kan ikke angripes"
 
-    if to_id not in ADJACENCY.get(from_id, []):
+    if to_id not in gmap.neighbors[from_id]:
         return room_state, "Territoriene er ikke naboer"
 
-    attacker = territories[from_id]
-    defender = territories[to_id]
     attacker_side = player["side"]
 
-    if attacker.get("owner") != attacker_side:
+    if board.owner(from_index) != attacker_side:
         return room_state, "Du eier ikke angrepsterritoriet"
 
-    if defender.get("owner") == attacker_side:
+    if board.owner(to_index) == attacker_side:
         return room_state, "Du kan ikke angripe eget territorium"
 
-    if int(attacker.get("units", 0)) < 2:
+    if board.units[from_index] < 2:
         return room_state, "Du trenger minst 2 units for å angripe"
 
-    attacker_units = int(attacker.get("units", 0))
-    defender_units = int(defender.get("units", 0))
+    attacker_units = board.units[from_index]
+    defender_units = board.units[to_index]
 
-    attacker["units"] = attacker_units - 1
+    board.units[from_index] = attacker_units - 1
 
     if attacker_units > defender_units:
-        defender["owner"] = attacker_side
-        defender["units"] = 1
-        room_state.setdefault("log", []).insert(
-            0,
-            log_entry(f"{player['name']} erobret {to_id}"),
-        )
-        _update_winner(room_state)
+        board.set_owner(to_index, attacker_side)
+        board.units[to_index] = 1
+        add_log(room_state, log_entry(f"{player['name']} erobret {to_id}"))
+        _update_winner(room_state, attacker_side)
     else:
-        room_state.setdefault("log", []).insert(
-            0,
-            log_entry(f"{player['name']} mislyktes i angrep på {to_id}"),
-        )
+        add_log(room_state, log_entry(f"{player['name']} mislyktes i angrep på {to_id}"))
 
     return room_state, None
 
@@ -390,78 +460,230 @@ def forfeit(room_state: dict, player_id: str | None) -> tuple[dict, str | None]:
     if not player:
         return room_state, "Ukjent spiller"
 
+    if player.get("eliminated"):
+        return room_state, "Du har allerede gitt opp"
+
     forfeiting_side = player.get("side")
-    winner_side = next(
-        (p.get("side") for p in room_state.get("players", []) if p.get("side") != forfeiting_side),
-        None,
-    )
-    if not winner_side:
+    remaining = [p for p in room_state.get("players", []) if not p.get("eliminated") and p is not player]
+    if not remaining:
         return room_state, "Ingen motstander funnet"
 
-    room_state["winner"] = winner_side
-    room_state["phase"] = "finished"
-    room_state.setdefault("log", []).insert(
-        0,
-        log_entry(f"{player['name']} ga opp"),
-    )
+    add_log(room_state, log_entry(f"{player['name']} ga opp"))
+    if len(remaining) == 1:
+        room_state["winner"] = remaining[0].get("side")
+        room_state["phase"] = "finished"
+        return room_state, None
+
+    # Three or more players: the rest play on and the turn ring closes over the gap.
+    following = next_side(room_state, forfeiting_side)
+    player["eliminated"] = True
+    player["diceRoll"] = None
+    player["movesRemaining"] = 0
+    player["validMoves"] = []
+    room_state.pop("playerIndex", None)
+    if room_state.get("activePlayer") == forfeiting_side:
+        room_state["activePlayer"] = following
+        next_player = find_player_by_side(room_state, following)
+        if room_state.get("phase") == "setup":
+            if not next_player.get("setupConfirmed"):
+                add_log(room_state, log_entry(f"{next_player['name']} velger startcheckpoint"))
+                return room_state, None
+            room_state["phase"] = "playing"
+            room_state["activePlayer"] = _player_index(room_state).first_side
+            next_player = find_player_by_side(room_state, room_state["activePlayer"])
+            add_log(room_state, log_entry("Alle spillere har valgt startcheckpoint. Runde 1 starter."))
+        add_log(room_state, log_entry(f"{next_player['name']} sin tur"))
 
     return room_state, None
 
 
-def _update_winner(room_state: dict) -> None:
-    territories = room_state.get("territories") or {}
-    total = len(territories)
-    if total <= 0:
+def _update_winner(room_state: dict, side: str) -> None:
+    """*side* wins once it holds 60 % of the board; only the conquering side can cross that line."""
+    board = get_board(room_state)
+    if board is None:
         return
 
-    side_counts = {
-        "red": 0,
-        "blue": 0,
-    }
-    for territory in territories.values():
-        owner = territory.get("owner")
-        if owner in side_counts:
-            side_counts[owner] += 1
-
-    win_threshold = int(total * 0.6 + 0.999999)
-    for side, count in side_counts.items():
-        if count >= win_threshold:
-            room_state["winner"] = side
-            break
+    win_threshold = int(len(board.map.territory_ids) * 0.6 + 0.999999)
+    if board.count(side) >= win_threshold:
+        room_state["winner"] = side
+        room_state["phase"] = "finished"
+
+
+# ── Actions ───────────────────────────────────────────────────────────────────
+
+ACTION_TYPES = ("choose_start_checkpoint", "roll_dice", "move", "attack", "end_turn", "forfeit")
+
+
+def action_from_message(data: dict, player_id: str | None = None) -> dict:
+    """Normalise a client message into an action dict (see apply_action)."""
+    action = {"type": data.get("type"), "playerId": str(data.get("playerId") or player_id or "")}
+    if action["type"] == "choose_start_checkpoint":
+        action["checkpointTerritoryId"] = data.get("checkpointTerritoryId") or data.get("checkpoint_id")
+    elif action["type"] == "move":
+        action["toTerritoryId"] = data.get("toTerritoryId") or data.get("to_id")
+    elif action["type"] == "attack":
+        action["fromTerritoryId"] = data.get("fromTerritoryId") or data.get("from_id")
+        action["toTerritoryId"] = data.get("toTerritoryId") or data.get("to_id")
+    return action
+
+
+def apply_action(room_state: dict, action: dict) -> tuple[dict, str | None]:
+    """Apply one action dict to *room_state*.
+
+    Dice come from the room's own RNG (rng.py), so replaying the same actions
+    on the same snapshot reproduces the game.
+    """
+    kind = action.get("type")
+    player_id = action.get("playerId")
+    if kind == "choose_start_checkpoint":
+        return choose_start_checkpoint(room_state, player_id, action.get("checkpointTerritoryId"))
+    if kind == "roll_dice":
+        return roll_dice(room_state, player_id)
+    if kind == "move":
+        return move(room_state, player_id, action.get("toTerritoryId"))
+    if kind == "attack":
+        return attack(room_state, player_id, action.get("fromTerritoryId"), action.get("toTerritoryId"))
+    if kind == "end_turn":
+        return end_turn(room_state, player_id)
+    if kind == "forfeit":
+        return forfeit(room_state, player_id)
+    return room_state, "Ukjent handling"
+
+
+# ── Legal actions ─────────────────────────────────────────────────────────────
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def legal_attacks(room_state: dict, side: str) -> list[tuple[str, str]]:
+    """(from, to) pairs *side* may attack right now, from the board's ownership bitsets."""
+    board = get_board(room_state)
+    if board is None or side not in board.sides:
+        return []
+    gmap = board.map
+    ids = gmap.territory_ids
+    own = board.mask(side)
+    closed = own | gmap.checkpoint_bits
+    attacks = []
+    for i in _bits(own & ~gmap.checkpoint_bits):
+        if board.units[i] >= 2:
+            attacks += [(ids[i], ids[j]) for j in _bits(gmap.neighbor_bits[i] & ~closed)]
+    return attacks
+
+
+def legal_summary(room_state: dict) -> dict | None:
+    """What the active player may do right now, in wire form ("legalActions").
+
+    None when nobody is to move.  Any player may forfeit at any time; "forfeit"
+    here is for the active player.
+    """
+    if not room_state.get("started") or room_state.get("winner"):
+        return None
+    phase = room_state.get("phase")
+    side = room_state.get("activePlayer")
+    player = find_player_by_side(room_state, side)
+    if player is None or phase not in ("setup", "playing"):
+        return None
 
+    summary = {
+        "side": side,
+        "checkpoints": [],
+        "rollDice": False,
+        "moves": [],
+        "attacks": [],
+        "endTurn": False,
+        "forfeit": len(room_state.get("players", [])) > 1,
+    }
+    if phase == "setup":
+        if not player.get("setupConfirmed"):
+            summary["checkpoints"] = list(game_map(room_state).checkpoint_ids)
+        summary["endTurn"] = player.get("position") is not None
+        return summary
 
-def _reachable_territories(start_id: str | None, max_steps: int) -> list[str]:
-    if not start_id or max_steps <= 0:
-        return []
+    if player.get("diceRoll") is None:
+        summary["rollDice"] = player.get("position") is not None
+    else:
+        summary["moves"] = list(player.get("validMoves") or [])
+    summary["attacks"] = [list(pair) for pair in legal_attacks(room_state, side)]
+    summary["endTurn"] = True
+    return summary
 
-    visited: dict[str, int] = {start_id: 0}
-    queue: list[str] = [start_id]
 
-    while queue:
-        node = queue.pop(0)
-        depth = visited[node]
-        if depth >= max_steps:
-            continue
+def legal_actions(room_state: dict) -> list[dict]:
+    """Every legal action for the active player, as apply_action dicts."""
+    summary = legal_summary(room_state)
+    if summary is None:
+        return []
+    player_id = find_player_by_side(room_state, summary["side"])["id"]
+    actions = [{"type": "choose_start_checkpoint", "playerId": player_id, "checkpointTerritoryId": cp}
+               for cp in summary["checkpoints"]]
+    if summary["rollDice"]:
+        actions.append({"type": "roll_dice", "playerId": player_id})
+    actions += [{"type": "move", "playerId": player_id, "toTerritoryId": tid} for tid in summary["moves"]]
+    actions += [{"type": "attack", "playerId": player_id, "fromTerritoryId": a, "toTerritoryId": b}
+                for a, b in summary["attacks"]]
+    if summary["endTurn"]:
+        actions.append({"type": "end_turn", "playerId": player_id})
+    if summary["forfeit"]:
+        actions.append({"type": "forfeit", "playerId": player_id})
+    return actions
+
+
+def get_board(room_state: dict) -> BoardState | None:
+    """The room's compact board, converting a legacy "territories" dict on first use."""
+    board = room_state.get("board")
+    if board is None and room_state.get("territories"):
+        sides = tuple(p["side"] for p in room_state.get("players", [])) or PLAYER_SIDES
+        board = BoardState.from_territories(room_state.pop("territories"), sides, game_map(room_state))
+        room_state["board"] = board
+    return board
+
+
+# Room keys never sent to clients: compact internals and the RNG (it predicts every roll).
+_PRIVATE_KEYS = ("board", "log", "seed", "rng", "playerIndex")
+
+
+def public_state(room_state: dict, log_since: int | None = None) -> dict:
+    """Room state in its wire shape.
+
+    The compact board is expanded to "territories".  "log" holds the newest
+    LOG_SNAPSHOT entries, or — when *log_since* is given — only entries newer
+    than that seq, flagged with "logSince" so clients append instead of replace.
+    "legalActions" is legal_summary(), so clients need not guess what is allowed.
+    """
+    board = get_board(room_state)
+    log = get_log(room_state)
+    state = {k: v for k, v in room_state.items() if k not in _PRIVATE_KEYS}
+    state["territories"] = board.to_territories() if board is not None else {}
+    if log_since is None:
+        state["log"] = log.recent(LOG_SNAPSHOT)
+    else:
+        state["log"] = log.since(log_since)
+        state["logSince"] = log_since
+    state["logSeq"] = log.last_seq
+    state["legalActions"] = legal_summary(room_state)
+    return state
 
-        for neighbor in ADJACENCY.get(node, []):
-            if neighbor not in TERRITORY_IDS:
-                continue
-            if neighbor in visited and visited[neighbor] <= depth + 1:
-                continue
-            visited[neighbor] = depth + 1
-            queue.append(neighbor)
 
-    return sorted([territory_id for territory_id, dist in visited.items() if dist > 0])
+def _next_checkpoint(gmap: maps.GameMap, checkpoint_id: str) -> str:
+    sequence = gmap.checkpoint_sequence
+    return sequence[(sequence.index(checkpoint_id) + 1) % len(sequence)]
 
 
 def _next_setup_side(room_state: dict) -> str | None:
-    for side in PLAYER_SIDES:
-        player = next(
-            (item for item in room_state.get("players", []) if item.get("side") == side),
-            None,
-        )
-        if player and not player.get("setupConfirmed"):
-            return side
+    """The next side to choose a start checkpoint, or None once everyone has.
+
+    Setup runs once round the turn ring from first_side, so the first confirmed
+    side after the active one means the round is over.
+    """
+    side = next_side(room_state, room_state.get("activePlayer"))
+    player = find_player_by_side(room_state, side)
+    if player and not player.get("setupConfirmed"):
+        return side
     return None
 
 
@@ -469,25 +691,47 @@ def log_entry(message: str) -> dict:
     return {"msg": message, "type": "important", "time": ""}
 
 
+def get_log(room_state: dict) -> GameLog:
+    """The room's bounded log, converting a legacy list log on first use."""
+    log = room_state.get("log")
+    if not isinstance(log, GameLog):
+        log = GameLog.from_entries(log or [])
+        room_state["log"] = log
+    return log
+
+
+def add_log(room_state: dict, entry: dict) -> None:
+    get_log(room_state).append(entry)
+
+
+def _new_log(message: str) -> GameLog:
+    log = GameLog()
+    log.append(log_entry(message))
+    return log
+
+
 def summarize_rooms(rooms: dict[str, dict]) -> list[dict]:
-    summaries = []
-    for room_id, room_state in sorted(rooms.items()):
-        players = room_state.get("players", [])
-        started = bool(room_state.get("started"))
-        player_ids = [str(p.get("id", "")) for p in players]
-        summaries.append(
-            {
-                "room": room_id,
-                "playerCount": len(players),
-                "maxPlayers": MAX_PLAYERS,
-                "started": started,
-                "phase": room_state.get("phase", "waiting"),
-                "status": (
-                    "started" if started or len(players) >= MAX_PLAYERS else "waiting"
-                ),
-                "ownerId": player_ids[0] if player_ids else None,
-                "playerIds": player_ids,
-                "players": [p.get("name", "Ukjent") for p in players],
-            }
-        )
-    return summaries
+    summaries = getattr(rooms, "summaries", None)
+    if summaries is not None:
+        return summaries()
+    return [summarize_room(room_id, room_state) for room_id, room_state in sorted(rooms.items())]
+
+
+def summarize_room(room_id: str, room_state: dict) -> dict:
+    players = room_state.get("players", [])
+    started = bool(room_state.get("started"))
+    size = max_players(room_state)
+    player_ids = [str(p.get("id", "")) for p in players]
+    return {
+        "room": room_id,
+        "playerCount": len(players),
+        "maxPlayers": size,
+        "started": started,
+        "phase": room_state.get("phase", "waiting"),
+        "status": (
+            "started" if started or len(players) >= size else "waiting"
+        ),
+        "ownerId": player_ids[0] if player_ids else None,
+        "playerIds": player_ids,
+        "players": [p.get("name", "Ukjent") for p in players],
+    }
@@ -0,0 +1,254 @@
+"""
+Durable room state for Oslo Conquest: compact snapshots plus an action journal.
+
+The consumer calls, on the event loop and without touching the DB:
+
+  start(room)                 a new game is created under *room* — drop what an
+                              earlier game of the same name stored
+  snapshot(room, state)       after create/join — the full room in compact form
+  record(room, state, action) after every applied action — one journal entry,
+                              plus a snapshot every SNAPSHOT_EVERY actions
+  forget(room)                room reaped for good — drop what is stored
+
+The journal keeps every action of the game (a snapshot does not truncate it),
+so history(room) can hand the whole game to the archive for replays.
+
+These only queue work.  A daemon writer thread flushes the queue every
+FLUSH_INTERVAL_S in one transaction (write-behind), so a burst of actions costs
+one round trip.  A crash loses at most that interval.  Each room is written in
+its own savepoint, so one room that fails doesn't drop the others' writes; its
+entry goes back on the queue and is retried on the next flush.
+
+Nothing is loaded at startup.  load(room) — called when a player sends
+rejoin_game for a room that is not in memory — reads the snapshot, replays the
+journal after it with mvp.apply_action and returns the room.
+"""
+import copy
+import threading
+import time
+
+from django.db import transaction
+
+from portal import metrics
+
+from .board_state import BoardState
+from .game_log import GameLog
+from .mvp import apply_action, get_board, get_log
+
+SNAPSHOT_EVERY = 50
+FLUSH_INTERVAL_S = 1.0
+
+# Tests turn this off and call flush() themselves.
+WRITE_BEHIND = True
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_pending: dict[str, dict] = {}     # room → {"delete": bool, "snapshot": (seq, state) | None, "journal": [...]}
+_seq: dict[str, int] = {}          # room → last journal seq
+_since_snapshot: dict[str, int] = {}
+_writer: threading.Thread | None = None
+
+
+# ── Encoding ──────────────────────────────────────────────────────────────────
+
+def encode_room(room_state: dict) -> dict:
+    """Compact JSON form: board as hex owners + unit list, log oldest first.
+
+    Players are deep-copied — the room keeps mutating after this returns.
+    """
+    board = get_board(room_state)
+    log = get_log(room_state)
+    data = copy.deepcopy({k: v for k, v in room_state.items() if k not in ("board", "log", "territories", "playerIndex")})
+    if board is not None:
+        data["board"] = board.to_compact()
+    data["log"] = list(log)[::-1]
+    data["logSeq"] = log.last_seq
+    return data
+
+
+def decode_room(data: dict) -> dict:
+    room_state = {k: v for k, v in data.items() if k not in ("board", "log", "logSeq")}
+    if "board" in data:
+        room_state["board"] = BoardState.from_compact(data["board"])
+    room_state["log"] = GameLog.restore(data.get("log", []), data.get("logSeq", 0))
+    return room_state
+
+
+# ── Hot path (queue only) ─────────────────────────────────────────────────────
+
+def _entry(room: str) -> dict:
+    return _pending.setdefault(room, {"delete": False, "snapshot": None, "journal": []})
+
+
+def snapshot(room: str, room_state: dict) -> None:
+    data = encode_room(room_state)
+    with _lock:
+        seq = _seq.get(room, 0)
+        _entry(room)["snapshot"] = (seq, data)
+        _since_snapshot[room] = 0
+    _ensure_writer()
+
+
+def record(room: str, room_state: dict, action: dict) -> None:
+    with _lock:
+        seq = _seq[room] = _seq.get(room, 0) + 1
+        _entry(room)["journal"].append((seq, dict(action)))
+        count = _since_snapshot.get(room)
+        due = count is None or count + 1 >= SNAPSHOT_EVERY
+        if not due:
+            _since_snapshot[room] = count + 1
+    if due:
+        # No base snapshot in this process yet, or time for a new one.
+        snapshot(room, room_state)
+    else:
+        _ensure_writer()
+
+
+def start(room: str) -> None:
+    """A new game in *room*: its journal restarts at seq 1 over an empty table.
+
+    Room names are reused (after a reap, or a restart), and the rows of the old
+    game would otherwise collide with the new journal or be replayed onto it.
+    """
+    forget(room)
+
+
+def forget(room: str) -> None:
+    with _lock:
+        _pending[room] = {"delete": True, "snapshot": None, "journal": []}
+        _seq.pop(room, None)
+        _since_snapshot.pop(room, None)
+    _ensure_writer()
+
+
+# ── Writer ────────────────────────────────────────────────────────────────────
+
+def _ensure_writer() -> None:
+    global _writer
+    if not WRITE_BEHIND:
+        return
+    with _lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="oslo-persist", daemon=True)
+            _writer.start()
+
+
+def _writer_loop() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL_S)
+        flush()
+
+
+def flush() -> int:
+    """Write everything queued so far. Returns the number of rooms written."""
+    # One flush at a time, so a caller that flushes before reading sees every
+    # entry queued before it, not just the ones the writer thread left over.
+    with _flush_lock:
+        return _flush()
+
+
+def _flush() -> int:
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+    if not batch:
+        return 0
+
+    start = time.perf_counter()
+    failed = []
+    try:
+        with transaction.atomic():
+            for room, entry in batch.items():
+                try:
+                    with transaction.atomic():
+                        _write_room(room, entry)
+                except Exception as exc:
+                    print(f"[oslo-conquest] persist error in {room}: {exc}")
+                    failed.append(room)
+    except Exception as exc:
+        print(f"[oslo-conquest] persist error: {exc}")
+        failed = list(batch)
+
+    if failed:
+        with _lock:
+            for room in failed:
+                _requeue(room, batch[room])
+        metrics.incr("oslo.persist.errors", len(failed))
+        if len(failed) == len(batch):
+            return 0
+    metrics.incr("oslo.persist.flushes")
+    metrics.observe("oslo.persist.flush_ms", (time.perf_counter() - start) * 1000)
+    return len(batch) - len(failed)
+
+
+def _requeue(room: str, entry: dict) -> None:
+    """Put a failed write back in front of what was queued for *room* since. Holds _lock."""
+    newer = _pending.get(room)
+    if newer is None:
+        _pending[room] = entry
+    elif not newer["delete"]:         # a newer delete (forget/start) supersedes the failed write
+        _pending[room] = {
+            "delete": entry["delete"],
+            "snapshot": newer["snapshot"] or entry["snapshot"],
+            "journal": entry["journal"] + newer["journal"],
+        }
+
+
+def _write_room(room: str, entry: dict) -> None:
+    from .models import RoomJournal, RoomSnapshot
+
+    if entry["delete"]:
+        RoomSnapshot.objects.filter(room=room).delete()
+        RoomJournal.objects.filter(room=room).delete()
+    if entry["snapshot"] is not None:
+        seq, data = entry["snapshot"]
+        RoomSnapshot.objects.update_or_create(room=room, defaults={"seq": seq, "state": data})
+    RoomJournal.objects.bulk_create(
+        RoomJournal(room=room, seq=seq, action=action) for seq, action in entry["journal"]
+    )
+
+
+# ── Restore ───────────────────────────────────────────────────────────────────
+
+def history(room: str) -> list[dict] | None:
+    """Every journaled action of *room* in order, or None if the journal has gaps.
+
+    Flushes first, so actions still queued are included.  Blocking (DB).
+    """
+    from .models import RoomJournal
+
+    flush()
+    actions = []
+    for seq, action in RoomJournal.objects.filter(room=room).order_by("seq").values_list("seq", "action"):
+        if seq != len(actions) + 1:
+            return None
+        actions.append(action)
+    return actions
+
+
+def load(room: str) -> dict | None:
+    """The stored room with its journal replayed, or None. Blocking (DB)."""
+    from .models import RoomJournal, RoomSnapshot
+
+    row = RoomSnapshot.objects.filter(room=room).values("seq", "state").first()
+    if row is None:
+        return None
+    room_state = decode_room(row["state"])
+    seq = row["seq"]
+    replayed = True
+    for entry in RoomJournal.objects.filter(room=room, seq__gt=seq).order_by("seq").values("seq", "action"):
+        room_state, error = apply_action(room_state, entry["action"])
+        if error:
+            print(f"[oslo-conquest] replay error in {room} at seq {entry['seq']}: {error}")
+            replayed = False
+            break
+        seq = entry["seq"]
+
+    with _lock:
+        _seq[room] = seq
+        if replayed:
+            _since_snapshot[room] = seq - row["seq"]
+        else:
+            _since_snapshot.pop(room, None)   # next record() rewrites the snapshot
+    metrics.incr("oslo.persist.restored")
+    return room_state
@@ -0,0 +1,81 @@
+"""
+Replays of finished Oslo Conquest games.
+
+A game is reproducible from its seed, its players and the actions applied to it
+(dice come from the room RNG, see rng.py).  When a finished room is archived,
+lifecycle.archive() stores that as ArchivedGame.replay:
+
+  { "room": "oslo-1", "map": "oslo", "maxPlayers": 2, "seed": 1234, "players": [{"id", "name", "isBot"}, ...],
+    "actions": [ ...every action from the journal, in order... ] }
+
+states() rebuilds the game step by step; the consumer streams it to a client
+(see consumers.py, "replay") at the speed the client asks for.
+"""
+from collections.abc import Iterator
+
+from .mvp import add_player, apply_action, create_waiting_room, max_players
+
+REPLAY_STEP_S = 0.5          # seconds between actions at speed 1
+MIN_SPEED, MAX_SPEED = 0.25, 20.0
+
+
+def record(room_state: dict, actions: list[dict]) -> dict:
+    """Replay data for ArchivedGame.replay."""
+    return {
+        "room": room_state.get("room", ""),
+        "map": room_state.get("map"),
+        "maxPlayers": max_players(room_state),
+        "seed": room_state.get("seed"),
+        "players": [
+            {"id": p.get("id"), "name": p.get("name"), "isBot": bool(p.get("isBot"))}
+            for p in room_state.get("players", [])
+        ],
+        "actions": actions,
+    }
+
+
+def initial_state(replay: dict) -> dict:
+    """The room as it was when the last player joined (journal seq 0)."""
+    players = replay["players"]
+    room_state = create_waiting_room(replay["room"], players[0], seed=replay["seed"], map_id=replay.get("map"),
+                                     size=replay.get("maxPlayers") or len(players))
+    for player in players[1:]:
+        room_state, _ = add_player(room_state, player)
+    return room_state
+
+
+def states(replay: dict) -> Iterator[tuple[int, dict]]:
+    """(step, room_state) from the start to the end of the game.
+
+    The same room_state is mutated and yielded at every step.  Raises
+    ValueError if an action no longer applies.
+    """
+    room_state = initial_state(replay)
+    yield 0, room_state
+    for step, action in enumerate(replay["actions"], start=1):
+        room_state, error = apply_action(room_state, action)
+        if error:
+            raise ValueError(f"steg {step}: {error}")
+        yield step, room_state
+
+
+def clamp_speed(speed) -> float:
+    try:
+        speed = float(speed)
+    except (TypeError, ValueError):
+        return 1.0
+    if speed != speed:   # NaN
+        return 1.0
+    return min(MAX_SPEED, max(MIN_SPEED, speed))
+
+
+def load(game_id) -> dict | None:
+    """ArchivedGame.replay for *game_id*, or None if missing or not replayable."""
+    from .models import ArchivedGame
+
+    try:
+        game_id = int(game_id)
+    except (TypeError, ValueError):
+        return None
+    data = ArchivedGame.objects.filter(pk=game_id).values_list("replay", flat=True).first()
+    return data or None
@@ -0,0 +1,75 @@
+"""Per-room deterministic RNG for Oslo Conquest.
+
+Each room carries its own generator as two plain ints in its state:
+
+  room_state["seed"]  the seed the room was created with
+  room_state["rng"]   current generator state (splitmix64)
+
+Being ints, they are persisted with the snapshot and need no locking: a game is
+reproducible from its seed plus the action journal, and rooms never share
+random state.  Both keys are private — public_state() leaves them out, since
+they predict every future roll.
+
+mvp draws with randint()/choice(), which advance the room's state.  The bot
+uses peek_choice(), which derives its pick from the current state without
+advancing it, so bot decisions never shift the dice of a replayed game.
+"""
+import secrets
+
+_MASK = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_BOT_STREAM = 0x5851F42D4C957F2D
+
+
+def new_seed() -> int:
+    return secrets.randbits(64)
+
+
+def seed_room(room_state: dict, seed: int | None = None) -> None:
+    seed = new_seed() if seed is None else seed & _MASK
+    room_state["seed"] = seed
+    room_state["rng"] = seed
+
+
+def _mix(z: int) -> int:
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def _next(room_state: dict) -> int:
+    if "rng" not in room_state:
+        seed_room(room_state)
+    state = (room_state["rng"] + _GAMMA) & _MASK
+    room_state["rng"] = state
+    return _mix(state)
+
+
+def _below(draw, n: int) -> int:
+    """Unbiased integer in [0, n) from 64-bit draws (rejection sampling)."""
+    limit = (1 << 64) - (1 << 64) % n
+    while True:
+        value = draw()
+        if value < limit:
+            return value % n
+
+
+def randint(room_state: dict, a: int, b: int) -> int:
+    return a + _below(lambda: _next(room_state), b - a + 1)
+
+
+def choice(room_state: dict, items):
+    return items[_below(lambda: _next(room_state), len(items))]
+
+
+def peek_choice(room_state: dict, items):
+    """A choice derived from the room's state without advancing it."""
+    if "rng" not in room_state:
+        seed_room(room_state)
+    counter = [room_state["rng"] ^ _BOT_STREAM]
+
+    def draw() -> int:
+        counter[0] = (counter[0] + _GAMMA) & _MASK
+        return _mix(counter[0])
+
+    return items[_below(draw, len(items))]
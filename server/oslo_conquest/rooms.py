@@ -0,0 +1,159 @@
+"""Room registry for Oslo Conquest.
+
+RoomRegistry owns every live room and keeps two indexes next to them:
+
+  player id → room id   so find_room_with_player() is a dict lookup
+  room id   → summary   the lobby entry, rebuilt only when that room is stored
+
+It behaves like the plain { room_id: room_state } dict it replaces.  mvp
+functions still mutate room dicts in place, so callers store the room back
+(registry[room] = state, as the consumer already does after every action) to
+refresh its indexes.  Bots are not indexed: every bot room shares BOT_PLAYER_ID.
+
+Rooms whose summary changed since the last pop_changes() call are tracked, so
+the lobby can be sent just those (room_added / room_updated / room_removed).
+
+For reaping (lifecycle.py) it also records when each room was last stored or
+joined/left, and how many sockets are in each room.
+"""
+import time
+from collections.abc import MutableMapping
+
+from .mvp import summarize_room
+
+
+class RoomRegistry(MutableMapping):
+
+    def __init__(self) -> None:
+        self._rooms: dict[str, dict] = {}
+        self._player_room: dict[str, str] = {}
+        self._room_players: dict[str, tuple[str, ...]] = {}
+        self._summaries: dict[str, dict] = {}
+        self._sorted: list[dict] | None = None
+        self._changed: set[str] = set()
+        self._removed: set[str] = set()
+        self._published: set[str] = set()   # rooms the lobby has been told about
+        self._last_active: dict[str, float] = {}   # room id → time.monotonic()
+        self._members: dict[str, int] = {}         # room id → connected sockets
+
+    # ── Mapping protocol ──────────────────────────────────────────────────────
+
+    def __getitem__(self, room_id: str) -> dict:
+        return self._rooms[room_id]
+
+    def __setitem__(self, room_id: str, room_state: dict) -> None:
+        self._rooms[room_id] = room_state
+        self._removed.discard(room_id)
+        self.touch(room_id)
+
+    def __delitem__(self, room_id: str) -> None:
+        del self._rooms[room_id]
+        self._index_players(room_id, ())
+        del self._summaries[room_id]
+        del self._last_active[room_id]
+        self._members.pop(room_id, None)
+        self._sorted = None
+        self._changed.discard(room_id)
+        self._removed.add(room_id)
+
+    def __iter__(self):
+        return iter(self._rooms)
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def __contains__(self, room_id) -> bool:
+        return room_id in self._rooms
+
+    def clear(self) -> None:
+        self._removed.update(self._rooms)
+        self._rooms.clear()
+        self._player_room.clear()
+        self._room_players.clear()
+        self._summaries.clear()
+        self._last_active.clear()
+        self._members.clear()
+        self._sorted = None
+        self._changed.clear()
+
+    # ── Indexes ───────────────────────────────────────────────────────────────
+
+    def touch(self, room_id: str) -> None:
+        """Refresh the player index and lobby summary of a room mutated in place."""
+        room_state = self._rooms[room_id]
+        self._last_active[room_id] = time.monotonic()
+        self._index_players(room_id, tuple(
+            str(p.get("id")) for p in room_state.get("players", [])
+            if p.get("id") and not p.get("isBot")
+        ))
+        summary = summarize_room(room_id, room_state)
+        if self._summaries.get(room_id) != summary:
+            self._summaries[room_id] = summary
+            self._sorted = None
+            self._changed.add(room_id)
+
+    def _index_players(self, room_id: str, player_ids: tuple[str, ...]) -> None:
+        previous = self._room_players.get(room_id, ())
+        if previous == player_ids:
+            return
+        for player_id in previous:
+            if self._player_room.get(player_id) == room_id:
+                del self._player_room[player_id]
+        for player_id in player_ids:
+            self._player_room[player_id] = room_id
+        if player_ids:
+            self._room_players[room_id] = player_ids
+        else:
+            self._room_players.pop(room_id, None)
+
+    def room_of(self, player_id: str | None, *, exclude_room: str | None = None) -> str | None:
+        """The room *player_id* is in (ignoring *exclude_room*), or None."""
+        room_id = self._player_room.get(player_id) if player_id else None
+        return None if room_id == exclude_room else room_id
+
+    def summary(self, room_id: str) -> dict | None:
+        return self._summaries.get(room_id)
+
+    def summaries(self) -> list[dict]:
+        """Lobby summaries of every room, sorted by room id (cached between changes)."""
+        if self._sorted is None:
+            self._sorted = [self._summaries[room_id] for room_id in sorted(self._summaries)]
+        return self._sorted
+
+    # ── Activity ──────────────────────────────────────────────────────────────
+
+    def add_member(self, room_id: str, delta: int) -> None:
+        """A socket joined (+1) or left (-1) *room_id*; counts as activity."""
+        count = self._members.get(room_id, 0) + delta
+        if count > 0:
+            self._members[room_id] = count
+        else:
+            self._members.pop(room_id, None)
+        if room_id in self._rooms:
+            self._last_active[room_id] = time.monotonic()
+
+    def members(self, room_id: str) -> int:
+        return self._members.get(room_id, 0)
+
+    def idle_for(self, room_id: str, now: float | None = None) -> float:
+        """Seconds since *room_id* was last stored, joined or left."""
+        return (time.monotonic() if now is None else now) - self._last_active[room_id]
+
+    def pop_changes(self) -> tuple[list[dict], list[dict], list[str]]:
+        """(added, updated, removed) since the previous call.
+
+        added/updated are summaries; a room created and removed between two
+        calls is not reported at all.
+        """
+        added, updated = [], []
+        for room_id in sorted(self._changed):
+            (updated if room_id in self._published else added).append(self._summaries[room_id])
+            self._published.add(room_id)
+        removed = sorted(self._removed & self._published)
+        self._published.difference_update(removed)
+        self._changed.clear()
+        self._removed.clear()
+        return added, updated, removed
+
+    def has_changes(self) -> bool:
+        return bool(self._changed or self._removed)
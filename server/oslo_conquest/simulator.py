@@ -0,0 +1,211 @@
+"""
+Headless Oslo Conquest simulator — rules-engine benchmark and balance tool.
+
+Plays complete games by calling mvp directly (no consumer, channel layer or
+Django), with a policy for each side, across a process pool:
+
+    python -m oslo_conquest.simulator --games 2000 --workers 4
+    python -m oslo_conquest.simulator --red greedy --blue random --seed 1
+
+Game i uses seed + i for the room RNG and the policies, so any run (and any
+single game from it) is reproducible.  A game that has no winner after
+MAX_TURNS turns counts as a draw.
+
+Reports games/sec, per-action latency percentiles (µs), win rates and, for
+draws, which side held more territory at the turn limit.
+"""
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from . import bot_search
+from .bot import BOT_PLAYER_ID
+from .bot_search import sure_attacks
+from .mvp import (
+    attack,
+    choose_start_checkpoint,
+    create_bot_room,
+    end_turn,
+    find_player_by_side,
+    game_map,
+    get_board,
+    legal_attacks,
+    move,
+    roll_dice,
+)
+
+MAX_TURNS = 200
+SEARCH_BUDGET_S = 0.005     # per attack decision for the "search" policy
+RED_PLAYER = {"id": "sim-red", "name": "Rød"}
+
+
+# ── Policies ──────────────────────────────────────────────────────────────────
+#
+# A policy gets (room_state, side, rnd) and returns the next (from, to) attack,
+# or None to end the attack phase; rnd is the game's own random.Random.  Moves
+# are a random pick from validMoves for every policy.
+
+def _winning_attack(room_state: dict, side: str, rnd: random.Random) -> tuple[str, str] | None:
+    options = sure_attacks(room_state, side)
+    return rnd.choice(options) if options else None
+
+
+def _random_attack(room_state: dict, side: str, rnd: random.Random) -> tuple[str, str] | None:
+    options = legal_attacks(room_state, side)
+    return rnd.choice(options) if options and rnd.random() < 0.5 else None
+
+
+def _no_attack(room_state: dict, side: str, rnd: random.Random) -> None:
+    return None
+
+
+def _search_attack(room_state: dict, side: str, rnd: random.Random) -> tuple[str, str] | None:
+    player_id = find_player_by_side(room_state, side)["id"]
+    option, _ = bot_search.best_attack(room_state, player_id, SEARCH_BUDGET_S, rnd.getrandbits(64))
+    return option
+
+
+POLICIES = {
+    "greedy": _winning_attack,   # only attacks it is sure to win
+    "random": _random_attack,    # coin flip, any legal attack
+    "passive": _no_attack,       # moves but never attacks
+    "search": _search_attack,    # bot_search's Monte Carlo attack choice
+}
+
+
+# ── One game ──────────────────────────────────────────────────────────────────
+
+def play_game(seed: int, red: str = "greedy", blue: str = "greedy") -> dict:
+    """Play one game to the end (or MAX_TURNS). Returns winner, turns and latencies."""
+    rnd = random.Random(seed)
+    policies = {"red": POLICIES[red], "blue": POLICIES[blue]}
+    state = create_bot_room(f"sim-{seed}", RED_PLAYER, seed=seed)
+    ids = {"red": RED_PLAYER["id"], "blue": BOT_PLAYER_ID}
+    latencies: dict[str, list[int]] = {}
+
+    def act(name: str, fn, *args) -> str | None:
+        nonlocal state
+        start = time.perf_counter_ns()
+        state, error = fn(state, *args)
+        latencies.setdefault(name, []).append(time.perf_counter_ns() - start)
+        return error
+
+    checkpoints = sorted(game_map(state).checkpoint_ids)
+    for side in ("red", "blue"):
+        act("choose_start_checkpoint", choose_start_checkpoint, ids[side], rnd.choice(checkpoints))
+        act("end_turn", end_turn, ids[side])
+
+    turns = 0
+    while not state.get("winner") and turns < MAX_TURNS:
+        side = state["activePlayer"]
+        player_id = ids[side]
+        act("roll_dice", roll_dice, player_id)
+        player = find_player_by_side(state, side)
+        if player["validMoves"]:
+            act("move", move, player_id, rnd.choice(player["validMoves"]))
+        while not state.get("winner"):
+            target = policies[side](state, side, rnd)
+            if target is None:
+                break
+            act("attack", attack, player_id, *target)
+        act("end_turn", end_turn, player_id)
+        turns += 1
+
+    board = get_board(state)
+    return {
+        "winner": state.get("winner"),
+        "turns": turns,
+        "territories": {side: board.count(side) for side in ("red", "blue")},
+        "latencies": latencies,
+    }
+
+
+def _play_chunk(args: tuple[list[int], str, str]) -> list[dict]:
+    seeds, red, blue = args
+    return [play_game(seed, red, blue) for seed in seeds]
+
+
+# ── Batch ─────────────────────────────────────────────────────────────────────
+
+def _percentiles(values: list[int]) -> dict:
+    values = sorted(values)
+
+    def pct(p: float) -> float:
+        return round(values[min(len(values) - 1, int(p * len(values)))] / 1000, 2)
+
+    return {"count": len(values), "p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99), "max": pct(1.0)}
+
+
+def run(games: int, workers: int = 1, seed: int = 0, red: str = "greedy", blue: str = "greedy") -> dict:
+    """Play *games* games on *workers* processes and summarise them."""
+    seeds = list(range(seed, seed + games))
+    chunk = max(1, games // (workers * 8))
+    chunks = [(seeds[i:i + chunk], red, blue) for i in range(0, games, chunk)]
+
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [r for c in chunks for r in _play_chunk(c)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for rs in pool.map(_play_chunk, chunks) for r in rs]
+    elapsed = time.perf_counter() - start
+
+    latencies: dict[str, list[int]] = {}
+    for result in results:
+        for name, values in result["latencies"].items():
+            latencies.setdefault(name, []).extend(values)
+    winners = Counter(result["winner"] or "draw" for result in results)
+    # For draws: who held more territory when the turn limit hit.
+    leaders = Counter(
+        max(("red", "blue"), key=r["territories"].get)
+        if r["territories"]["red"] != r["territories"]["blue"] else "even"
+        for r in results if not r["winner"]
+    )
+    actions = sum(len(v) for v in latencies.values())
+
+    return {
+        "games": games,
+        "workers": workers,
+        "policies": {"red": red, "blue": blue},
+        "seconds": round(elapsed, 3),
+        "gamesPerSec": round(games / elapsed, 1) if elapsed else None,
+        "actionsPerSec": round(actions / elapsed) if elapsed else None,
+        "avgTurns": round(sum(r["turns"] for r in results) / games, 1) if games else 0,
+        "winRate": {k: round(winners[k] / games, 3) for k in ("red", "blue", "draw")} if games else {},
+        "drawLeader": {k: leaders[k] for k in ("red", "blue", "even")},
+        "avgTerritories": {
+            side: round(sum(r["territories"][side] for r in results) / games, 1) if games else 0
+            for side in ("red", "blue")
+        },
+        "latencyUs": {name: _percentiles(values) for name, values in sorted(latencies.items())},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--red", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--blue", choices=sorted(POLICIES), default="greedy")
+    args = parser.parse_args()
+
+    report = run(args.games, args.workers, args.seed, args.red, args.blue)
+    print(f"{report['games']} games on {report['workers']} workers "
+          f"({args.red} vs {args.blue}) in {report['seconds']}s — "
+          f"{report['gamesPerSec']} games/s, {report['actionsPerSec']} actions/s")
+    print(f"win rate  red {report['winRate']['red']:.1%}  blue {report['winRate']['blue']:.1%}  "
+          f"draw {report['winRate']['draw']:.1%}   avg turns {report['avgTurns']}")
+    print(f"draws led by  red {report['drawLeader']['red']}  blue {report['drawLeader']['blue']}  "
+          f"even {report['drawLeader']['even']}   avg territories "
+          f"red {report['avgTerritories']['red']}  blue {report['avgTerritories']['blue']}")
+    print(f"{'action':26} {'count':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (µs)")
+    for name, p in report["latencyUs"].items():
+        print(f"{name:26} {p['count']:>8} {p['p50']:>8} {p['p90']:>8} {p['p99']:>8} {p['max']:>8}")
+
+
+if __name__ == "__main__":
+    main()
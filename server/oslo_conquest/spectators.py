@@ -0,0 +1,133 @@
+"""
+Spectators for Oslo Conquest: read-only subscribers to a room's broadcasts.
+
+A spectator socket is registered here with add(room, ...) and is not a room
+member — it does not keep a room alive, and spectators coming and going never
+touch the room, its actor or the lobby.  The reaper calls forget(room) when it
+evicts a room.
+
+Fan-out is server-side and decoupled from the players' broadcast: the actor's
+on_batch only calls publish(), which queues the already encoded message; a
+sender task per room writes it to every spectator socket directly (rooms live
+in this process, see rooms.py, so their spectators do too).  That skips one
+channel-layer message per spectator, and the sender yields to the event loop
+every FANOUT_CHUNK sockets so player actions are not queued behind a large
+audience.  Spectators always get the delta stream (state_delta after one full
+game_state); a room that falls more than BACKLOG_MAX messages behind gets one
+full game_state instead of the backlog.
+
+Counts are sent to players and spectators as
+  { "type": "spectators", "room": "oslo-1", "count": 212 }
+at most once per COUNT_INTERVAL_S per room.
+"""
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+
+from channels.layers import get_channel_layer
+
+from portal import metrics
+
+BACKLOG_MAX = 32
+COUNT_INTERVAL_S = 1.0
+FANOUT_CHUNK = 64
+
+Send = Callable[[str], Awaitable[None]]
+
+_watchers: dict[str, dict[str, Send]] = {}   # room → {channel_name: send}
+_queues: dict[str, list[str]] = {}
+_senders: dict[str, asyncio.Task] = {}
+_count_tasks: dict[str, asyncio.Task] = {}
+
+
+def count(room: str) -> int:
+    return len(_watchers.get(room, ()))
+
+
+def add(room: str, channel_name: str, send: Send, player_group: str) -> None:
+    """Start sending *room*'s broadcasts to *send*; schedules a count message."""
+    _watchers.setdefault(room, {})[channel_name] = send
+    _schedule_count(room, player_group)
+
+
+def remove(room: str, channel_name: str, player_group: str) -> None:
+    watchers = _watchers.get(room, {})
+    watchers.pop(channel_name, None)
+    if not watchers:
+        _watchers.pop(room, None)
+        _queues.pop(room, None)
+    _schedule_count(room, player_group)
+
+
+def forget(room: str) -> None:
+    """*room* was evicted: drop its spectators and stop its pending sends."""
+    _watchers.pop(room, None)
+    _queues.pop(room, None)
+    for tasks in (_senders, _count_tasks):
+        task = tasks.pop(room, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+
+def _schedule_count(room: str, player_group: str) -> None:
+    task = _count_tasks.get(room)
+    if task is None or task.done():
+        _count_tasks[room] = asyncio.get_running_loop().create_task(_send_count_later(room, player_group))
+
+
+async def _send_count_later(room: str, player_group: str) -> None:
+    await asyncio.sleep(COUNT_INTERVAL_S)
+    _count_tasks.pop(room, None)
+    text = json.dumps({"type": "spectators", "room": room, "count": count(room)})
+    try:
+        await get_channel_layer().group_send(player_group, {"type": "oslo.broadcast", "text": text})
+        await _fan_out(room, text)
+    except Exception as exc:
+        print(f"[oslo-conquest] spectator count error in {room}: {exc}")
+
+
+def publish(room: str, text: str, full_text: Callable[[], str | None]) -> None:
+    """Queue one broadcast for *room*'s spectators (no-op without spectators).
+
+    *full_text()* builds a full game_state of the room's current state; the
+    sender uses it instead of a backlog longer than BACKLOG_MAX.
+    """
+    if room not in _watchers:
+        return
+    _queues.setdefault(room, []).append(text)
+    sender = _senders.get(room)
+    if sender is None or sender.done():
+        _senders[room] = asyncio.get_running_loop().create_task(_send(room, full_text))
+
+
+async def _send(room: str, full_text: Callable[[], str | None]) -> None:
+    try:
+        while _queues.get(room):
+            batch = _queues.pop(room)
+            if len(batch) > BACKLOG_MAX:
+                metrics.incr("oslo.spectators.backlog_dropped", len(batch))
+                text = full_text()
+                batch = [text] if text else []
+            for text in batch:
+                await _fan_out(room, text)
+    except Exception as exc:
+        print(f"[oslo-conquest] spectator fan-out error in {room}: {exc}")
+    finally:
+        if _senders.get(room) is asyncio.current_task():
+            del _senders[room]
+
+
+async def _fan_out(room: str, text: str) -> None:
+    sends = list(_watchers.get(room, {}).values())
+    for i, send in enumerate(sends, start=1):
+        try:
+            await send(text)
+        except Exception as exc:
+            print(f"[oslo-conquest] spectator send error in {room}: {exc}")
+        if i % FANOUT_CHUNK == 0:
+            await asyncio.sleep(0)
+    metrics.incr("oslo.spectators.messages", len(sends))
+
+
+metrics.gauge("oslo.spectators.total", lambda: sum(len(w) for w in _watchers.values()))
+metrics.gauge("oslo.spectators.rooms", lambda: len(_watchers))
@@ -1 +1,7 @@
-urlpatterns = []
+from django.urls import path
+
+from .views import ArchivedGameListView
+
+urlpatterns = [
+    path("api/games/", ArchivedGameListView.as_view(), name="oslo-game-list"),
+]
@@ -0,0 +1,42 @@
+"""
+REST views for archived Oslo Conquest games.
+
+Endpoints:
+  GET  /oslo-conquest/api/games/         recent finished games (?limit=, at most 100)
+
+A game with "replayable": true can be streamed over the websocket with
+{ "type": "replay", "gameId": <id>, "speed": 2 } (see consumers.py).
+"""
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+
+from .models import ArchivedGame
+
+MAX_LIMIT = 100
+
+
+class ArchivedGameListView(View):
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        try:
+            limit = min(MAX_LIMIT, max(1, int(request.GET.get("limit") or 20)))
+        except ValueError:
+            return JsonResponse({"error": "limit must be an integer"}, status=400)
+        games = (
+            ArchivedGame.objects
+            .defer("final_state", "log", "replay")
+            .annotate(replayable=ExpressionWrapper(~Q(replay={}), output_field=BooleanField()))
+            .order_by("-archived_at", "-id")[:limit]
+        )
+        return JsonResponse({"games": [
+            {
+                "id": game.id,
+                "room": game.room,
+                "winner": game.winner,
+                "players": game.players,
+                "archivedAt": game.archived_at.isoformat(),
+                "replayable": game.replayable,
+            }
+            for game in games
+        ]})
@@ -0,0 +1,106 @@
+"""
+In-process metrics registry shared by the portal apps.
+
+Counters are plain monotonically increasing integers keyed by a dotted name
+("clock.lobby_cache.hits").  Histograms keep the last HISTOGRAM_WINDOW observed
+values per name ("clock.connect.latency_ms") and report count and percentiles.
+Gauges are callables registered once and read at snapshot time ("oslo.rooms.total");
+one that raises is reported as null.
+snapshot() returns everything as a JSON-ready dict and MetricsView exposes it at
+GET /metrics/ to scrapers that send "Authorization: Bearer <config["metricsToken"]>".
+Without a configured token the endpoint answers 403 (outside DEBUG).
+
+Values are per process — with several Daphne workers, scrape each one.
+"""
+import hmac
+import threading
+from collections import deque
+from collections.abc import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+
+HISTOGRAM_WINDOW = 1024
+
+_lock = threading.Lock()
+_counters: dict[str, int] = {}
+_histograms: dict[str, tuple[list[int], deque]] = {}   # name → ([count], recent values)
+_gauges: dict[str, Callable[[], float]] = {}
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def get(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def observe(name: str, value: float) -> None:
+    """Record one observation (e.g. a latency in ms) in histogram *name*."""
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = ([0], deque(maxlen=HISTOGRAM_WINDOW))
+        hist[0][0] += 1
+        hist[1].append(value)
+
+
+def percentiles(name: str) -> dict:
+    with _lock:
+        hist = _histograms.get(name)
+        count, values = (hist[0][0], sorted(hist[1])) if hist else (0, [])
+    if not values:
+        return {"count": count}
+
+    def pct(p: float) -> float:
+        return round(values[min(len(values) - 1, int(p * len(values)))], 3)
+
+    return {"count": count, "p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99), "max": round(values[-1], 3)}
+
+
+def gauge(name: str, read: Callable[[], float]) -> None:
+    """Register *read* as the current value of gauge *name* (replaces an earlier one)."""
+    with _lock:
+        _gauges[name] = read
+
+
+def snapshot() -> dict:
+    with _lock:
+        counters = dict(sorted(_counters.items()))
+        names = sorted(_histograms)
+        gauges = sorted(_gauges.items())
+    return {
+        "counters": counters,
+        "histograms": {n: percentiles(n) for n in names},
+        "gauges": {n: _read_gauge(n, read) for n, read in gauges},
+    }
+
+
+def _read_gauge(name: str, read: Callable[[], float]):
+    """A gauge that fails reads as None, so one bad gauge doesn't fail the snapshot."""
+    try:
+        return read()
+    except Exception as exc:
+        print(f"[metrics] gauge {name} failed: {exc}")
+        return None
+
+
+class MetricsView(View):
+    """GET /metrics/ — current counter and histogram values for this process."""
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        if not _authorized(request):
+            return JsonResponse({"error": "Forbidden"}, status=403)
+        return JsonResponse(snapshot())
+
+
+def _authorized(request: HttpRequest) -> bool:
+    token = settings.CONFIG.get("metricsToken", "")
+    if not token:
+        return settings.DEBUG
+    auth = request.META.get("HTTP_AUTHORIZATION", "")
+    return auth.startswith("Bearer ") and hmac.compare_digest(auth[7:].strip().encode(), token.encode())
@@ -129,6 +129,12 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": _sqlite_path,
+            # Writers wait up to 20 s for SQLite's write lock instead of failing;
+            # see Tournament.lock for how registrations take it up front.
+            "OPTIONS": {"timeout": 20},
+            # File-backed test DB: in-memory shared-cache SQLite fails concurrent
+            # writers with "table is locked" instead of waiting on the timeout.
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
         }
     }
 
@@ -142,6 +148,15 @@ CHANNEL_LAYERS = {
 }
 
 
+# ── Lobby cache ───────────────────────────────────────────────────────────────
+#
+# None → clock/lobby.py keeps the tournament list cache in this process.
+# Set config["lobbyCache"] to a CACHES alias (Redis/Memcached) when running
+# several workers so they share entries and invalidations.
+
+CLOCK_LOBBY_CACHE: str | None = CONFIG.get("lobbyCache") or None
+
+
 # ── CORS ──────────────────────────────────────────────────────────────────────
 
 if DEBUG:
@@ -18,6 +18,8 @@ from django.conf import settings
 from django.http import FileResponse, HttpRequest, HttpResponse
 from django.urls import include, path, re_path
 
+from .metrics import MetricsView
+
 
 def _home_view(request: HttpRequest) -> HttpResponse:
     index = Path(settings.BASE_DIR) / "public" / "index.html"
@@ -77,6 +79,7 @@ if _base:
     # Prod / sub-path hosting: poker-clock montert under /<base>/
     urlpatterns = [
         path("", _home_view),
+        path("metrics/", MetricsView.as_view(), name="metrics"),
         re_path(r"^assets/(?P<asset_path>.+)$", _public_asset_view),
         *register_spa(_base, "clock.urls"),
         *register_spa("oslo-conquest", "oslo_conquest.urls"),
@@ -87,6 +90,7 @@ else:
     from clock.urls import urlpatterns as _clock_urls  # noqa: E402
     urlpatterns = [
         path("", _home_view),
+        path("metrics/", MetricsView.as_view(), name="metrics"),
         re_path(r"^assets/(?P<asset_path>.+)$", _public_asset_view),
         *_clock_urls,
         *register_spa("oslo-conquest", "oslo_conquest.urls"),
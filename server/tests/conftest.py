@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_lobby_cache():
+    """Lobby cache and diff baselines are process-global; DB rollbacks don't reach them."""
+    from clock import lobby
+    lobby.invalidate()
+    lobby._published.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _clear_connect_caches():
+    """Host ids are cached per tournament id, and flushed test DBs reuse ids."""
+    from clock import admission
+    admission.invalidate_host()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _no_oslo_write_behind(monkeypatch):
+    """No background DB writer in tests; persistence tests call flush() themselves."""
+    from oslo_conquest import persistence
+    monkeypatch.setattr(persistence, "WRITE_BEHIND", False)
+    yield
+    with persistence._lock:
+        persistence._pending.clear()
+        persistence._seq.clear()
+        persistence._since_snapshot.clear()
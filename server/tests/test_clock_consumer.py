@@ -221,3 +221,257 @@ def test_tournament_without_host_denies_admin_action():
         await comm.disconnect()
 
     _run(run)
+
+
+# ── lobby channel ──────────────────────────────────────────────────────────────
+
+@pytest.mark.django_db(transaction=True)
+def test_admin_batch_sends_one_snapshot():
+    from players.models import Player
+    from clock.models import Tournament
+
+    async def run():
+        host = await Player.objects.acreate(display_name="Host")
+        t = await Tournament.objects.acreate(name="T", host=host)
+        gs.init_state(None, tournament_id=t.id)
+
+        comm = _communicator(t.id, sign_access_token(host.id))
+        connected, _ = await comm.connect()
+        assert connected
+        await comm.receive_json_from()  # initial snapshot
+
+        await comm.send_json_to({"type": "admin_batch",
+                                 "batch": {"register": ["a", "b", "c"], "bustouts": 1, "rebuys": 2}})
+        messages = [await comm.receive_json_from(), await comm.receive_json_from()]
+        assert await comm.receive_nothing()
+        await comm.disconnect()
+        return {m["type"]: m for m in messages}
+
+    messages = _run(run)
+    assert messages["batch_result"]["registered"] == ["a", "b", "c"]
+    players = messages["snapshot"]["players"]
+    assert (players["registered"], players["busted"], players["rebuyCount"]) == (3, 1, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_non_host_admin_batch_is_rejected():
+    from players.models import Player
+    from clock.models import Tournament
+
+    async def run():
+        host = await Player.objects.acreate(display_name="Host")
+        guest = await Player.objects.acreate(display_name="Guest")
+        t = await Tournament.objects.acreate(name="T", host=host)
+        gs.init_state(None, tournament_id=t.id)
+
+        comm = _communicator(t.id, sign_access_token(guest.id))
+        await comm.connect()
+        await comm.receive_json_from()
+        await comm.send_json_to({"type": "admin_batch", "batch": {"rebuys": 1}})
+        response = await comm.receive_json_from()
+        await comm.disconnect()
+        return response
+
+    assert _run(run)["type"] == "error_msg"
+
+
+def _lobby_communicator() -> WebsocketCommunicator:
+    return WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/clock/lobby/")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lobby_sends_snapshot_on_connect():
+    from clock.models import Tournament
+
+    async def run():
+        t = await Tournament.objects.acreate(name="Fredagspoker")
+
+        comm = _lobby_communicator()
+        connected, _ = await comm.connect()
+        assert connected
+
+        snap = await comm.receive_json_from()
+        assert snap["type"] == "lobby_snapshot"
+        assert isinstance(snap["version"], int)
+        assert t.id in [x["id"] for x in snap["tournaments"]]
+        await comm.disconnect()
+
+    _run(run)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lobby_pushes_only_changed_fields():
+    from channels.db import database_sync_to_async
+    from clock import lobby
+    from clock.models import Tournament
+
+    async def run():
+        t = await Tournament.objects.acreate(name="Gammel")
+        comm = _lobby_communicator()
+        await comm.connect()
+        await comm.receive_json_from()  # lobby_snapshot
+
+        await database_sync_to_async(lobby.tournament_changed)(t.id, created=True)
+        added = await comm.receive_json_from()
+        assert added["type"] == "tournament_added"
+        assert added["tournament"]["name"] == "Gammel"
+
+        await Tournament.objects.filter(pk=t.id).aupdate(name="Ny")
+        await database_sync_to_async(lobby.tournament_changed)(t.id)
+        updated = await comm.receive_json_from()
+        assert updated["type"] == "tournament_updated"
+        assert updated["id"] == t.id
+        assert updated["changes"] == {"name": "Ny"}
+        assert updated["version"] == added["version"] + 1
+
+        # Nothing visible changed → nothing pushed
+        await database_sync_to_async(lobby.tournament_changed)(t.id)
+        assert await comm.receive_nothing()
+        await comm.disconnect()
+
+    _run(run)
+
+
+# ── connect fast path ──────────────────────────────────────────────────────────
+
+@pytest.mark.django_db(transaction=True)
+def test_reconnect_uses_token_cache_and_records_latency():
+    from players.models import Player
+    from clock.models import Tournament
+    from portal import metrics
+
+    async def run():
+        host = await Player.objects.acreate(display_name="Host")
+        t = await Tournament.objects.acreate(name="T", host=host)
+        gs.init_state(None, tournament_id=t.id)
+        token = sign_access_token(host.id)
+
+        for _ in range(2):
+            comm = _communicator(t.id, token)
+            connected, _ = await comm.connect()
+            assert connected
+            assert (await comm.receive_json_from())["type"] == "snapshot"
+            assert await comm.receive_nothing()   # one snapshot per connect
+            await comm.disconnect()
+
+    hits = metrics.get("clock.connect.token_cache.hits")
+    latency_count = metrics.percentiles("clock.connect.latency_ms")["count"]
+    _run(run)
+    assert metrics.get("clock.connect.token_cache.hits") == hits + 1
+    assert metrics.percentiles("clock.connect.latency_ms")["count"] == latency_count + 2
+
+
+def test_metrics_endpoint_requires_the_metrics_token(settings):
+    from django.test import Client
+
+    settings.CONFIG = {**settings.CONFIG, "metricsToken": "scrape-me"}
+    client = Client()
+    assert client.get("/metrics/").status_code == 403
+    assert client.get("/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code == 403
+    response = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer scrape-me")
+    assert response.status_code == 200
+    assert "counters" in response.json()
+
+
+def test_a_failing_gauge_reads_as_null():
+    from portal import metrics
+
+    def broken() -> float:
+        raise RuntimeError("deque mutated during iteration")
+
+    metrics.gauge("test.broken", broken)
+    metrics.gauge("test.ok", lambda: 3)
+    gauges = metrics.snapshot()["gauges"]
+    assert (gauges["test.broken"], gauges["test.ok"]) == (None, 3)
+    del metrics._gauges["test.broken"], metrics._gauges["test.ok"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_host_change_invalidates_cached_host():
+    from players.models import Player
+    from clock.models import Tournament
+
+    async def run():
+        old = await Player.objects.acreate(display_name="Old")
+        new = await Player.objects.acreate(display_name="New")
+        t = await Tournament.objects.acreate(name="T", host=old)
+        gs.init_state(None, tournament_id=t.id)
+
+        comm = _communicator(t.id, sign_access_token(new.id))
+        await comm.connect()
+        await comm.receive_json_from()
+        await comm.disconnect()       # caches host = old
+
+        t.host = new
+        await t.asave()
+
+        comm = _communicator(t.id, sign_access_token(new.id))
+        await comm.connect()
+        await comm.receive_json_from()
+        await comm.send_json_to({"type": "admin_start"})
+        response = await comm.receive_json_from()
+        await comm.disconnect()
+        return response
+
+    assert _run(run)["type"] == "snapshot"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_connect_refused_with_1013_when_over_admission_rate(monkeypatch):
+    from players.models import Player
+    from clock import admission
+    from clock.models import Tournament
+
+    monkeypatch.setattr(admission, "_bucket", admission.TokenBucket(rate=0.01, burst=1))
+
+    async def run():
+        host = await Player.objects.acreate(display_name="Host")
+        t = await Tournament.objects.acreate(name="T", host=host)
+        gs.init_state(None, tournament_id=t.id)
+        token = sign_access_token(host.id)
+
+        first = _communicator(t.id, token)
+        assert (await first.connect())[0]
+        await first.receive_json_from()
+
+        second = _communicator(t.id, token)
+        await second.connect()
+        output = await second.receive_output()
+        await first.disconnect()
+        return output
+
+    assert _run(run) == {"type": "websocket.close", "code": 1013}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_invalid_tokens_do_not_use_up_admission(monkeypatch):
+    from players.models import Player
+    from clock import admission
+    from clock.models import Tournament
+
+    monkeypatch.setattr(admission, "_bucket", admission.TokenBucket(rate=0.01, burst=1))
+
+    async def run():
+        host = await Player.objects.acreate(display_name="Host")
+        t = await Tournament.objects.acreate(name="T", host=host)
+        gs.init_state(None, tournament_id=t.id)
+
+        for _ in range(3):
+            connected, code = await _communicator(t.id, "not.a.valid.token").connect()
+            assert (connected, code) == (False, 4001)
+
+        comm = _communicator(t.id, sign_access_token(host.id))
+        connected, _ = await comm.connect()
+        assert connected
+        await comm.disconnect()
+
+    _run(run)
+
+
+def test_token_bucket_delays_then_refuses():
+    from clock.admission import TokenBucket
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve(1.0) == 0
+    assert bucket.reserve(1.0) == 0
+    assert 0 < bucket.reserve(1.0) <= 0.1
+    assert bucket.reserve(0.0) is None
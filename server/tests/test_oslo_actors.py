@@ -0,0 +1,105 @@
+"""Tests for per-room actors (oslo_conquest.actors)."""
+import asyncio
+
+from asgiref.sync import async_to_sync
+
+from oslo_conquest import actors
+from portal import metrics
+
+
+def _recorder():
+    batches = []
+
+    async def on_batch(room, log_since, full):
+        batches.append((room, log_since, full))
+
+    return batches, on_batch
+
+
+def test_queued_ops_run_in_order_and_broadcast_once_per_batch():
+    batches, on_batch = _recorder()
+    applied = []
+
+    def op(n, error=None):
+        def run():
+            applied.append(n)
+            return error
+        return run
+
+    async def run():
+        return await asyncio.gather(
+            actors.submit("a", op(1), on_batch, lambda room: 7),
+            actors.submit("a", op(2, "Ugyldig"), on_batch, lambda room: 7),
+            actors.submit("a", op(3), on_batch, lambda room: 7, full=True),
+        )
+
+    results = async_to_sync(run)()
+    assert results == [None, "Ugyldig", None]
+    assert applied == [1, 2, 3]
+    assert batches == [("a", None, True)]
+
+
+def test_failed_batches_are_not_broadcast():
+    batches, on_batch = _recorder()
+
+    async def run():
+        return await actors.submit("a", lambda: "Det er ikke din tur", on_batch, lambda room: 1)
+
+    assert async_to_sync(run)() == "Det er ikke din tur"
+    assert batches == []
+
+
+def test_rooms_do_not_block_each_other():
+    order = []
+
+    async def run():
+        release = asyncio.Event()
+
+        async def slow_broadcast(room, log_since, full):
+            order.append(f"{room}-start")
+            await release.wait()
+            order.append(f"{room}-end")
+
+        async def fast_broadcast(room, log_since, full):
+            order.append(room)
+            release.set()
+
+        await asyncio.gather(
+            actors.submit("slow", lambda: None, slow_broadcast, lambda room: 0),
+            actors.submit("fast", lambda: None, fast_broadcast, lambda room: 0),
+        )
+        # The slow room waits on the fast one's broadcast, so they must run concurrently.
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    async_to_sync(run)()
+    assert order == ["slow-start", "fast", "slow-end"]
+
+
+def test_action_latency_is_recorded():
+    _, on_batch = _recorder()
+
+    async def run():
+        await actors.submit("lat", lambda: None, on_batch, lambda room: 0)
+        return actors.latency_summary()
+
+    summary = async_to_sync(run)()
+    assert summary["lat"]["actions"] == 1
+    assert metrics.percentiles("oslo.action.latency_ms")["count"] >= 1
+    assert "oslo.actors.active" in metrics.snapshot()["gauges"]
+
+
+def test_ops_whose_submitter_gave_up_are_skipped():
+    batches, on_batch = _recorder()
+    applied = []
+
+    async def run():
+        first = asyncio.ensure_future(actors.submit("c", lambda: applied.append(1), on_batch, lambda room: 0))
+        second = asyncio.ensure_future(actors.submit("c", lambda: applied.append(2), on_batch, lambda room: 0))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        second.cancel()
+        await first
+
+    async_to_sync(run)()
+    assert applied == [1]
@@ -0,0 +1,154 @@
+"""Tests for the precomputed lookup tables in oslo_conquest.board."""
+from collections import deque
+
+from oslo_conquest.board import (
+    ADJACENCY,
+    CHECKPOINT_BITS,
+    CHECKPOINT_IDS,
+    DISTANCES,
+    MAX_DICE,
+    NEIGHBOR_BITS,
+    NEIGHBORS,
+    TERRITORY_IDS,
+    TERRITORY_INDEX,
+    are_neighbors,
+    distance,
+    reachable,
+)
+
+
+def _bfs(start_id: str, max_steps: int) -> list[str]:
+    seen = {start_id: 0}
+    queue = deque([start_id])
+    while queue:
+        node = queue.popleft()
+        if seen[node] >= max_steps:
+            continue
+        for neighbor in ADJACENCY[node]:
+            if neighbor not in seen:
+                seen[neighbor] = seen[node] + 1
+                queue.append(neighbor)
+    return sorted(t for t, d in seen.items() if d > 0)
+
+
+def test_reachable_matches_bfs_for_every_start_and_roll():
+    for tid in TERRITORY_IDS:
+        for roll in range(1, MAX_DICE + 1):
+            assert list(reachable(tid, roll)) == _bfs(tid, roll), (tid, roll)
+
+
+def test_distances_are_symmetric_and_zero_on_diagonal():
+    n = len(TERRITORY_IDS)
+    for i in range(n):
+        assert DISTANCES[i][i] == 0
+        for j in range(n):
+            assert DISTANCES[i][j] == DISTANCES[j][i]
+
+
+def test_distance_between_neighbours_is_one():
+    assert distance("t0a", "t1") == 1
+    assert distance("t0a", "t0a") == 0
+    assert distance("t0a", "nowhere") is None
+
+
+def test_reachable_edge_cases():
+    assert reachable(None, 3) == ()
+    assert reachable("t0a", 0) == ()
+    assert reachable("nowhere", 3) == ()
+    # Rolls beyond the board diameter reach every other territory.
+    assert len(reachable("t0a", 50)) == len(TERRITORY_IDS) - 1
+
+
+def test_index_follows_board_order():
+    assert [TERRITORY_INDEX[t] for t in TERRITORY_IDS] == list(range(len(TERRITORY_IDS)))
+
+
+def test_neighbor_sets_and_bits_match_adjacency():
+    for tid in TERRITORY_IDS:
+        assert NEIGHBORS[tid] == set(ADJACENCY[tid])
+        bits = NEIGHBOR_BITS[TERRITORY_INDEX[tid]]
+        assert {TERRITORY_IDS[j] for j in range(len(TERRITORY_IDS)) if bits >> j & 1} == NEIGHBORS[tid]
+    assert are_neighbors("t0a", "t1") and not are_neighbors("t0a", "t35")
+    assert {TERRITORY_IDS[j] for j in range(len(TERRITORY_IDS)) if CHECKPOINT_BITS >> j & 1} == set(CHECKPOINT_IDS)
+
+
+def test_player_lookup_follows_the_players_list():
+    from oslo_conquest.mvp import (
+        add_player,
+        create_waiting_room,
+        find_player_by_id,
+        find_player_by_side,
+        public_state,
+    )
+    from oslo_conquest.persistence import encode_room
+
+    state = create_waiting_room("r", {"id": "p1"})
+    assert find_player_by_id(state, "p1")["side"] == "red"
+    assert find_player_by_side(state, "blue") is None
+
+    state, _ = add_player(state, {"id": "p2"})
+    assert find_player_by_side(state, "blue") is find_player_by_id(state, "p2")
+
+    state["players"] = [dict(p) for p in state["players"]]
+    assert find_player_by_id(state, "p1") is state["players"][0]
+    assert "playerIndex" not in public_state(state)
+    assert "playerIndex" not in encode_room(state)
+
+
+# ── Compact board (board_state.BoardState) ────────────────────────────────────
+
+def _started_room():
+    from oslo_conquest.mvp import add_player, create_waiting_room
+    room, _ = add_player(create_waiting_room("r", {"id": "p1", "name": "Ola"}), {"id": "p2", "name": "Kari"})
+    room["phase"] = "playing"
+    return room
+
+
+def test_public_state_expands_board_to_territory_dicts():
+    from oslo_conquest.mvp import public_state
+    room = _started_room()
+    state = public_state(room)
+    assert "board" not in state
+    assert state["territories"]["t0a"] == {"id": "t0a", "owner": "red", "units": 3}
+    assert state["territories"]["lysaker_cp"] == {"id": "lysaker_cp", "owner": None, "units": 0}
+    assert len(state["territories"]) == len(TERRITORY_IDS)
+
+
+def test_ownership_counters_follow_conquests():
+    from oslo_conquest.mvp import attack
+    room = _started_room()
+    board = room["board"]
+    assert (board.count("red"), board.count("blue")) == (1, 1)
+
+    room, error = attack(room, "p1", "t0a", "t1")
+    assert error is None
+    assert (board.count("red"), board.count("blue")) == (2, 1)
+    assert board.owner(TERRITORY_INDEX["t1"]) == "red"
+
+
+def test_winner_is_declared_from_counters():
+    from oslo_conquest.mvp import attack
+    room = _started_room()
+    board = room["board"]
+    assert room.get("winner") is None
+    for tid in TERRITORY_IDS[:24]:
+        board.set_owner(TERRITORY_INDEX[tid], "red")
+    board.units[TERRITORY_INDEX["t12"]] = 5
+    board.set_owner(TERRITORY_INDEX["t13"], "blue")   # red holds 23 of 40
+
+    room, _ = attack(room, "p1", "t12", "t13")
+    assert board.count("red") == 24
+    assert room.get("winner") == "red"
+
+
+def test_legacy_territory_dict_is_converted_on_first_use():
+    from oslo_conquest.mvp import attack, public_state
+    room = _started_room()
+    territories = public_state(room)["territories"]
+    del room["board"]
+    room["territories"] = territories
+
+    room, error = attack(room, "p1", "t0a", "t1")
+    assert error is None
+    assert "territories" not in room
+    assert public_state(room)["territories"]["t1"]["owner"] == "red"
@@ -0,0 +1,192 @@
+"""Tests for the search bot (oslo_conquest.bot_search) and bot turns in the consumer."""
+import asyncio
+import os
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from oslo_conquest import bot_search
+from oslo_conquest.board import CHECKPOINT_IDS, START_TERRITORIES, TERRITORY_INDEX, distance
+from oslo_conquest.bot import BOT_PLAYER_ID
+from oslo_conquest.consumers import _bot_tasks, _rooms
+from oslo_conquest.mvp import apply_action, create_bot_room, get_board, legal_attacks
+
+from .test_oslo_conquest_consumer import connect_consumer, receive_non_room_list
+
+
+@pytest.fixture(autouse=True)
+def _bot_in_a_thread(monkeypatch):
+    """One worker thread instead of forking the test process; fresh rooms per test."""
+    bot_search.shutdown()
+    monkeypatch.setattr(bot_search, "BOT_WORKERS", 0)
+    _rooms.clear()
+    _rooms.pop_changes()
+    yield
+    bot_search.shutdown()
+
+
+def _playing_room(seed: int = 1) -> dict:
+    state = create_bot_room("r", {"id": "p1"}, seed=seed)
+    for action in (
+        {"type": "choose_start_checkpoint", "playerId": "p1", "checkpointTerritoryId": "lysaker_cp"},
+        {"type": "end_turn", "playerId": "p1"},
+        {"type": "choose_start_checkpoint", "playerId": BOT_PLAYER_ID, "checkpointTerritoryId": "kolbotn_cp"},
+        {"type": "end_turn", "playerId": BOT_PLAYER_ID},
+    ):
+        state, error = apply_action(state, action)
+        assert error is None
+    return state
+
+
+def test_decisions_follow_the_turn_sequence_without_mutating_state():
+    state = _playing_room()
+    assert bot_search.choose_action(state, BOT_PLAYER_ID) is None   # red's turn
+
+    assert bot_search.choose_action(state, "p1") == {"type": "roll_dice", "playerId": "p1"}
+    state, _ = apply_action(state, {"type": "roll_dice", "playerId": "p1"})
+    before = (bytes(get_board(state).owners), state["rng"], state["players"][0]["validMoves"])
+
+    action = bot_search.choose_action(state, "p1")
+    assert action["type"] == "move"
+    assert action["toTerritoryId"] in state["players"][0]["validMoves"]
+    assert (bytes(get_board(state).owners), state["rng"], state["players"][0]["validMoves"]) == before
+
+
+def test_move_prefers_the_next_checkpoint_then_getting_close_to_it():
+    player = {"nextCheckpoint": "kolbotn_cp", "validMoves": ["t1", "kolbotn_cp", "t2"]}
+    assert bot_search.best_move(player) == "kolbotn_cp"
+
+    by_distance = sorted(
+        (tid for tid in TERRITORY_INDEX if tid not in CHECKPOINT_IDS),
+        key=lambda tid: distance(tid, "kolbotn_cp"),
+    )
+    near, far = by_distance[0], by_distance[-1]
+    assert bot_search.best_move({"nextCheckpoint": "kolbotn_cp", "validMoves": [far, near]}) == near
+
+
+def test_search_takes_free_territory_and_respects_the_budget():
+    state = _playing_room()
+    state, _ = apply_action(state, {"type": "roll_dice", "playerId": "p1"})
+    state, _ = apply_action(state, bot_search.choose_action(state, "p1"))
+
+    option, rollouts = bot_search.best_attack(state, "p1", budget_s=0.0)
+    assert option is not None and option[0] == START_TERRITORIES["red"]
+    assert rollouts == 1 + len(legal_attacks(state, "red"))   # one round, even at zero budget
+
+
+def test_search_beats_the_simple_bot_on_territory():
+    state = _playing_room(seed=4)
+    ids = {"red": "p1", "blue": BOT_PLAYER_ID}
+    for _ in range(60):
+        side = state["activePlayer"]
+        if side == "red":
+            action = bot_search.choose_action(state, ids[side], budget_s=0.002)
+        else:
+            action = {"type": "end_turn", "playerId": ids[side]}
+        state, error = apply_action(state, action)
+        assert error is None
+    board = get_board(state)
+    assert board.count("red") > board.count("blue")
+
+
+def test_think_runs_in_the_worker_pool(monkeypatch):
+    monkeypatch.setattr(bot_search, "BOT_WORKERS", 1)
+    state = _playing_room()
+    action = async_to_sync(bot_search.think)(state, "p1")
+    assert action == {"type": "roll_dice", "playerId": "p1"}
+
+
+def test_think_replaces_a_broken_worker_pool(monkeypatch):
+    monkeypatch.setattr(bot_search, "BOT_WORKERS", 1)
+    state = _playing_room()
+    broken = bot_search._executor()
+    broken.submit(os._exit, 1).exception()       # kill the worker: the pool is now broken
+    action = async_to_sync(bot_search.think)(state, "p1")
+    assert action == {"type": "roll_dice", "playerId": "p1"}
+    assert bot_search._pool is not broken
+
+
+def test_bot_plays_its_whole_turn_after_the_human_ends_theirs():
+    async def run():
+        human = await connect_consumer()
+        await human.send_json_to({"type": "create_game_with_bot", "room": "bot-1", "player": {"id": "p1"}})
+        await receive_non_room_list(human)
+        await human.send_json_to({"type": "choose_start_checkpoint", "checkpointTerritoryId": "lysaker_cp"})
+        await receive_non_room_list(human)
+        await human.send_json_to({"type": "end_turn"})
+
+        async def until_red_plays():
+            states = []
+            while True:
+                message = await receive_non_room_list(human)
+                states.append(message["state"])
+                if message["state"]["phase"] == "playing" and message["state"]["activePlayer"] == "red":
+                    return states
+
+        setup = await until_red_plays()
+        await human.send_json_to({"type": "roll_dice"})
+        await receive_non_room_list(human)
+        await human.send_json_to({"type": "end_turn"})
+        turn = await until_red_plays()
+        await human.disconnect()
+        return setup, turn
+
+    setup, turn = async_to_sync(run)()
+    bot = next(p for p in setup[-1]["players"] if p["id"] == BOT_PLAYER_ID)
+    assert bot["position"] in CHECKPOINT_IDS
+    assert len(setup) >= 3            # human end_turn, bot checkpoint, bot end_turn
+    assert len(turn) >= 3             # human end_turn, bot roll … bot end_turn
+    assert any(entry["msg"].startswith("Bot kastet") for s in turn for entry in s["log"])
+
+
+async def _bot_room_waiting_on_a_stuck_bot(monkeypatch):
+    """A bot room in setup where the bot's decision never comes back."""
+    thinking = asyncio.Event()
+
+    async def stuck(room_state, player_id, budget_s=None):
+        thinking.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(bot_search, "think", stuck)
+    human = await connect_consumer()
+    await human.send_json_to({"type": "create_game_with_bot", "room": "bot-2", "player": {"id": "p1"}})
+    await receive_non_room_list(human)
+    await human.send_json_to({"type": "choose_start_checkpoint", "checkpointTerritoryId": "lysaker_cp"})
+    await receive_non_room_list(human)
+    await human.send_json_to({"type": "end_turn"})
+    await receive_non_room_list(human)
+    await asyncio.wait_for(thinking.wait(), 1)
+    return human
+
+
+def test_bot_turn_runs_in_the_background_and_forfeit_cancels_it(monkeypatch):
+    async def run():
+        human = await _bot_room_waiting_on_a_stuck_bot(monkeypatch)
+        task = _bot_tasks["bot-2"]
+
+        # The human's socket is not held up by the thinking bot.
+        await human.send_json_to({"type": "get_log", "limit": 1})
+        assert (await receive_non_room_list(human))["type"] == "log_history"
+
+        await human.send_json_to({"type": "forfeit"})
+        state = (await receive_non_room_list(human))["state"]
+        await asyncio.sleep(0)
+        await human.disconnect()
+        return task, state
+
+    task, state = async_to_sync(run)()
+    assert state["winner"] == "blue"
+    assert task.cancelled()
+    assert "bot-2" not in _bot_tasks
+
+
+def test_last_member_leaving_cancels_the_bot_turn(monkeypatch):
+    async def run():
+        human = await _bot_room_waiting_on_a_stuck_bot(monkeypatch)
+        task = _bot_tasks["bot-2"]
+        await human.disconnect()
+        await asyncio.sleep(0)
+        return task
+
+    assert async_to_sync(run)().cancelled()
+    assert "bot-2" not in _bot_tasks
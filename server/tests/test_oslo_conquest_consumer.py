@@ -1,3 +1,5 @@
+import json
+
 from asgiref.sync import async_to_sync
 from channels.testing import WebsocketCommunicator
 
@@ -24,10 +26,13 @@ async def receive_type(communicator, message_type: str):
     raise AssertionError(f"Expected websocket message type {message_type!r}")
 
 
+_LOBBY_MESSAGES = {"room_list", "room_added", "room_updated", "room_removed"}
+
+
 async def receive_non_room_list(communicator):
     for _ in range(10):
         message = await communicator.receive_json_from()
-        if message["type"] != "room_list":
+        if message["type"] not in _LOBBY_MESSAGES:
             return message
     raise AssertionError("Expected non-room_list websocket message")
 
@@ -52,6 +57,7 @@ def ws_roundtrip(messages):
 
 def setup_function():
     _rooms.clear()
+    _rooms.pop_changes()
 
 
 async def _complete_setup_round(first, second):
@@ -751,7 +757,7 @@ def test_landing_on_non_next_checkpoint_awards_no_bonus():
 def test_list_rooms_returns_empty_list_when_no_rooms_exist():
     responses = ws_roundtrip([{"type": "list_rooms"}])
 
-    assert responses[0] == {"type": "room_list", "rooms": []}
+    assert responses[0] == {"type": "room_list", "version": responses[0]["version"], "rooms": []}
 
 
 def test_list_rooms_includes_waiting_room_summary():
@@ -769,6 +775,7 @@ def test_list_rooms_includes_waiting_room_summary():
 
     assert responses[0] == {
         "type": "room_list",
+        "version": responses[0]["version"],
         "rooms": [
             {
                 "room": "oslo-1",
@@ -816,3 +823,190 @@ def test_list_rooms_marks_started_room_unavailable():
     assert room["status"] == "started"
     assert room["players"] == ["Ola", "Kari"]
     assert "territories" not in room
+
+
+def test_action_broadcast_carries_only_new_log_entries_and_history_is_fetchable():
+    async def run():
+        first = await connect_consumer()
+        second = await connect_consumer()
+
+        await first.send_json_to(
+            {"type": "create_game", "room": "oslo-1", "player": {"id": "p1", "name": "Ola"}}
+        )
+        await receive_non_room_list(first)
+        await second.send_json_to(
+            {"type": "join_game", "room": "oslo-1", "player": {"id": "p2", "name": "Kari"}}
+        )
+        joined = await receive_non_room_list(first)
+        await receive_non_room_list(second)
+
+        await first.send_json_to(
+            {"type": "choose_start_checkpoint", "checkpointTerritoryId": "lysaker_cp"}
+        )
+        after_action = await receive_non_room_list(first)
+        await receive_non_room_list(second)
+
+        await first.send_json_to({"type": "get_log", "before": after_action["state"]["logSeq"]})
+        history = await receive_non_room_list(first)
+
+        await first.disconnect()
+        await second.disconnect()
+        return joined, after_action, history
+
+    joined, after_action, history = async_to_sync(run)()
+    assert [e["msg"] for e in joined["state"]["log"]] == ["Spillet startet", "Venter på spiller 2"]
+    assert after_action["state"]["logSince"] == joined["state"]["logSeq"]
+    assert [e["msg"] for e in after_action["state"]["log"]] == ["Ola flyttet startbrikken til lysaker_cp"]
+    assert history["type"] == "log_history"
+    assert history["entries"] == joined["state"]["log"]
+
+
+def test_lobby_gets_room_deltas_with_consecutive_versions():
+    async def run():
+        lobby = WebsocketCommunicator(OsloConquestConsumer.as_asgi(), "/ws/oslo-conquest/")
+        await lobby.connect()
+        room_list = await lobby.receive_json_from()
+        first = await connect_consumer()
+        second = await connect_consumer()
+
+        await first.send_json_to(
+            {"type": "create_game", "room": "oslo-1", "player": {"id": "p1", "name": "Ola"}}
+        )
+        added = await lobby.receive_json_from()
+        # The join lands inside the flush interval and is sent by the deferred flush.
+        await second.send_json_to(
+            {"type": "join_game", "room": "oslo-1", "player": {"id": "p2", "name": "Kari"}}
+        )
+        updated = await lobby.receive_json_from()
+        quiet = await lobby.receive_nothing(timeout=0.4)
+
+        for communicator in (lobby, first, second):
+            await communicator.disconnect()
+        return room_list, added, updated, quiet
+
+    room_list, added, updated, quiet = async_to_sync(run)()
+    assert room_list["rooms"] == []
+    assert added["type"] == "room_added"
+    assert added["version"] == room_list["version"] + 1
+    assert added["room"]["playerIds"] == ["p1"]
+    assert updated["type"] == "room_updated"
+    assert updated["version"] == added["version"] + 1
+    assert updated["room"]["playerIds"] == ["p1", "p2"]
+    assert updated["room"]["status"] == "started"
+    assert quiet
+
+
+# ── state_delta broadcasts (?deltas=1) ──────────────────────────────────────────
+
+async def connect_delta_consumer():
+    communicator = WebsocketCommunicator(
+        OsloConquestConsumer.as_asgi(),
+        "/ws/oslo-conquest/?deltas=1",
+    )
+    connected, _ = await communicator.connect()
+    assert connected
+    assert (await communicator.receive_json_from())["type"] == "room_list"
+    return communicator
+
+
+def _apply_delta(state: dict, delta: dict) -> dict:
+    changes = delta["changes"]
+    for tid, patch in changes.get("territories", {}).items():
+        state["territories"][tid].update(patch)
+    for player in state["players"]:
+        player.update(changes.get("players", {}).get(player["id"], {}))
+    for key in ("phase", "started", "activePlayer", "winner"):
+        if key in changes:
+            state[key] = changes[key]
+    if "legalActions" in changes:
+        patch = changes["legalActions"]
+        state["legalActions"] = None if patch is None else {**(state.get("legalActions") or {}), **patch}
+    state["log"] = delta["log"] + state["log"]
+    state["logSeq"] = delta["logSeq"]
+    state["version"] = delta["version"]
+    return state
+
+
+def test_delta_subscriber_gets_patches_that_rebuild_the_full_state():
+    async def run():
+        legacy = await connect_consumer()
+        delta_client = await connect_delta_consumer()
+
+        await legacy.send_json_to(
+            {"type": "create_game", "room": "oslo-1", "player": {"id": "p1", "name": "Ola"}}
+        )
+        await receive_non_room_list(legacy)
+        await delta_client.send_json_to(
+            {"type": "join_game", "room": "oslo-1", "player": {"id": "p2", "name": "Kari"}}
+        )
+        await receive_non_room_list(legacy)
+        state = (await receive_non_room_list(delta_client))["state"]   # full on join
+
+        await _complete_setup_round(legacy, delta_client)
+        await delta_client.send_json_to({"type": "sync"})
+        state = (await receive_non_room_list(delta_client))["state"]
+
+        await legacy.send_json_to({"type": "attack", "fromTerritoryId": "t0a", "toTerritoryId": "t1"})
+        full = await receive_non_room_list(legacy)
+        delta = await receive_non_room_list(delta_client)
+
+        await legacy.disconnect()
+        await delta_client.disconnect()
+        return state, full, delta
+
+    state, full, delta = async_to_sync(run)()
+    assert delta["type"] == "state_delta"
+    assert delta["baseVersion"] == state["version"]
+    assert delta["changes"] == {
+        "territories": {
+            "t0a": {"owner": "red", "units": 2},
+            "t1": {"owner": "red", "units": 1},
+        },
+        "legalActions": {"attacks": full["state"]["legalActions"]["attacks"]},
+    }
+    assert [e["msg"] for e in delta["log"]] == ["Ola erobret t1"]
+
+    rebuilt = _apply_delta(state, delta)
+    expected = full["state"]
+    assert rebuilt["territories"] == expected["territories"]
+    assert rebuilt["players"] == expected["players"]
+    assert rebuilt["version"] == expected["version"]
+    assert rebuilt["legalActions"] == expected["legalActions"]
+    # The board/log patch stays an order of magnitude smaller than the full state.
+    board_patch = {**delta, "changes": {k: v for k, v in delta["changes"].items() if k != "legalActions"}}
+    assert len(json.dumps(board_patch)) * 10 < len(json.dumps(full))
+
+
+def test_delta_subscriber_sees_turn_change_and_can_resync():
+    async def run():
+        first = await connect_delta_consumer()
+        second = await connect_delta_consumer()
+
+        await first.send_json_to(
+            {"type": "create_game", "room": "oslo-1", "player": {"id": "p1", "name": "Ola"}}
+        )
+        await receive_non_room_list(first)
+        await second.send_json_to(
+            {"type": "join_game", "room": "oslo-1", "player": {"id": "p2", "name": "Kari"}}
+        )
+        await receive_non_room_list(first)
+        await receive_non_room_list(second)
+        await _complete_setup_round(first, second)
+
+        await first.send_json_to({"type": "end_turn"})
+        delta = await receive_non_room_list(second)
+        await receive_non_room_list(first)
+
+        await second.send_json_to({"type": "sync"})
+        resync = await receive_non_room_list(second)
+
+        await first.disconnect()
+        await second.disconnect()
+        return delta, resync
+
+    delta, resync = async_to_sync(run)()
+    assert delta["type"] == "state_delta"
+    assert delta["changes"]["activePlayer"] == "blue"
+    assert resync["type"] == "game_state"
+    assert resync["state"]["version"] == delta["version"]
+    assert resync["state"]["activePlayer"] == "blue"
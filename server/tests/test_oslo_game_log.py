@@ -0,0 +1,57 @@
+"""Tests for the bounded Oslo Conquest game log (oslo_conquest.game_log)."""
+from oslo_conquest.game_log import LOG_CAPACITY, LOG_SNAPSHOT, GameLog
+from oslo_conquest.mvp import add_player, create_waiting_room, end_turn, get_log, log_entry, public_state
+
+
+def _log(n: int) -> GameLog:
+    log = GameLog()
+    for i in range(n):
+        log.append(log_entry(f"m{i}"))
+    return log
+
+
+def test_entries_get_increasing_seq_and_iterate_newest_first():
+    log = _log(3)
+    assert [e["seq"] for e in log] == [3, 2, 1]
+    assert [e["msg"] for e in log] == ["m2", "m1", "m0"]
+
+
+def test_log_is_bounded():
+    log = _log(LOG_CAPACITY + 50)
+    assert len(log) == LOG_CAPACITY
+    assert log.last_seq == LOG_CAPACITY + 50
+    assert next(iter(log))["seq"] == LOG_CAPACITY + 50
+
+
+def test_since_before_and_recent():
+    log = _log(10)
+    assert [e["seq"] for e in log.since(7)] == [10, 9, 8]
+    assert log.since(10) == []
+    assert [e["seq"] for e in log.before(5, limit=2)] == [4, 3]
+    assert [e["seq"] for e in log.recent(4)] == [10, 9, 8, 7]
+
+
+def test_legacy_list_log_is_converted_on_first_append():
+    room = {"log": [log_entry("new"), log_entry("old")]}
+    log = get_log(room)
+    assert room["log"] is log
+    assert [(e["msg"], e["seq"]) for e in log] == [("new", 2), ("old", 1)]
+
+
+def test_public_state_sends_snapshot_or_only_new_entries():
+    room, _ = add_player(create_waiting_room("r", {"id": "p1", "name": "Ola"}), {"id": "p2", "name": "Kari"})
+    for _ in range(LOG_SNAPSHOT):
+        get_log(room).append(log_entry("fyll"))
+
+    full = public_state(room)
+    assert len(full["log"]) == LOG_SNAPSHOT
+    assert "logSince" not in full
+
+    before = get_log(room).last_seq
+    room["players"][0]["position"] = "lysaker_cp"
+    room, error = end_turn(room, "p1")
+    assert error is None
+    delta = public_state(room, log_since=before)
+    assert delta["logSince"] == before
+    assert [e["msg"] for e in delta["log"]] == ["Kari velger startcheckpoint"]
+    assert delta["logSeq"] == before + 1
@@ -0,0 +1,79 @@
+"""Tests for legal-action enumeration (mvp.legal_summary / legal_actions)."""
+from oslo_conquest.board import CHECKPOINT_IDS, TERRITORY_IDS
+from oslo_conquest.bot import BOT_PLAYER_ID
+from oslo_conquest.bot_search import search_state
+from oslo_conquest.mvp import (
+    apply_action,
+    attack,
+    create_bot_room,
+    create_waiting_room,
+    get_board,
+    legal_actions,
+    legal_attacks,
+    legal_summary,
+    public_state,
+)
+
+
+def _playing_room() -> dict:
+    state = create_bot_room("r", {"id": "p1"}, seed=2)
+    for action in (
+        {"type": "choose_start_checkpoint", "playerId": "p1", "checkpointTerritoryId": "lysaker_cp"},
+        {"type": "end_turn", "playerId": "p1"},
+        {"type": "choose_start_checkpoint", "playerId": BOT_PLAYER_ID, "checkpointTerritoryId": "kolbotn_cp"},
+        {"type": "end_turn", "playerId": BOT_PLAYER_ID},
+    ):
+        state, error = apply_action(state, action)
+        assert error is None
+    return state
+
+
+def test_nobody_to_move_before_start():
+    assert legal_summary(create_waiting_room("r", {"id": "p1"})) is None
+    assert legal_actions(create_waiting_room("r", {"id": "p1"})) == []
+
+
+def test_setup_offers_checkpoints_then_end_turn():
+    state = create_bot_room("r", {"id": "p1"}, seed=2)
+    summary = legal_summary(state)
+    assert summary["side"] == "red"
+    assert summary["checkpoints"] == list(CHECKPOINT_IDS)
+    assert not summary["endTurn"] and not summary["rollDice"]
+
+    state, _ = apply_action(state, legal_actions(state)[0])
+    assert legal_summary(state)["endTurn"]
+
+
+def test_attacks_are_exactly_those_mvp_accepts():
+    state = _playing_room()
+    for _ in range(3):
+        expected = set()
+        for a in TERRITORY_IDS:
+            for b in TERRITORY_IDS:
+                _, error = attack(search_state(state), "p1", a, b)
+                if error is None:
+                    expected.add((a, b))
+        assert set(legal_attacks(state, "red")) == expected
+        if not expected:
+            break
+        state, _ = attack(state, "p1", *sorted(expected)[0])
+
+
+def test_every_listed_action_applies():
+    state = _playing_room()
+    state, _ = apply_action(state, {"type": "roll_dice", "playerId": "p1"})
+    actions = legal_actions(state)
+    assert {a["type"] for a in actions} == {"move", "attack", "end_turn", "forfeit"}
+    for action in actions:
+        _, error = apply_action(search_state(state), action)
+        assert error is None, action
+
+
+def test_public_state_carries_the_summary_and_masks_track_ownership():
+    state = _playing_room()
+    assert public_state(state)["legalActions"] == legal_summary(state)
+    assert public_state(state)["legalActions"]["rollDice"]
+
+    board = get_board(state)
+    for side in (None, "red", "blue"):
+        assert board.mask(side) == sum(1 << i for i in range(len(TERRITORY_IDS)) if board.owner(i) == side)
@@ -0,0 +1,207 @@
+"""Tests for Oslo Conquest room reaping and archiving (oslo_conquest.lifecycle)."""
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+
+from oslo_conquest import consumers, lifecycle
+from oslo_conquest.consumers import OsloConquestConsumer, _rooms
+from oslo_conquest.models import ArchivedGame
+from oslo_conquest.mvp import (
+    add_player,
+    apply_action,
+    create_bot_room,
+    create_waiting_room,
+    forfeit,
+    game_map,
+    get_board,
+)
+from oslo_conquest.rooms import RoomRegistry
+from portal import metrics
+
+TTLS = lifecycle.ROOM_TTLS_S
+
+
+def _started_room(room: str) -> dict:
+    state = create_waiting_room(room, {"id": f"{room}-1", "name": "Ola"})
+    state, _ = add_player(state, {"id": f"{room}-2", "name": "Kari"})
+    return state
+
+
+def _won_by_conquest(room: str) -> dict:
+    """A started room where red takes the territory that puts it over the win line."""
+    state = _started_room(room)
+    for player in state["players"]:
+        for action in ({"type": "choose_start_checkpoint", "checkpointTerritoryId": "lysaker_cp"},
+                       {"type": "end_turn"}):
+            state, error = apply_action(state, {**action, "playerId": player["id"]})
+            assert error is None
+    gmap, board = game_map(state), get_board(state)
+    land = [t for t in gmap.territory_ids if t not in gmap.checkpoint_set]
+    from_id = next(t for t in land if any(n in land for n in gmap.neighbors[t]))
+    to_id = next(n for n in gmap.neighbors[from_id] if n in land)
+    threshold = int(len(gmap.territory_ids) * 0.6 + 0.999999)
+    for tid in [from_id] + [t for t in land if t not in (from_id, to_id)]:
+        if board.count("red") == threshold - 1:
+            break
+        board.set_owner(gmap.territory_index[tid], "red")
+    board.set_owner(gmap.territory_index[to_id], "blue")
+    board.units[gmap.territory_index[from_id]] = 2
+    board.units[gmap.territory_index[to_id]] = 1
+    state, error = apply_action(state, {"type": "attack", "playerId": f"{room}-1",
+                                        "fromTerritoryId": from_id, "toTerritoryId": to_id})
+    assert error is None
+    return state
+
+
+def _registry() -> RoomRegistry:
+    rooms = RoomRegistry()
+    rooms["waiting"] = create_waiting_room("waiting", {"id": "w1", "name": "Ola"})
+    rooms["bot"] = create_bot_room("bot", {"id": "b1", "name": "Ola"})
+    rooms["game"] = _started_room("game")
+    rooms["done"], _ = forfeit(_started_room("done"), "done-1")
+    return rooms
+
+
+def test_nothing_is_reaped_while_rooms_are_fresh():
+    rooms = _registry()
+    assert lifecycle.reap(rooms) == ([], [])
+    assert len(rooms) == 4
+
+
+def test_ttls_apply_per_kind_of_room():
+    rooms = _registry()
+    now = time.monotonic()
+
+    evicted, finished = lifecycle.reap(rooms, now + TTLS["waiting"])
+    assert evicted == [("waiting", "waiting")]
+
+    evicted, finished = lifecycle.reap(rooms, now + TTLS["finished"])
+    assert evicted == [("done", "finished")]
+    assert [s["room"] for s in finished] == ["done"]
+
+    evicted, _ = lifecycle.reap(rooms, now + TTLS["bot"])
+    assert evicted == [("bot", "bot")]
+
+    evicted, _ = lifecycle.reap(rooms, now + TTLS["abandoned"])
+    assert evicted == [("game", "abandoned")]
+    assert rooms.room_of("game-1") is None
+
+
+def test_connected_rooms_are_kept_until_the_hard_cap():
+    rooms = _registry()
+    rooms.add_member("waiting", +1)
+    now = time.monotonic()
+
+    lifecycle.reap(rooms, now + TTLS["abandoned"])
+    assert list(rooms) == ["waiting"]
+
+    assert lifecycle.reap(rooms, now + TTLS["idle"])[0] == [("waiting", "idle")]
+
+
+def test_ttls_can_be_overridden_in_settings(settings):
+    settings.OSLO_CONQUEST_ROOM_TTLS = {"waiting": 1}
+    rooms = _registry()
+    evicted, _ = lifecycle.reap(rooms, time.monotonic() + 1)
+    assert evicted == [("waiting", "waiting")]
+
+
+@pytest.mark.django_db
+def test_finished_games_are_archived():
+    rooms = _registry()
+    _, finished = lifecycle.reap(rooms, time.monotonic() + TTLS["finished"])
+
+    assert lifecycle.archive(finished) == 1
+    game = ArchivedGame.objects.get()
+    assert game.room == "done"
+    assert game.winner == "blue"
+    assert [p["id"] for p in game.players] == ["done-1", "done-2"]
+    assert game.final_state["phase"] == "finished"
+    assert len(game.final_state["territories"]) == 40
+    assert game.log[0]["seq"] == len(game.log)
+
+
+@pytest.mark.django_db
+def test_game_won_by_conquest_is_archived():
+    rooms = RoomRegistry()
+    rooms["won"] = _won_by_conquest("won")
+    assert (rooms["won"]["winner"], rooms["won"]["phase"]) == ("red", "finished")
+
+    evicted, finished = lifecycle.reap(rooms, time.monotonic() + TTLS["finished"])
+    assert evicted == [("won", "finished")]
+    assert lifecycle.archive(finished) == 1
+    game = ArchivedGame.objects.get()
+    assert (game.room, game.winner) == ("won", "red")
+    assert game.final_state["phase"] == "finished"
+
+
+def test_approx_size_leaves_out_the_shared_map():
+    board = get_board(_started_room("oslo-1"))
+    assert lifecycle.approx_size(board.map) == 0
+    assert lifecycle.approx_size(board) < 4096         # the map alone is ~150 KB
+
+
+def test_room_gauges_are_exposed():
+    _rooms.clear()
+    _rooms["oslo-1"] = _started_room("oslo-1")
+    lifecycle.reap(_rooms)                  # measures approx_bytes
+    gauges = metrics.snapshot()["gauges"]
+    assert gauges["oslo.rooms.total"] == 1
+    assert gauges["oslo.rooms.approx_bytes"] > 0
+    _rooms.clear()
+
+
+def test_evicting_a_room_drops_its_member_count():
+    rooms = _registry()
+    rooms.add_member("game", +1)
+    del rooms["game"]
+    rooms["game"] = _started_room("game")
+    assert rooms.members("game") == 0
+
+
+@pytest.mark.django_db
+def test_sockets_in_an_evicted_room_are_detached():
+    async def run():
+        player = WebsocketCommunicator(OsloConquestConsumer.as_asgi(), "/ws/oslo-conquest/")
+        await player.connect()
+        await player.receive_json_from()
+        await player.send_json_to({"type": "create_game", "room": "oslo-1", "player": {"id": "p1", "name": "Ola"}})
+        await player.receive_json_from()
+        evicted = await consumers.reap_rooms(time.monotonic() + TTLS["idle"])
+        message = await player.receive_json_from()
+        while message["type"] != "error":
+            message = await player.receive_json_from()
+        _rooms["oslo-1"] = create_waiting_room("oslo-1", {"id": "p2", "name": "Kari"})
+        _rooms.add_member("oslo-1", +1)
+        await player.disconnect()
+        return evicted, message
+
+    _rooms.clear()
+    evicted, message = async_to_sync(run)()
+    assert evicted == [("oslo-1", "idle")]
+    assert message == {"type": "error", "message": 'Rom "oslo-1" finnes ikke lenger.'}
+    assert _rooms.members("oslo-1") == 1     # the old socket's disconnect didn't count against the new room
+    _rooms.clear()
+
+
+@pytest.mark.django_db
+def test_reaped_room_is_removed_from_the_lobby():
+    async def run():
+        lobby = WebsocketCommunicator(OsloConquestConsumer.as_asgi(), "/ws/oslo-conquest/")
+        await lobby.connect()
+        await lobby.receive_json_from()
+        _rooms["oslo-1"] = create_waiting_room("oslo-1", {"id": "p1", "name": "Ola"})
+        _rooms.pop_changes()
+
+        evicted = await consumers.reap_rooms(time.monotonic() + TTLS["waiting"])
+        removed = await lobby.receive_json_from()
+        await lobby.disconnect()
+        return evicted, removed
+
+    _rooms.clear()
+    _rooms.pop_changes()
+    evicted, removed = async_to_sync(run)()
+    assert evicted == [("oslo-1", "waiting")]
+    assert removed["type"] == "room_removed"
+    assert removed["room"] == "oslo-1"
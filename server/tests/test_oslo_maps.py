@@ -0,0 +1,117 @@
+"""Tests for map loading, validation and the compiled-map cache (oslo_conquest.maps)."""
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from oslo_conquest import maps, persistence
+from oslo_conquest.mvp import add_player, apply_action, create_waiting_room, game_map, get_board, legal_summary
+
+from .test_oslo_conquest_consumer import connect_consumer, receive_non_room_list
+
+# A ring of six with a checkpoint on each side:  a - b - c - d - e - f - a
+_RING = {
+    "territories": ["a", "b", "c", "d", "e", "f", "cp1", "cp2"],
+    "checkpoints": ["cp2", "cp1"],
+    "startTerritories": {"red": "a", "blue": "d"},
+    "adjacency": {
+        "a": ["b", "f"], "b": ["a", "c", "cp1"], "c": ["b", "d"], "d": ["c", "e"],
+        "e": ["d", "f", "cp2"], "f": ["e", "a"], "cp1": ["b"], "cp2": ["e"],
+    },
+}
+
+
+@pytest.fixture
+def ring(tmp_path, settings):
+    """The ring as map "ring", with the compiled cache in tmp_path."""
+    path = tmp_path / "ring.json"
+    path.write_text(json.dumps({"graph": _RING}))
+    settings.OSLO_CONQUEST_MAPS = {"ring": str(path)}
+    settings.OSLO_CONQUEST_MAP_CACHE = str(tmp_path / "cache")
+    maps._maps.pop("ring", None)
+    yield path
+    maps._maps.pop("ring", None)
+
+
+def _graph(**changes) -> dict:
+    return {**json.loads(json.dumps(_RING)), **changes}
+
+
+def test_default_map_is_the_client_map_json():
+    graph = json.loads(maps.MAPS[maps.DEFAULT_MAP].read_text())["graph"]
+    default = maps.get()
+    assert default.territory_ids == tuple(graph["territories"])
+    assert default.checkpoint_sequence == ("lysaker_cp", "kolbotn_cp", "lørenskog_cp")
+    assert default.checkpoint_ids == ("lørenskog_cp", "lysaker_cp", "kolbotn_cp")
+
+
+@pytest.mark.parametrize("graph, problem", [
+    (_graph(adjacency={**_RING["adjacency"], "a": ["b", "f", "c"]}), "'a' borders 'c' but not the other way round"),
+    (_graph(adjacency={**_RING["adjacency"], "a": ["a", "b", "f"]}), "borders itself"),
+    (_graph(adjacency={**_RING["adjacency"], "a": ["b", "f", "zz"]}), "unknown territory 'zz'"),
+    (_graph(startTerritories={"red": "cp1", "blue": "d"}), "start territory 'cp1'"),
+    (_graph(checkpoints=["cp1", "nope"]), "checkpoint 'nope' is not a territory"),
+    (_graph(territories=[*_RING["territories"], "island"]), "not connected: island"),
+])
+def test_validation_reports_what_is_wrong(graph, problem):
+    with pytest.raises(maps.MapError, match=problem):
+        maps.validate(graph)
+
+
+def test_compiled_map_is_cached_by_file_hash(ring, monkeypatch):
+    first = maps.load("ring")
+    cached = list((ring.parent / "cache").iterdir())
+    assert len(cached) == 1
+
+    def no_compiling(graph):
+        raise AssertionError("compiled again")
+
+    monkeypatch.setattr(maps, "compile_graph", no_compiling)
+    again = maps.load("ring")
+    assert again.distances == first.distances
+    assert again.distance("a", "d") == 3
+
+    # A changed file has a new hash, so it is validated and compiled again.
+    ring.write_text(json.dumps({"graph": _graph(adjacency={**_RING["adjacency"], "a": ["b"], "f": ["e"]})}))
+    with pytest.raises(AssertionError, match="compiled again"):
+        maps.load("ring")
+
+
+def test_broken_map_file_is_rejected(ring):
+    ring.write_text(json.dumps({"graph": _graph(startTerritories={"red": "a"})}))
+    with pytest.raises(maps.MapError, match="at least two start territories"):
+        maps.load("ring")
+    with pytest.raises(maps.MapError, match="unknown map"):
+        maps.load("atlantis")
+
+
+@pytest.mark.django_db
+def test_rooms_play_on_their_own_map(ring):
+    state = create_waiting_room("r", {"id": "p1"}, seed=3, map_id="ring")
+    state, _ = add_player(state, {"id": "p2"})
+    assert state["map"] == "ring"
+    assert len(get_board(state).owners) == 8
+    assert legal_summary(state)["checkpoints"] == ["cp1", "cp2"]
+
+    state, error = apply_action(state, {"type": "choose_start_checkpoint", "playerId": "p1",
+                                        "checkpointTerritoryId": "cp1"})
+    assert error is None
+    assert state["players"][0]["nextCheckpoint"] == "cp2"
+
+    persistence.snapshot("r", state)
+    persistence.flush()
+    restored = persistence.load("r")
+    assert game_map(restored).map_id == "ring"
+    assert set(restored["board"].to_territories()) == set(_RING["territories"])
+
+
+@pytest.mark.django_db
+def test_create_game_rejects_an_unknown_map():
+    async def run():
+        communicator = await connect_consumer()
+        await communicator.send_json_to({"type": "create_game", "room": "r", "player": {"id": "p1"}, "map": "atlantis"})
+        message = await receive_non_room_list(communicator)
+        await communicator.disconnect()
+        return message
+
+    assert async_to_sync(run)() == {"type": "error", "message": 'Ukjent kart "atlantis"'}
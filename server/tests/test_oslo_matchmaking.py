@@ -0,0 +1,156 @@
+"""Tests for the Oslo Conquest matchmaking queue (oslo_conquest.matchmaking) in the consumer."""
+import pytest
+from asgiref.sync import async_to_sync
+
+from oslo_conquest import consumers, matchmaking
+from oslo_conquest.consumers import _rooms
+from portal import metrics
+
+from .test_oslo_conquest_consumer import connect_consumer, receive_non_room_list
+
+
+@pytest.fixture(autouse=True)
+def _fresh():
+    _rooms.clear()
+    _rooms.pop_changes()
+    yield
+    matchmaking._queues.clear()
+    matchmaking._timers.clear()
+    _rooms.clear()
+
+
+async def _seat_noop(room: str) -> bool:
+    return True
+
+
+def test_queue_takes_the_oldest_tickets_in_order():
+    async def run():
+        tickets = [matchmaking.Ticket({"id": f"p{i}"}, 3, _seat_noop) for i in range(4)]
+        assert matchmaking.join(tickets[0]) is None
+        assert matchmaking.join(tickets[1]) is None
+        assert matchmaking.depth(3) == 2
+        assert matchmaking.leave("p1", 3)
+        assert not matchmaking.leave("p1", 3)
+        assert matchmaking.join(tickets[2]) is None
+        matched = matchmaking.join(tickets[3])
+        return matched
+
+    matched = async_to_sync(run)()
+    assert [t.player_id for t in matched] == ["p0", "p2", "p3"]
+    assert matchmaking.depth() == 0
+    assert metrics.percentiles("oslo.matchmaking.wait_ms")["count"] >= 3
+
+
+@pytest.mark.django_db
+def test_two_waiting_players_are_paired_in_a_new_room():
+    async def run():
+        first = await connect_consumer()
+        await first.send_json_to({"type": "find_game", "player": {"id": "p1", "name": "Ola"}})
+        queued = await receive_non_room_list(first)
+        second = await connect_consumer()
+        await second.send_json_to({"type": "find_game", "player": {"id": "p2", "name": "Kari"}})
+        messages = [await receive_non_room_list(comm) for comm in (first, first, second, second)]
+        await first.disconnect()
+        await second.disconnect()
+        return queued, messages
+
+    queued, (matched, state, matched_too, state_too) = async_to_sync(run)()
+    assert queued == {"type": "queued", "maxPlayers": 2, "depth": 1}
+    assert matched["type"] == "matched"
+    assert matched_too == matched
+    assert state["type"] == "game_state"
+    assert state["state"]["room"] == matched["room"]
+    assert state["state"]["phase"] == "setup"
+    assert [p["id"] for p in state_too["state"]["players"]] == ["p1", "p2"]
+    assert matchmaking.depth() == 0
+
+
+@pytest.mark.django_db
+def test_a_lone_player_gets_bots_after_the_timeout(monkeypatch):
+    monkeypatch.setattr(matchmaking, "BOT_FILL_AFTER_S", 0.05)
+
+    async def run():
+        comm = await connect_consumer()
+        await comm.send_json_to({"type": "find_game", "player": {"id": "p1", "name": "Ola"}, "maxPlayers": 3})
+        await receive_non_room_list(comm)
+        matched = await receive_non_room_list(comm)
+        state = await receive_non_room_list(comm)
+        await comm.disconnect()
+        return matched, state
+
+    matched, state = async_to_sync(run)()
+    assert matched["type"] == "matched"
+    players = state["state"]["players"]
+    assert [(p["id"], p["isBot"]) for p in players] == [("p1", False), ("bot-blue", True), ("bot-green", True)]
+    assert state["state"]["phase"] == "setup"
+
+
+@pytest.mark.django_db
+def test_cancel_and_double_queueing():
+    async def run():
+        comm = await connect_consumer()
+        await comm.send_json_to({"type": "find_game", "player": {"id": "p1", "name": "Ola"}})
+        await receive_non_room_list(comm)
+        await comm.send_json_to({"type": "find_game", "player": {"id": "p1", "name": "Ola"}})
+        twice = await receive_non_room_list(comm)
+        await comm.send_json_to({"type": "cancel_find"})
+        cancelled = await receive_non_room_list(comm)
+        depth = matchmaking.depth()
+        await comm.disconnect()
+        return twice, cancelled, depth
+
+    twice, cancelled, depth = async_to_sync(run)()
+    assert twice == {"type": "error", "message": "Du står allerede i kø"}
+    assert cancelled == {"type": "find_cancelled"}
+    assert depth == 0
+
+
+@pytest.mark.django_db
+def test_disconnect_leaves_the_queue():
+    async def run():
+        comm = await connect_consumer()
+        await comm.send_json_to({"type": "find_game", "player": {"id": "p1", "name": "Ola"}})
+        await receive_non_room_list(comm)
+        await comm.disconnect()
+
+    async_to_sync(run)()
+    assert matchmaking.depth() == 0
+
+
+def test_a_player_who_left_while_being_matched_is_dropped_and_the_rest_requeued():
+    seated = []
+
+    async def seat(room: str) -> bool:
+        seated.append(room)
+        return True
+
+    async def run():
+        first, second = (matchmaking.Ticket({"id": f"p{i}"}, 2, seat) for i in range(2))
+        matchmaking.join(first)
+        matched = matchmaking.join(second)
+        matchmaking.cancel(first)
+        await consumers._start_match(matched, 2)
+        state = matchmaking.depth(2), matchmaking.is_queued("p1")
+        for task in matchmaking._timers.values():
+            task.cancel()
+        return state
+
+    assert async_to_sync(run)() == (1, True)
+    assert seated == []
+    assert not _rooms
+
+
+def test_a_socket_gone_by_seating_time_loses_its_seat_to_a_bot():
+    async def gone(room: str) -> bool:
+        return False
+
+    async def run():
+        tickets = [matchmaking.Ticket({"id": "p0"}, 2, gone), matchmaking.Ticket({"id": "p1"}, 2, _seat_noop)]
+        await consumers._start_match(tickets, 2)
+        for room in list(_rooms):
+            consumers._cancel_bot_turn(room)
+
+    async_to_sync(run)()
+    (room, state), = _rooms.items()
+    assert room.startswith("match-") and len(room) == len("match-") + 12
+    assert [(p["id"], p.get("isBot", False)) for p in state["players"]] == [("p1", False), ("bot-blue", True)]
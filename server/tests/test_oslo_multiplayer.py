@@ -0,0 +1,200 @@
+"""Tests for Oslo Conquest rooms with more than two players (oslo_conquest.mvp)."""
+import pytest
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+
+from oslo_conquest import consumers, maps, persistence, replay
+from oslo_conquest.consumers import OsloConquestConsumer, _rooms
+from oslo_conquest.mvp import (
+    MAX_PLAYERS,
+    add_player,
+    apply_action,
+    create_waiting_room,
+    fill_with_bots,
+    public_state,
+    seats,
+    summarize_room,
+)
+
+
+def _room(players: int) -> dict:
+    state = create_waiting_room("oslo-1", {"id": "p0", "name": "P0"}, seed=3, size=players)
+    for i in range(1, players):
+        state, error = add_player(state, {"id": f"p{i}", "name": f"P{i}"})
+        assert error is None
+    return state
+
+
+def _act(state: dict, kind: str, player_id: str, **fields) -> dict:
+    state, error = apply_action(state, {"type": kind, "playerId": player_id, **fields})
+    assert error is None, (kind, player_id, error)
+    return state
+
+
+def _through_setup(state: dict) -> dict:
+    for player in list(state["players"]):
+        if player.get("eliminated"):
+            continue
+        state = _act(state, "choose_start_checkpoint", player["id"], checkpointTerritoryId="lysaker_cp")
+        state = _act(state, "end_turn", player["id"])
+    return state
+
+
+def test_room_waits_until_every_seat_is_taken():
+    state = _room(3)
+    assert state["phase"] == "setup"
+    assert [p["side"] for p in state["players"]] == ["red", "blue", "green"]
+    assert state["players"][2]["colorName"] == "Grønn"
+
+    waiting = create_waiting_room("oslo-2", {"id": "a"}, size=4)
+    waiting, _ = add_player(waiting, {"id": "b"})
+    assert waiting["phase"] == "waiting"
+    assert summarize_room("oslo-2", waiting)["maxPlayers"] == 4
+    assert summarize_room("oslo-2", waiting)["status"] == "waiting"
+
+    full = _room(2)
+    _, error = add_player(full, {"id": "late"})
+    assert error == "Rommet er fullt"
+
+
+@pytest.mark.parametrize("size", [1, MAX_PLAYERS + 1])
+def test_room_size_must_fit_the_map(size):
+    with pytest.raises(ValueError):
+        create_waiting_room("oslo-3", {"id": "a"}, size=size)
+
+
+def test_every_seated_side_gets_its_start_territory():
+    state = _room(MAX_PLAYERS)
+    board = state["board"]
+    gmap = maps.get()
+    assert board.sides == ("red", "blue", "green", "orange", "purple", "cyan")
+    for side in board.sides:
+        assert board.owner(gmap.territory_index[gmap.start_territories[side]]) == side
+        assert board.count(side) == 1
+    assert seats(gmap) == MAX_PLAYERS
+
+
+def test_turns_go_round_the_ring_in_seating_order():
+    state = _through_setup(_room(4))
+    assert state["phase"] == "playing"
+    order = []
+    for _ in range(6):
+        side = state["activePlayer"]
+        order.append(side)
+        player = next(p for p in state["players"] if p["side"] == side)
+        state = _act(state, "end_turn", player["id"])
+    assert order == ["red", "blue", "green", "orange", "red", "blue"]
+
+
+def test_forfeit_in_a_three_player_room_skips_the_player():
+    state = _through_setup(_room(3))
+    state = _act(state, "forfeit", "p0")          # red is to move
+    assert state["phase"] == "playing"
+    assert state.get("winner") is None
+    assert state["activePlayer"] == "blue"
+    assert state["players"][0]["eliminated"] is True
+
+    state = _act(state, "end_turn", "p1")
+    assert state["activePlayer"] == "green"
+    state = _act(state, "end_turn", "p2")
+    assert state["activePlayer"] == "blue"
+
+    _, error = apply_action(state, {"type": "forfeit", "playerId": "p0"})
+    assert error == "Du har allerede gitt opp"
+
+    state = _act(state, "forfeit", "p2")
+    assert state["winner"] == "blue"
+    assert state["phase"] == "finished"
+
+
+def test_forfeit_during_setup_hands_the_choice_on():
+    state = _room(3)
+    state = _act(state, "choose_start_checkpoint", "p0", checkpointTerritoryId="lysaker_cp")
+    state = _act(state, "end_turn", "p0")
+    state = _act(state, "forfeit", "p1")
+    assert state["phase"] == "setup"
+    assert state["activePlayer"] == "green"
+    state = _act(state, "choose_start_checkpoint", "p2", checkpointTerritoryId="kolbotn_cp")
+    state = _act(state, "end_turn", "p2")
+    assert state["phase"] == "playing"
+    assert state["activePlayer"] == "red"
+
+
+def test_multiplayer_room_survives_persistence_and_replay():
+    state = _through_setup(_room(4))
+    restored = persistence.decode_room(persistence.encode_room(state))
+    assert public_state(restored) == public_state(state)
+    assert restored["board"].sides == state["board"].sides
+
+    actions = [{"type": "choose_start_checkpoint", "playerId": f"p{i}", "checkpointTerritoryId": "lysaker_cp"}
+               if step == 0 else {"type": "end_turn", "playerId": f"p{i}"}
+               for i in range(4) for step in range(2)]
+    *_, (_, final) = replay.states(replay.record(state, actions))
+    assert final["maxPlayers"] == 4
+    assert public_state(final)["players"] == public_state(state)["players"]
+
+
+def test_each_bot_in_a_row_gets_its_own_action_allowance(monkeypatch):
+    async def end_turn(room_state, player_id):
+        return {"type": "end_turn", "playerId": player_id}
+
+    monkeypatch.setattr(consumers, "BOT_MAX_ACTIONS", 1)
+    monkeypatch.setattr(consumers.bot_search, "think", end_turn)
+    state = fill_with_bots(create_waiting_room("bots", {"id": "p0", "name": "P0"}, size=4))
+    _rooms.clear()
+    _rooms["bots"] = _act(_through_setup(state), "end_turn", "p0")
+    assert _rooms["bots"]["activePlayer"] == "blue"
+
+    async_to_sync(consumers._play_bot_turn)("bots")
+    assert _rooms["bots"]["activePlayer"] == "red"
+    _rooms.clear()
+
+
+async def _think_raises(room_state, player_id):
+    raise RuntimeError("worker died")
+
+
+async def _think_nothing(room_state, player_id):
+    return None
+
+
+async def _think_illegal(room_state, player_id):
+    return {"type": "move", "playerId": player_id, "territoryId": "nowhere"}
+
+
+@pytest.mark.parametrize("think", [_think_raises, _think_nothing, _think_illegal])
+def test_a_bot_that_cannot_act_passes_its_turn(monkeypatch, think):
+    monkeypatch.setattr(consumers.bot_search, "think", think)
+    state = fill_with_bots(create_waiting_room("bots", {"id": "p0", "name": "P0"}, size=4))
+    _rooms.clear()
+    _rooms["bots"] = _act(_through_setup(state), "end_turn", "p0")
+    assert _rooms["bots"]["activePlayer"] == "blue"
+
+    async_to_sync(consumers._play_bot_turn)("bots")
+    assert _rooms["bots"]["activePlayer"] == "red"
+    _rooms.clear()
+
+
+@pytest.mark.django_db
+def test_create_game_takes_max_players():
+    _rooms.clear()
+
+    async def run():
+        communicator = WebsocketCommunicator(OsloConquestConsumer.as_asgi(), "/ws/oslo-conquest/")
+        await communicator.connect()
+        await communicator.receive_json_from()
+        await communicator.send_json_to({"type": "create_game", "room": "big", "maxPlayers": 9,
+                                         "player": {"id": "p1", "name": "Ola"}})
+        too_many = await communicator.receive_json_from()
+        await communicator.send_json_to({"type": "create_game", "room": "big", "maxPlayers": 4,
+                                         "player": {"id": "p1", "name": "Ola"}})
+        created = await communicator.receive_json_from()
+        await communicator.disconnect()
+        return too_many, created
+
+    too_many, created = async_to_sync(run)()
+    assert too_many == {"type": "error", "message": f"Antall spillere må være mellom 2 og {MAX_PLAYERS}"}
+    assert created["type"] == "game_state"
+    assert created["state"]["maxPlayers"] == 4
+    assert created["state"]["phase"] == "waiting"
+    _rooms.clear()
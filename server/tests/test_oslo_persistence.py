@@ -0,0 +1,168 @@
+"""Tests for Oslo Conquest snapshots, journal and lazy restore (oslo_conquest.persistence)."""
+import pytest
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+
+from oslo_conquest import persistence
+from oslo_conquest.consumers import OsloConquestConsumer, _rooms
+from oslo_conquest.models import RoomJournal, RoomSnapshot
+from oslo_conquest.mvp import add_player, apply_action, create_waiting_room, public_state
+
+
+def _started_room() -> dict:
+    state = create_waiting_room("oslo-1", {"id": "p1", "name": "Ola"})
+    state, _ = add_player(state, {"id": "p2", "name": "Kari"})
+    return state
+
+
+def _play(state: dict, record: bool = True) -> dict:
+    actions = [
+        {"type": "choose_start_checkpoint", "playerId": "p1", "checkpointTerritoryId": "lørenskog_cp"},
+        {"type": "end_turn", "playerId": "p1"},
+        {"type": "choose_start_checkpoint", "playerId": "p2", "checkpointTerritoryId": "lysaker_cp"},
+        {"type": "end_turn", "playerId": "p2"},
+        {"type": "roll_dice", "playerId": "p1"},
+    ]
+    for action in actions:
+        state, error = apply_action(state, action)
+        assert error is None, action
+        if record:
+            persistence.record("oslo-1", state, action)
+    red = next(p for p in state["players"] if p["id"] == "p1")
+    action = {"type": "move", "playerId": "p1", "toTerritoryId": red["validMoves"][0]}
+    state, _ = apply_action(state, action)
+    if record:
+        persistence.record("oslo-1", state, action)
+    return state
+
+
+def test_compact_encoding_round_trips():
+    state = _play(_started_room(), record=False)
+    restored = persistence.decode_room(persistence.encode_room(state))
+    assert public_state(restored) == public_state(state)
+    assert restored["board"].owned == state["board"].owned
+
+
+@pytest.mark.django_db
+def test_snapshot_and_journal_are_replayed_on_load():
+    state = _started_room()
+    persistence.snapshot("oslo-1", state)
+    state = _play(state)
+    assert RoomSnapshot.objects.count() == 0          # nothing written until flush
+
+    assert persistence.flush() == 1
+    assert RoomSnapshot.objects.get().seq == 0
+    assert RoomJournal.objects.count() == 6
+    assert RoomJournal.objects.get(seq=5).action == {"type": "roll_dice", "playerId": "p1"}
+
+    restored = persistence.load("oslo-1")
+    assert public_state(restored) == public_state(state)
+    assert restored["rng"] == state["rng"]
+    assert persistence.load("missing") is None
+
+
+@pytest.mark.django_db
+def test_journal_rolls_over_into_a_new_snapshot(monkeypatch):
+    monkeypatch.setattr(persistence, "SNAPSHOT_EVERY", 4)
+    state = _started_room()
+    persistence.snapshot("oslo-1", state)
+    state = _play(state)
+    persistence.flush()
+
+    assert RoomSnapshot.objects.get().seq == 4
+    # The journal is kept whole for replays; load starts after the snapshot.
+    assert list(RoomJournal.objects.values_list("seq", flat=True)) == [1, 2, 3, 4, 5, 6]
+    assert public_state(persistence.load("oslo-1")) == public_state(state)
+    assert [a["type"] for a in persistence.history("oslo-1")][:2] == ["choose_start_checkpoint", "end_turn"]
+
+
+@pytest.mark.django_db
+def test_forget_drops_the_stored_room():
+    persistence.snapshot("oslo-1", _started_room())
+    persistence.flush()
+    persistence.forget("oslo-1")
+    persistence.flush()
+    assert not RoomSnapshot.objects.exists()
+
+
+def _restart() -> None:
+    with persistence._lock:
+        persistence._seq.clear()
+        persistence._since_snapshot.clear()
+
+
+@pytest.mark.django_db
+def test_new_game_under_a_reused_name_replaces_the_old_one():
+    persistence.snapshot("oslo-1", _started_room())
+    _play(_started_room())
+    persistence.flush()
+    _restart()
+
+    state = _started_room()
+    persistence.start("oslo-1")
+    persistence.snapshot("oslo-1", state)
+    action = {"type": "choose_start_checkpoint", "playerId": "p1", "checkpointTerritoryId": "lysaker_cp"}
+    state, _ = apply_action(state, action)
+    persistence.record("oslo-1", state, action)
+
+    assert persistence.flush() == 1
+    assert list(RoomJournal.objects.values_list("seq", flat=True)) == [1]
+    assert public_state(persistence.load("oslo-1")) == public_state(state)
+    assert persistence.history("oslo-1") == [action]
+
+
+@pytest.mark.django_db
+def test_a_failing_room_does_not_drop_the_others():
+    RoomJournal.objects.create(room="bad", seq=1, action={})
+    persistence.snapshot("bad", _started_room())
+    persistence.record("bad", _started_room(), {"type": "end_turn", "playerId": "p1"})
+    persistence.snapshot("oslo-1", _started_room())
+
+    assert persistence.flush() == 1
+    assert list(RoomSnapshot.objects.values_list("room", flat=True)) == ["oslo-1"]
+    assert persistence._pending["bad"]["journal"] == [(1, {"type": "end_turn", "playerId": "p1"})]
+
+
+@pytest.mark.django_db
+def test_a_failed_write_is_retried_on_the_next_flush(monkeypatch):
+    write_room = persistence._write_room
+
+    def fail_once(room, entry):
+        monkeypatch.setattr(persistence, "_write_room", write_room)
+        raise RuntimeError("database is locked")
+
+    state = _started_room()
+    persistence.start("oslo-1")
+    persistence.snapshot("oslo-1", state)
+    monkeypatch.setattr(persistence, "_write_room", fail_once)
+    state = _play(state)
+    assert persistence.flush() == 0
+
+    assert persistence.flush() == 1
+    assert RoomSnapshot.objects.get().seq == 0
+    assert list(RoomJournal.objects.values_list("seq", flat=True)) == [1, 2, 3, 4, 5, 6]
+    assert public_state(persistence.load("oslo-1")) == public_state(state)
+
+
+@pytest.mark.django_db
+def test_rejoin_restores_a_room_that_is_not_in_memory():
+    state = _started_room()
+    persistence.snapshot("oslo-1", state)
+    state = _play(state)
+    persistence.flush()
+    _rooms.clear()
+
+    async def run():
+        communicator = WebsocketCommunicator(OsloConquestConsumer.as_asgi(), "/ws/oslo-conquest/")
+        await communicator.connect()
+        await communicator.receive_json_from()
+        await communicator.send_json_to({"type": "rejoin_game", "room": "oslo-1", "playerId": "p2"})
+        message = await communicator.receive_json_from()
+        await communicator.disconnect()
+        return message
+
+    message = async_to_sync(run)()
+    assert message["type"] == "game_state"
+    assert message["state"]["players"] == public_state(state)["players"]
+    assert "oslo-1" in _rooms
+    _rooms.clear()
@@ -0,0 +1,107 @@
+"""Tests for archived-game replays (oslo_conquest.replay) and the games API."""
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+
+from oslo_conquest import lifecycle, persistence, replay
+from oslo_conquest.models import ArchivedGame
+from oslo_conquest.mvp import add_player, apply_action, create_waiting_room, get_board, legal_actions
+
+from .test_oslo_conquest_consumer import connect_consumer
+
+
+def _finished_game(actions: int = 40) -> dict:
+    """A two-player game played through persistence, ending in a forfeit."""
+    state = create_waiting_room("oslo-1", {"id": "p1", "name": "Ola"}, seed=7)
+    persistence.snapshot("oslo-1", state)
+    state, _ = add_player(state, {"id": "p2", "name": "Kari"})
+    persistence.snapshot("oslo-1", state)
+    for _ in range(actions):
+        options = [a for a in legal_actions(state) if a["type"] != "forfeit"]
+        action = options[-1]
+        state, error = apply_action(state, action)
+        assert error is None
+        persistence.record("oslo-1", state, action)
+    action = {"type": "forfeit", "playerId": "p1"}
+    state, _ = apply_action(state, action)
+    persistence.record("oslo-1", state, action)
+    return state
+
+
+@pytest.mark.django_db
+def test_archived_game_replays_to_its_final_state():
+    state = _finished_game()
+    assert lifecycle.archive([state]) == 1
+    game = ArchivedGame.objects.get()
+    assert game.replay["seed"] == 7
+    assert len(game.replay["actions"]) == 41
+
+    steps = list(replay.states(game.replay))
+    step, final = steps[-1]
+    assert step == 41
+    assert final["winner"] == "blue"
+    assert bytes(get_board(final).owners) == bytes(get_board(state).owners)
+    assert final["players"] == state["players"]
+
+
+@pytest.mark.django_db
+def test_incomplete_journal_is_archived_without_replay():
+    state = _finished_game(actions=4)
+    persistence.forget("oslo-1")
+    lifecycle.archive([state])
+    assert ArchivedGame.objects.get().replay == {}
+
+
+def test_replay_rejects_an_action_that_does_not_apply():
+    recorded = replay.record(create_waiting_room("r", {"id": "p1"}, seed=1),
+                             [{"type": "roll_dice", "playerId": "p1"}])
+    recorded["players"].append({"id": "p2", "name": "Kari", "isBot": False})
+    with pytest.raises(ValueError, match="steg 1"):
+        list(replay.states(recorded))
+
+
+def test_speed_is_clamped():
+    assert replay.clamp_speed("fast") == 1.0
+    assert replay.clamp_speed(1000) == replay.MAX_SPEED
+    assert replay.clamp_speed(0) == replay.MIN_SPEED
+
+
+@pytest.mark.django_db
+def test_games_api_lists_recent_games(client):
+    lifecycle.archive([_finished_game(actions=4)])
+    ArchivedGame.objects.create(room="old", players=[])
+
+    response = client.get(reverse("oslo-game-list"), {"limit": 5})
+    assert response.status_code == 200
+    games = response.json()["games"]
+    assert [g["room"] for g in games] == ["old", "oslo-1"]
+    assert [g["replayable"] for g in games] == [False, True]
+    assert client.get(reverse("oslo-game-list"), {"limit": "x"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_replay_streams_state_then_deltas(monkeypatch):
+    monkeypatch.setattr(replay, "REPLAY_STEP_S", 0.001)
+    lifecycle.archive([_finished_game(actions=6)])
+    game_id = ArchivedGame.objects.get().id
+
+    async def run():
+        viewer = await connect_consumer()
+        await viewer.send_json_to({"type": "replay", "gameId": game_id, "speed": 20})
+        messages = [await viewer.receive_json_from()]
+        while messages[-1]["type"] != "replay_end":
+            messages.append(await viewer.receive_json_from())
+        await viewer.send_json_to({"type": "replay", "gameId": 999999})
+        missing = await viewer.receive_json_from()
+        await viewer.disconnect()
+        return messages, missing
+
+    messages, missing = async_to_sync(run)()
+    assert messages[0]["type"] == "game_state"
+    assert messages[0]["replay"] == {"gameId": game_id, "step": 0, "steps": 7}
+    deltas = messages[1:-1]
+    assert [m["replay"]["step"] for m in deltas] == list(range(1, 8))
+    assert all(m["type"] == "state_delta" and m["room"] == "oslo-1" for m in deltas)
+    assert deltas[-1]["changes"]["winner"] == "blue"
+    assert messages[-1] == {"type": "replay_end", "gameId": game_id, "steps": 7}
+    assert missing["type"] == "error"
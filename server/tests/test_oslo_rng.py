@@ -0,0 +1,64 @@
+"""Tests for the per-room RNG (oslo_conquest.rng)."""
+from collections import Counter
+
+from oslo_conquest import rng
+from oslo_conquest.bot import get_bot_action
+from oslo_conquest.mvp import add_player, apply_action, create_bot_room, create_waiting_room, public_state
+
+
+def _game(seed: int) -> list[int]:
+    """Play a few turns and return the dice rolled."""
+    state = create_waiting_room("r", {"id": "p1", "name": "Ola"}, seed=seed)
+    state, _ = add_player(state, {"id": "p2", "name": "Kari"})
+    for action in (
+        {"type": "choose_start_checkpoint", "playerId": "p1", "checkpointTerritoryId": "lysaker_cp"},
+        {"type": "end_turn", "playerId": "p1"},
+        {"type": "choose_start_checkpoint", "playerId": "p2", "checkpointTerritoryId": "kolbotn_cp"},
+        {"type": "end_turn", "playerId": "p2"},
+    ):
+        state, _ = apply_action(state, action)
+    rolls = []
+    for turn in range(8):
+        player_id = "p1" if turn % 2 == 0 else "p2"
+        state, error = apply_action(state, {"type": "roll_dice", "playerId": player_id})
+        assert error is None
+        rolls.append(next(p for p in state["players"] if p["id"] == player_id)["diceRoll"])
+        state, _ = apply_action(state, {"type": "end_turn", "playerId": player_id})
+    return rolls
+
+
+def test_same_seed_gives_the_same_game():
+    assert _game(42) == _game(42)
+    assert _game(42) != _game(43)
+
+
+def test_rolls_are_in_range_and_roughly_uniform():
+    state = {}
+    rng.seed_room(state, 7)
+    counts = Counter(rng.randint(state, 1, 6) for _ in range(6000))
+    assert set(counts) == {1, 2, 3, 4, 5, 6}
+    assert all(800 < n < 1200 for n in counts.values())
+
+
+def test_rooms_do_not_share_state():
+    a = create_waiting_room("a", {"id": "p1"}, seed=1)
+    b = create_waiting_room("b", {"id": "p2"}, seed=1)
+    rng.randint(a, 1, 6)
+    assert a["rng"] != b["rng"]
+    assert rng.randint(b, 1, 100) == rng.randint(create_waiting_room("c", {"id": "p3"}, seed=1), 1, 100)
+
+
+def test_bot_choice_is_deterministic_and_does_not_advance_the_rng():
+    state = create_bot_room("r", {"id": "p1", "name": "Ola"}, seed=5)
+    state, _ = apply_action(state, {"type": "choose_start_checkpoint", "playerId": "p1", "checkpointTerritoryId": "lysaker_cp"})
+    state, _ = apply_action(state, {"type": "end_turn", "playerId": "p1"})
+    before = state["rng"]
+    first = get_bot_action(state, "bot-blue")
+    assert get_bot_action(state, "bot-blue") == first
+    assert first["type"] == "choose_start_checkpoint"
+    assert state["rng"] == before
+
+
+def test_seed_is_not_sent_to_clients():
+    state = public_state(create_waiting_room("r", {"id": "p1"}, seed=9))
+    assert "seed" not in state and "rng" not in state
@@ -0,0 +1,79 @@
+"""Tests for the Oslo Conquest room registry (oslo_conquest.rooms)."""
+from oslo_conquest.mvp import (
+    add_player,
+    create_bot_room,
+    create_waiting_room,
+    find_room_with_player,
+    summarize_room,
+    summarize_rooms,
+)
+from oslo_conquest.rooms import RoomRegistry
+
+
+def _registry() -> RoomRegistry:
+    rooms = RoomRegistry()
+    rooms["b"] = create_waiting_room("b", {"id": "p1", "name": "Ola"})
+    rooms["a"] = create_waiting_room("a", {"id": "p3", "name": "Per"})
+    return rooms
+
+
+def test_registry_behaves_like_a_dict():
+    rooms = _registry()
+    assert sorted(rooms.keys()) == ["a", "b"]
+    assert "a" in rooms and len(rooms) == 2
+    assert rooms.get("missing") is None
+    rooms.clear()
+    assert len(rooms) == 0
+    assert summarize_rooms(rooms) == []
+
+
+def test_player_index_follows_join_and_replace():
+    rooms = _registry()
+    assert find_room_with_player(rooms, "p1") == "b"
+    assert find_room_with_player(rooms, "p1", exclude_room="b") is None
+    assert find_room_with_player(rooms, "p2") is None
+
+    rooms["b"], _ = add_player(rooms["b"], {"id": "p2", "name": "Kari"})
+    assert find_room_with_player(rooms, "p2") == "b"
+
+    rooms["b"] = create_waiting_room("b", {"id": "p9", "name": "Ny"})
+    assert find_room_with_player(rooms, "p1") is None
+    assert find_room_with_player(rooms, "p9") == "b"
+
+    del rooms["b"]
+    assert find_room_with_player(rooms, "p9") is None
+    assert find_room_with_player(rooms, "p3") == "a"
+
+
+def test_bots_are_not_indexed():
+    rooms = RoomRegistry()
+    rooms["x"] = create_bot_room("x", {"id": "p1", "name": "Ola"})
+    rooms["y"] = create_bot_room("y", {"id": "p2", "name": "Kari"})
+    del rooms["x"]
+    assert rooms.room_of("p2") == "y"
+    assert rooms.room_of("bot-blue") is None
+
+
+def test_summaries_match_plain_dict_and_track_changes():
+    rooms = _registry()
+    plain = dict(rooms)
+    assert summarize_rooms(rooms) == summarize_rooms(plain)
+    assert [s["room"] for s in summarize_rooms(rooms)] == ["a", "b"]
+
+    added, updated, removed = rooms.pop_changes()
+    assert [s["room"] for s in added] == ["a", "b"]
+    assert (updated, removed) == ([], [])
+    rooms["a"] = rooms["a"]                  # stored back unchanged
+    assert rooms.pop_changes() == ([], [], [])
+    assert not rooms.has_changes()
+
+    rooms["b"], _ = add_player(rooms["b"], {"id": "p2", "name": "Kari"})
+    del rooms["a"]
+    rooms["c"] = create_waiting_room("c", {"id": "p4", "name": "Ida"})
+    del rooms["c"]
+    added, updated, removed = rooms.pop_changes()
+    assert added == []
+    assert updated == [summarize_room("b", rooms["b"])]
+    assert updated[0]["started"] is True
+    assert removed == ["a"]
+    assert summarize_rooms(rooms) == updated
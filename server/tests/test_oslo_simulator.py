@@ -0,0 +1,38 @@
+"""Tests for the headless Oslo Conquest simulator (oslo_conquest.simulator)."""
+from oslo_conquest import simulator
+from oslo_conquest.board import START_TERRITORIES
+from oslo_conquest.mvp import create_bot_room
+
+
+def test_games_are_reproducible_from_their_seed():
+    first = simulator.play_game(3, "random", "greedy")
+    second = simulator.play_game(3, "random", "greedy")
+    assert (first["winner"], first["turns"], first["territories"]) == (
+        second["winner"], second["turns"], second["territories"]
+    )
+    assert first["turns"] <= simulator.MAX_TURNS
+    assert first["latencies"]["roll_dice"]
+
+
+def test_legal_attacks_start_from_the_start_territory():
+    state = create_bot_room("r", {"id": "p1"}, seed=1)
+    attacks = simulator.legal_attacks(state, "red")
+    assert attacks
+    assert {a for a, _ in attacks} == {START_TERRITORIES["red"]}
+
+
+def test_run_reports_throughput_latency_and_win_rates(monkeypatch):
+    monkeypatch.setattr(simulator, "MAX_TURNS", 10)
+    report = simulator.run(games=6, workers=1, seed=10, red="greedy", blue="passive")
+    assert report["games"] == 6
+    assert report["gamesPerSec"] > 0
+    assert sum(report["winRate"].values()) == 1
+    assert set(report["latencyUs"]) >= {"roll_dice", "move", "end_turn"}
+    assert report["latencyUs"]["end_turn"]["count"] >= 6 * 10
+
+
+def test_process_pool_gives_the_same_results():
+    single = simulator.run(games=4, workers=1, seed=5)
+    pooled = simulator.run(games=4, workers=2, seed=5)
+    for key in ("winRate", "avgTurns", "avgTerritories", "drawLeader"):
+        assert single[key] == pooled[key]
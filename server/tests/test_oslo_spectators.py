@@ -0,0 +1,161 @@
+"""Tests for read-only spectators (oslo_conquest.spectators) in the consumer."""
+import asyncio
+import json
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+
+from oslo_conquest import consumers, lifecycle, spectators
+from oslo_conquest.consumers import OsloConquestConsumer, _rooms
+from oslo_conquest.mvp import create_waiting_room
+
+from .test_oslo_conquest_consumer import connect_consumer, receive_non_room_list
+
+
+@pytest.fixture(autouse=True)
+def _fresh(monkeypatch):
+    monkeypatch.setattr(spectators, "COUNT_INTERVAL_S", 0.01)
+    _rooms.clear()
+    _rooms.pop_changes()
+    yield
+    spectators._watchers.clear()
+    spectators._queues.clear()
+
+
+async def _started_game():
+    red = await connect_consumer()
+    await red.send_json_to({"type": "create_game", "room": "oslo-1", "player": {"id": "p1", "name": "Ola"}})
+    await receive_non_room_list(red)
+    blue = await connect_consumer()
+    await blue.send_json_to({"type": "join_game", "room": "oslo-1", "player": {"id": "p2", "name": "Kari"}})
+    await receive_non_room_list(red)
+    await receive_non_room_list(blue)
+    return red, blue
+
+
+async def _spectator():
+    communicator = WebsocketCommunicator(OsloConquestConsumer.as_asgi(), "/ws/oslo-conquest/?deltas=1")
+    connected, _ = await communicator.connect()
+    assert connected
+    await communicator.receive_json_from()
+    await communicator.send_json_to({"type": "spectate", "room": "oslo-1"})
+    return communicator
+
+
+def test_spectator_follows_the_delta_stream_and_cannot_act():
+    async def run():
+        red, blue = await _started_game()
+        watcher = await _spectator()
+        spectating = await receive_non_room_list(watcher)
+        initial = await receive_non_room_list(watcher)
+
+        await red.send_json_to({"type": "choose_start_checkpoint", "checkpointTerritoryId": "lysaker_cp"})
+        delta = await receive_non_room_list(watcher)
+        await watcher.send_json_to({"type": "end_turn"})
+        refused = await receive_non_room_list(watcher)
+
+        count_to_player = None
+        while count_to_player is None:
+            message = await receive_non_room_list(red)
+            if message["type"] == "spectators":
+                count_to_player = message
+        for communicator in (red, blue, watcher):
+            await communicator.disconnect()
+        return spectating, initial, delta, refused, count_to_player
+
+    spectating, initial, delta, refused, count_to_player = async_to_sync(run)()
+    assert spectating == {"type": "spectating", "room": "oslo-1", "spectators": 1}
+    assert initial["type"] == "game_state"
+    assert delta["type"] == "state_delta"
+    assert delta["baseVersion"] == initial["state"]["version"]
+    assert refused == {"type": "error", "message": "Tilskuere kan ikke gjøre trekk"}
+    assert count_to_player == {"type": "spectators", "room": "oslo-1", "count": 1}
+    assert _rooms.members("oslo-1") == 0
+    assert spectators.count("oslo-1") == 0
+
+
+def test_spectating_a_missing_room_or_while_playing_is_refused():
+    async def run():
+        red, blue = await _started_game()
+        await red.send_json_to({"type": "spectate", "room": "oslo-1"})
+        playing = await receive_non_room_list(red)
+        watcher = await connect_consumer()
+        await watcher.send_json_to({"type": "spectate", "room": "nope"})
+        missing = await receive_non_room_list(watcher)
+        for communicator in (red, blue, watcher):
+            await communicator.disconnect()
+        return playing, missing
+
+    playing, missing = async_to_sync(run)()
+    assert playing["type"] == "error" and missing["type"] == "error"
+    assert spectators.count("oslo-1") == 0
+
+
+def test_a_spectator_who_joins_gets_each_action_once():
+    async def run():
+        red = await connect_consumer()
+        await red.send_json_to({"type": "create_game", "room": "oslo-1", "player": {"id": "p1", "name": "Ola"}})
+        await receive_non_room_list(red)
+        watcher = await _spectator()
+        await receive_non_room_list(watcher)
+        await receive_non_room_list(watcher)
+        await watcher.send_json_to({"type": "join_game", "room": "oslo-1", "player": {"id": "p2", "name": "Kari"}})
+        await receive_non_room_list(watcher)
+        await asyncio.sleep(0.05)
+        while not await watcher.receive_nothing():
+            await watcher.receive_json_from()
+
+        await red.send_json_to({"type": "choose_start_checkpoint", "checkpointTerritoryId": "lysaker_cp"})
+        await asyncio.sleep(0.05)
+        received = []
+        while not await watcher.receive_nothing():
+            message = await watcher.receive_json_from()
+            if message["type"] in ("game_state", "state_delta"):
+                received.append(message["type"])
+        for communicator in (red, watcher):
+            await communicator.disconnect()
+        return received
+
+    assert async_to_sync(run)() == ["state_delta"]
+    assert spectators.count("oslo-1") == 0
+
+
+def test_a_long_backlog_is_replaced_by_one_full_state():
+    async def run():
+        red, blue = await _started_game()
+        watcher = await _spectator()
+        await receive_non_room_list(watcher)
+        await receive_non_room_list(watcher)
+
+        full = json.dumps({"type": "game_state", "state": {"backlog": True}})
+        for i in range(spectators.BACKLOG_MAX + 1):
+            spectators.publish("oslo-1", json.dumps({"type": "state_delta", "n": i}), lambda: full)
+        first = await receive_non_room_list(watcher)
+        await asyncio.sleep(0.05)
+        rest = []
+        while not await watcher.receive_nothing():
+            rest.append((await watcher.receive_json_from())["type"])
+        for communicator in (red, blue, watcher):
+            await communicator.disconnect()
+        return first, rest
+
+    first, rest = async_to_sync(run)()
+    assert first == {"type": "game_state", "state": {"backlog": True}}
+    assert "state_delta" not in rest
+
+
+def test_reaping_a_room_drops_its_spectators():
+    async def send(text: str) -> None:
+        return None
+
+    async def run():
+        _rooms["oslo-1"] = create_waiting_room("oslo-1", {"id": "p1", "name": "Ola"})
+        spectators.add("oslo-1", "watcher", send, "oslo-conquest-oslo-1")
+        evicted = await consumers.reap_rooms(time.monotonic() + lifecycle.ROOM_TTLS_S["waiting"])
+        return evicted, spectators.count("oslo-1"), "oslo-1" in spectators._count_tasks
+
+    evicted, watching, counting = async_to_sync(run)()
+    assert evicted == [("oslo-1", "waiting")]
+    assert (watching, counting) == (0, False)
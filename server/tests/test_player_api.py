@@ -322,3 +322,75 @@ class TestPlayerList:
         c = Client()
         r = c.get("/clock/api/players/")
         assert r.status_code == 200
+
+
+# ── Concurrent registration ───────────────────────────────────────────────────
+
+@pytest.mark.django_db(transaction=True)
+class TestRegisterConcurrency:
+    """A registration rush (everyone scans the QR code at once) must stay consistent."""
+
+    @staticmethod
+    def _rush(requests: list[tuple[str, int]]) -> list[int]:
+        import threading
+        from django.db import connection
+
+        barrier = threading.Barrier(len(requests))
+        statuses: list[int] = [0] * len(requests)
+
+        def register(i: int, username: str, tournament_id: int) -> None:
+            try:
+                barrier.wait()
+                r = Client().post("/clock/api/me/register/",
+                                  data={"tournament_id": tournament_id},
+                                  content_type="application/json",
+                                  **_auth(username))
+                statuses[i] = r.status_code
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=register, args=(i, u, t))
+                   for i, (u, t) in enumerate(requests)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return statuses
+
+    def test_parallel_registrations_all_succeed_and_sync_clock_state(self):
+        from clock import state as gs
+        from clock.models import Tournament, TournamentEntry
+
+        tournament = Tournament.objects.create(name="Rush")
+        gs.init_state(None, tournament_id=tournament.id)
+
+        statuses = self._rush([(f"rush{i}@example.com", tournament.id) for i in range(12)])
+
+        assert statuses == [201] * 12
+        assert TournamentEntry.objects.filter(tournament=tournament, is_active=True).count() == 12
+        assert gs.get_snapshot(tournament_id=tournament.id)["players"]["registered"] == 12
+
+    def test_double_tap_creates_one_entry(self):
+        from clock import state as gs
+        from clock.models import Tournament, TournamentEntry
+
+        tournament = Tournament.objects.create(name="Double tap")
+        gs.init_state(None, tournament_id=tournament.id)
+
+        statuses = self._rush([("tap@example.com", tournament.id)] * 6)
+
+        assert sorted(statuses) == [200] * 5 + [201]
+        assert TournamentEntry.objects.filter(player__username="tap@example.com").count() == 1
+        assert gs.get_snapshot(tournament_id=tournament.id)["players"]["registered"] == 1
+
+    def test_parallel_registrations_for_two_tournaments_keep_one_active(self):
+        from clock.models import Tournament, TournamentEntry
+
+        a = Tournament.objects.create(name="A")
+        b = Tournament.objects.create(name="B")
+
+        statuses = self._rush([("split@example.com", a.id), ("split@example.com", b.id)] * 3)
+
+        assert 409 in statuses
+        assert TournamentEntry.objects.filter(player__username="split@example.com",
+                                              is_active=True).count() == 1
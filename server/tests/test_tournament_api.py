@@ -7,6 +7,7 @@ Endpoints:
   GET   /clock/api/tournaments/<id>/          detail
   PATCH /clock/api/tournaments/<id>/          host only: rename
   POST  /clock/api/tournaments/<id>/finish/   host only: finish
+  POST  /clock/api/tournaments/<id>/batch/    host only: bulk register / bustout / rebuy / add-on
 """
 import pytest
 
@@ -363,3 +364,163 @@ class TestMultiTournamentRegistration:
             **self._old_auth("player6@example.com"),
         )
         assert r.status_code == 404
+
+
+# ── Lobby cache ───────────────────────────────────────────────────────────────
+
+@pytest.mark.django_db
+class TestLobbyCache:
+
+    def test_repeat_get_is_served_from_cache(self):
+        from portal import metrics
+        Client().get("/clock/api/tournaments/")
+        hits_before = metrics.get("clock.lobby_cache.hits")
+        r = Client().get("/clock/api/tournaments/")
+        assert r.status_code == 200
+        assert metrics.get("clock.lobby_cache.hits") == hits_before + 1
+
+    def test_status_filters_are_cached_separately(self):
+        from clock.models import Tournament
+        Tournament.objects.create(name="Ferdig", status=Tournament.STATUS_FINISHED, state_json={})
+        finished = Client().get("/clock/api/tournaments/?status=finished").json()
+        pending = Client().get("/clock/api/tournaments/?status=pending").json()
+        assert all(t["status"] == "finished" for t in finished)
+        assert all(t["status"] == "pending" for t in pending)
+
+    def test_create_invalidates(self):
+        player = _make_player()
+        Client().get("/clock/api/tournaments/")
+        r = Client().post(
+            "/clock/api/tournaments/",
+            data='{"name": "Fersk"}',
+            content_type="application/json",
+            **_auth(player),
+        )
+        ids = [t["id"] for t in Client().get("/clock/api/tournaments/").json()]
+        assert r.json()["id"] in ids
+
+    def test_rename_invalidates(self):
+        host = _make_player("Host")
+        t = _make_tournament(host=host, name="Gammel")
+        Client().get("/clock/api/tournaments/")
+        Client().patch(
+            f"/clock/api/tournaments/{t.id}/",
+            data='{"name": "Ny"}',
+            content_type="application/json",
+            **_auth(host),
+        )
+        listed = next(x for x in Client().get("/clock/api/tournaments/").json() if x["id"] == t.id)
+        assert listed["name"] == "Ny"
+
+    def test_finish_invalidates(self):
+        host = _make_player("Host")
+        t = _make_tournament(host=host)
+        Client().get("/clock/api/tournaments/?status=finished")
+        Client().post(f"/clock/api/tournaments/{t.id}/finish/", **_auth(host))
+        ids = [x["id"] for x in Client().get("/clock/api/tournaments/?status=finished").json()]
+        assert t.id in ids
+
+    def test_registration_updates_player_count(self, django_capture_on_commit_callbacks):
+        Client().get("/clock/api/tournaments/")
+        with django_capture_on_commit_callbacks(execute=True):
+            Client().post(
+                "/clock/api/me/register/",
+                data='{"tournament_id": 1}',
+                content_type="application/json",
+                **TestMultiTournamentRegistration._old_auth("lobby@example.com"),
+            )
+        listed = next(x for x in Client().get("/clock/api/tournaments/").json() if x["id"] == 1)
+        assert listed["playerCount"] == 1
+
+
+# ── POST /clock/api/tournaments/<id>/batch/ ──────────────────────────────────
+
+@pytest.mark.django_db
+class TestTournamentBatch:
+
+    def _post(self, t, body, player):
+        return Client().post(f"/clock/api/tournaments/{t.id}/batch/", data=body,
+                             content_type="application/json", **_auth(player))
+
+    def test_non_host_gets_403(self):
+        host, other = _make_player("Host"), _make_player("Other")
+        t = _make_tournament(host=host)
+        assert self._post(t, {"rebuys": 1}, other).status_code == 403
+
+    def test_empty_or_invalid_batch_returns_400(self):
+        host = _make_player("Host")
+        t = _make_tournament(host=host)
+        assert self._post(t, {}, host).status_code == 400
+        assert self._post(t, {"rebuys": -1}, host).status_code == 400
+        assert self._post(t, {"register": "ola"}, host).status_code == 400
+
+    def test_bulk_register_creates_entries_and_updates_state_once(self, django_capture_on_commit_callbacks):
+        from clock.models import TournamentEntry
+        from clock import state as gs
+        host = _make_player("Host")
+        t = _make_tournament(host=host)
+        names = [f"walkin{i}" for i in range(80)]
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            r = self._post(t, {"register": names + ["walkin0", " "]}, host)
+
+        assert r.status_code == 200
+        assert r.json()["registered"] == names
+        assert len(callbacks) == 1
+        assert TournamentEntry.objects.filter(tournament=t, is_active=True).count() == 80
+        assert gs.get_snapshot(tournament_id=t.id)["players"]["registered"] == 80
+
+    def test_bulk_register_reports_already_registered_and_conflicts(self, django_capture_on_commit_callbacks):
+        host = _make_player("Host")
+        t, other = _make_tournament(host=host), _make_tournament(host=host, name="Other")
+        with django_capture_on_commit_callbacks(execute=True):
+            self._post(t, {"register": ["ola"]}, host)
+            self._post(other, {"register": ["kari"]}, host)
+            r = self._post(t, {"register": ["ola", "kari", "per"]}, host)
+
+        data = r.json()
+        assert data["registered"] == ["per"]
+        assert data["alreadyRegistered"] == ["ola"]
+        assert data["conflicts"] == [{"username": "kari", "conflictTournamentId": other.id}]
+
+    def test_bulk_bustout_rebuy_and_add_on(self, django_capture_on_commit_callbacks):
+        from clock.models import TournamentEntry
+        from clock import state as gs
+        host = _make_player("Host")
+        t = _make_tournament(host=host)
+        with django_capture_on_commit_callbacks(execute=True):
+            self._post(t, {"register": ["a", "b", "c", "d"]}, host)
+            r = self._post(t, {"bustout": ["a", "b", "zed"], "bustouts": 1, "rebuys": 3, "addOns": 2}, host)
+
+        assert r.json()["busted"] == 3
+        assert not TournamentEntry.objects.filter(tournament=t, player__username__in=["a", "b"],
+                                                  is_active=True).exists()
+        players = gs.get_snapshot(tournament_id=t.id)["players"]
+        assert (players["busted"], players["active"]) == (3, 1)
+        assert (players["rebuyCount"], players["addOnCount"]) == (3, 2)
+
+    def test_bustouts_never_exceed_registered(self, django_capture_on_commit_callbacks):
+        from clock import state as gs
+        host = _make_player("Host")
+        t = _make_tournament(host=host)
+        with django_capture_on_commit_callbacks(execute=True):
+            self._post(t, {"register": ["a", "b"]}, host)
+            self._post(t, {"bustouts": 5}, host)
+        assert gs.get_snapshot(tournament_id=t.id)["players"]["active"] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_clamped_bustouts_report_the_stored_count(self):
+        from clock import state as gs
+        host = _make_player("Host")
+        t = _make_tournament(host=host)
+        self._post(t, {"register": ["a", "b"]}, host)
+        r = self._post(t, {"bustouts": 5}, host)
+        assert r.json()["busted"] == 2
+        assert gs.get_snapshot(tournament_id=t.id)["players"]["busted"] == 2
+
+    def test_finished_tournament_returns_409(self):
+        from clock.models import Tournament
+        host = _make_player("Host")
+        t = _make_tournament(host=host)
+        Tournament.objects.filter(pk=t.id).update(status=Tournament.STATUS_FINISHED)
+        assert self._post(t, {"register": ["late"]}, host).status_code == 409